@@ -0,0 +1,511 @@
+import math
+import random
+import time
+
+from elo_engine import START_ELO
+
+
+# ---------------------
+# AUSLOSUNG (ZUFÄLLIGER REGULÄRER GRAPH)
+# ---------------------
+def _grundgraph(n, gegner):
+    """Fester Graph auf 0..n-1: jeder hat `gegner` Gegner, bei ungeradem n * gegner
+    hat Knoten 0 einen mehr. Zirkulant mit Abständen 1..gegner // 2, dazu bei
+    ungeradem `gegner` eine Paarung über den größten Abstand."""
+    kanten = set()
+    for i in range(n):
+        for d in range(1, gegner // 2 + 1):
+            kanten.add(_kante(i, (i + d) % n))
+    if gegner % 2:
+        if n % 2 == 0:
+            for i in range(n // 2):
+                kanten.add(_kante(i, i + n // 2))
+        else:
+            # Abstand (n - 1) / 2 läuft als ein Kreis durch alle Knoten: jede zweite
+            # Kante nehmen, der übrig bleibende Knoten geht an den Start (Extra-Spieler)
+            m = (n - 1) // 2
+            kreis = [(i * m) % n for i in range(n)]
+            for i in range(0, n - 1, 2):
+                kanten.add(_kante(kreis[i], kreis[i + 1]))
+            kanten.add(_kante(kreis[-1], kreis[0]))
+    return kanten
+
+
+def _kante(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+def _mischen(kanten, rng, schritte):
+    """Doppelkanten-Tausch (a-b, c-d -> a-c, b-d): Gegneranzahl aller Spieler bleibt gleich."""
+    liste = list(kanten)
+    for _ in range(schritte):
+        i, j = rng.randrange(len(liste)), rng.randrange(len(liste))
+        (a, b), (c, d) = liste[i], liste[j]
+        if rng.random() < 0.5:
+            c, d = d, c
+        if len({a, b, c, d}) < 4:
+            continue
+        neu1, neu2 = _kante(a, c), _kante(b, d)
+        if neu1 in kanten or neu2 in kanten:
+            continue
+        kanten.discard(liste[i])
+        kanten.discard(liste[j])
+        kanten.add(neu1)
+        kanten.add(neu2)
+        liste[i], liste[j] = neu1, neu2
+    return kanten
+
+
+def auslosen(spieler, gegner, seed=None, misch_faktor=10, elo=None, letzte_paare=None, max_abstand=150):
+    """Jeder Spieler bekommt genau `gegner` verschiedene Gegner; ist spieler × gegner
+    ungerade, hat ein zufälliger `extra_spieler` einen mehr.
+
+    Startet mit einem festen gültigen Graphen, verteilt die Spieler zufällig darauf
+    und mischt mit `misch_faktor` × Kantenzahl Kantentauschen. Gelingt immer, sobald
+    es genug Spieler gibt; gleicher `seed` ergibt dieselbe Auslosung.
+
+    Mit `elo` (Name -> Rating) wird ausgeglichen gelost, siehe `_elo_optimieren`;
+    `letzte_paare` zählt Paarungen der letzten Spieltage (sortiertes Namenspaar -> Anzahl).
+    """
+    n = len(spieler)
+    if n < gegner + 1:
+        return None, None
+    rng = random.Random(seed)
+    kanten = _grundgraph(n, gegner)
+    if elo is None:
+        kanten = _mischen(kanten, rng, misch_faktor * len(kanten))
+        namen = list(spieler)
+        rng.shuffle(namen)
+    else:
+        namen = _elo_kreis(spieler, elo, rng)
+        kanten = _elo_optimieren(kanten, namen, elo, letzte_paare or {}, max_abstand, rng, misch_faktor * 20 * len(kanten))
+    paarungen = {s: set() for s in spieler}
+    for a, b in kanten:
+        paarungen[namen[a]].add(namen[b])
+        paarungen[namen[b]].add(namen[a])
+    extra_spieler = namen[0] if (n * gegner) % 2 else None
+    return paarungen, extra_spieler
+
+
+# ---------------------
+# ELO-AUSGEGLICHENE AUSLOSUNG
+# ---------------------
+def _elo_kreis(spieler, elo, rng, rauschen=25):
+    """Spieler im Zickzack nach Rating um den Kreis (0, 2, 4, ..., 5, 3, 1), damit die
+    Nachbarn im Zirkulanten ähnlich stark sind; leicht verrauscht und zufällig gedreht,
+    damit nicht jeder Spieltag gleich aussieht und der Extra-Spieler zufällig ist."""
+    sortiert = sorted(spieler, key=lambda s: elo.get(s, START_ELO) + rng.gauss(0, rauschen))
+    kreis = sortiert[0::2] + sortiert[1::2][::-1]
+    k = rng.randrange(len(kreis))
+    return kreis[k:] + kreis[:k]
+
+
+def _elo_optimieren(kanten, namen, elo, letzte_paare, max_abstand, rng, schritte,
+                    wiederholung_strafe=4.0, ueber_strafe=10.0):
+    """Verbessert die Paarungen per 2-opt auf dem Graphen: Doppelkanten-Tausch wie beim
+    Mischen, aber nur, wenn die Summe der Kantenkosten sinkt (anfangs mit etwas
+    Annealing). Kosten einer Paarung: (Abstand / 100)², dazu `ueber_strafe` je 100
+    Punkte über `max_abstand` und `wiederholung_strafe` je Paarung in `letzte_paare`.
+    Die Gegneranzahl jedes Spielers ändert sich dabei nie."""
+    werte = [float(elo.get(s, START_ELO)) for s in namen]
+
+    def kosten(a, b):
+        abstand = abs(werte[a] - werte[b])
+        k = (abstand / 100) ** 2
+        if abstand > max_abstand:
+            k += ueber_strafe * (abstand - max_abstand) / 100
+        paar = (namen[a], namen[b]) if namen[a] <= namen[b] else (namen[b], namen[a])
+        return k + wiederholung_strafe * letzte_paare.get(paar, 0)
+
+    liste = list(kanten)
+    for schritt in range(schritte):
+        i, j = rng.randrange(len(liste)), rng.randrange(len(liste))
+        (a, b), (c, d) = liste[i], liste[j]
+        if rng.random() < 0.5:
+            c, d = d, c
+        if len({a, b, c, d}) < 4:
+            continue
+        neu1, neu2 = _kante(a, c), _kante(b, d)
+        if neu1 in kanten or neu2 in kanten:
+            continue
+        delta = kosten(a, c) + kosten(b, d) - kosten(a, b) - kosten(c, d)
+        temperatur = 0.5 * max(0.0, 1 - 2 * schritt / schritte)
+        if delta > 0 and (temperatur == 0 or rng.random() >= math.exp(-delta / temperatur)):
+            continue
+        kanten.discard(liste[i])
+        kanten.discard(liste[j])
+        kanten.add(neu1)
+        kanten.add(neu2)
+        liste[i], liste[j] = neu1, neu2
+    return kanten
+
+
+def elo_abstaende(paarungen, elo):
+    """Rating-Abstände aller Paarungen, größter zuerst."""
+    spiele = spiele_aus_paarungen(paarungen)
+    return sorted((abs(elo.get(a, START_ELO) - elo.get(b, START_ELO)) for a, b in spiele), reverse=True)
+
+
+# ---------------------
+# RUNDEN AUF DEN BOARDS
+# ---------------------
+def spiele_aus_paarungen(paarungen):
+    gesehen = set()
+    for s, gegner_set in paarungen.items():
+        for g in gegner_set:
+            gesehen.add(tuple(sorted([s, g])))
+    return [list(key) for key in sorted(gesehen)]
+
+
+def _runden_greedy(spiele, bretter, reihenfolge):
+    """First-Fit-Kantenfärbung: jedes Spiel in die erste Runde mit freiem Board, in der beide noch frei sind."""
+    runden, belegt = [], []
+    for i in reihenfolge:
+        a, b = spiele[i]
+        for r, runde in enumerate(runden):
+            if len(runde) < bretter and a not in belegt[r] and b not in belegt[r]:
+                break
+        else:
+            r = len(runden)
+            runden.append([])
+            belegt.append(set())
+        runden[r].append(i)
+        belegt[r].update((a, b))
+    return runden
+
+
+class _Plan:
+    """Runden mit Spielerbelegung; Kosten = Spieler, die in zwei aufeinanderfolgenden Runden spielen."""
+
+    def __init__(self, spiele, runden):
+        self.spiele = spiele
+        self.runden = [list(r) for r in runden]
+        self.runde_von = {i: r for r, runde in enumerate(self.runden) for i in runde}
+        self.belegt = {}
+        self.spiele_von = {}
+        for i, r in self.runde_von.items():
+            for p in spiele[i]:
+                self.belegt.setdefault(p, set()).add(r)
+                self.spiele_von.setdefault(p, []).append(i)
+
+    def _nachbarn(self, p, r, ohne=None):
+        rs = self.belegt[p]
+        return sum(1 for x in (r - 1, r + 1) if x in rs and x != ohne)
+
+    def kosten(self):
+        return sum(1 for rs in self.belegt.values() for r in rs if r + 1 in rs)
+
+    def verschieben(self, i, ziel, bretter):
+        """Spiel i in Runde `ziel`, falls erlaubt; gibt die Kostenänderung zurück oder None."""
+        quelle = self.runde_von[i]
+        a, b = self.spiele[i]
+        if ziel == quelle or len(self.runden[ziel]) >= bretter or ziel in self.belegt[a] or ziel in self.belegt[b]:
+            return None
+        delta = 0
+        for p in (a, b):
+            delta -= self._nachbarn(p, quelle)
+            delta += self._nachbarn(p, ziel, ohne=quelle)
+        self._setzen(i, quelle, ziel)
+        return delta
+
+    def _setzen(self, i, quelle, ziel):
+        self.runden[quelle].remove(i)
+        self.runden[ziel].append(i)
+        self.runde_von[i] = ziel
+        for p in self.spiele[i]:
+            self.belegt[p].discard(quelle)
+            self.belegt[p].add(ziel)
+
+    def tauschen(self, i, j):
+        """Spiele i und j tauschen die Runden, falls danach niemand doppelt in einer Runde steht."""
+        ri, rj = self.runde_von[i], self.runde_von[j]
+        pi, pj = set(self.spiele[i]), set(self.spiele[j])
+        andere_j = {p for k in self.runden[rj] if k != j for p in self.spiele[k]}
+        andere_i = {p for k in self.runden[ri] if k != i for p in self.spiele[k]}
+        if ri == rj or pi & pj or pi & andere_j or pj & andere_i:
+            return False
+        self._setzen(i, ri, rj)
+        self._setzen(j, rj, ri)
+        return True
+
+    def kempe(self, i, ziel, bretter):
+        """Tauscht die Runden aller Spiele der Komponente von i im Teilgraph der Runden
+        von i und `ziel` (Kempe-Kette); bleibt gültig, solange die Boards reichen."""
+        quelle = self.runde_von[i]
+        komponente, offen = {i}, list(self.spiele[i])
+        while offen:
+            p = offen.pop()
+            for k in self.spiele_von[p]:
+                if k not in komponente and self.runde_von[k] in (quelle, ziel):
+                    komponente.add(k)
+                    offen.extend(self.spiele[k])
+        nach_ziel = [k for k in komponente if self.runde_von[k] == quelle]
+        nach_quelle = [k for k in komponente if self.runde_von[k] == ziel]
+        if (len(self.runden[ziel]) + len(nach_ziel) - len(nach_quelle) > bretter
+                or len(self.runden[quelle]) + len(nach_quelle) - len(nach_ziel) > bretter):
+            return False
+        for k in nach_ziel:
+            self.runden[quelle].remove(k)
+            self.runden[ziel].append(k)
+            self.runde_von[k] = ziel
+        for k in nach_quelle:
+            self.runden[ziel].remove(k)
+            self.runden[quelle].append(k)
+            self.runde_von[k] = quelle
+        for p in {p for k in komponente for p in self.spiele[k]}:
+            self.belegt[p] = {self.runde_von[k] for k in self.spiele_von[p]}
+        return True
+
+    def runden_tauschen(self, r1, r2):
+        betroffen = {p for r in (r1, r2) for i in self.runden[r] for p in self.spiele[i]}
+        vorher = sum(1 for p in betroffen for r in self.belegt[p] if r + 1 in self.belegt[p])
+        self.runden[r1], self.runden[r2] = self.runden[r2], self.runden[r1]
+        for r in (r1, r2):
+            for i in self.runden[r]:
+                self.runde_von[i] = r
+        for p in betroffen:
+            rs = self.belegt[p]
+            in1, in2 = r1 in rs, r2 in rs
+            rs.discard(r1)
+            rs.discard(r2)
+            if in1:
+                rs.add(r2)
+            if in2:
+                rs.add(r1)
+        nachher = sum(1 for p in betroffen for r in self.belegt[p] if r + 1 in self.belegt[p])
+        return nachher - vorher
+
+
+def _verdichten(plan, bretter, untergrenze, rng, schritte):
+    """Lokale Suche gegen überzählige Runden: Spiele der kleinsten Runde wandern in andere
+    Runden, direkt, per Tausch mit einem blockierenden Spiel oder per Kempe-Kette."""
+    for _ in range(schritte):
+        n = len(plan.runden)
+        if n <= untergrenze:
+            break
+        r = min(range(n), key=lambda x: len(plan.runden[x]))
+        i = rng.choice(plan.runden[r])
+        ziel = rng.randrange(n)
+        if ziel == r:
+            continue
+        if plan.verschieben(i, ziel, bretter) is None:
+            blockiert = [j for j in plan.runden[ziel] if set(plan.spiele[j]) & set(plan.spiele[i])]
+            if len(blockiert) == 1 or (not blockiert and len(plan.runden[ziel]) >= bretter):
+                plan.tauschen(i, blockiert[0] if blockiert else rng.choice(plan.runden[ziel]))
+            else:
+                plan.kempe(i, ziel, bretter)
+        if not plan.runden[r]:
+            plan = _Plan(plan.spiele, [x for x in plan.runden if x])
+    return plan
+
+
+class _Abbruch(Exception):
+    pass
+
+
+def _ohne_pausen_versuch(spiele, spiele_von, bretter, anzahl_runden, rng, budget):
+    """Füllt die Runden der Reihe nach mit Spielen, deren Spieler in der Runde davor
+    pausiert haben (Backtracking, höchstens `budget` Knoten). Wer noch k Spiele hat und
+    ab Runde r + 1 keine 2k - 1 Runden mehr vor sich hätte, muss in Runde r spielen;
+    diese Spieler werden zuerst versorgt, danach kommen weitere Spiele dazu, die mit den
+    meisten offenen Spielen ihrer Spieler zuerst. Ein verworfenes Spiel bleibt für den
+    Rest der Runde draußen, so wird jede Runde nur einmal aufgezählt. Gibt (Runden oder
+    None, vollständig durchsucht) zurück."""
+    rest = {p: len(v) for p, v in spiele_von.items()}
+    rang = list(range(len(spiele)))
+    rng.shuffle(rang)
+    offen = set(range(len(spiele)))
+    runden = []
+    knoten = 0
+
+    def fuellen(r, vorher, jetzt, runde, verworfen):
+        nonlocal knoten
+        knoten += 1
+        if knoten > budget:
+            raise _Abbruch
+        gesperrt = vorher | jetzt
+        pflicht = next((p for p, k in rest.items() if k and p not in gesperrt and r + 2 * k > anzahl_runden), None)
+        if len(runde) == bretter:
+            kandidaten = []
+        elif pflicht is not None:
+            kandidaten = [i for i in spiele_von[pflicht] if i in offen]
+        else:
+            kandidaten = list(offen)
+        kandidaten = [i for i in kandidaten if i not in verworfen and not gesperrt.intersection(spiele[i])]
+        kandidaten.sort(key=lambda i: (-rest[spiele[i][0]] - rest[spiele[i][1]], rang[i]))
+        verworfen = set(verworfen)
+        for i in kandidaten:
+            a, b = spiele[i]
+            offen.remove(i)
+            rest[a] -= 1
+            rest[b] -= 1
+            runde.append(i)
+            if fuellen(r, vorher, jetzt | {a, b}, runde, verworfen):
+                return True
+            runde.pop()
+            rest[a] += 1
+            rest[b] += 1
+            offen.add(i)
+            verworfen.add(i)
+        if pflicht is not None or not runde:
+            return False
+        uebrig = anzahl_runden - r - 1
+        if not uebrig <= len(offen) <= bretter * uebrig:
+            return False
+        if any(k and r + 2 * k + (p in jetzt) > anzahl_runden for p, k in rest.items()):
+            return False
+        runden.append(list(runde))
+        if not uebrig or fuellen(r + 1, jetzt, set(), [], set()):
+            return True
+        runden.pop()
+        return False
+
+    try:
+        return (runden if fuellen(0, set(), set(), [], set()) else None), True
+    except _Abbruch:
+        return None, False
+
+
+def _pausen_unmoeglich(spiele_von, anzahl_spiele, bretter, anzahl_runden):
+    """Notwendige Bedingungen für einen Plan ohne Back-to-Back, ohne Suche geprüft: wer k
+    Spiele hat, braucht 2k - 1 Runden, und zwei aufeinanderfolgende Runden teilen sich
+    keinen Spieler, fassen zusammen also höchstens n // 2 Spiele."""
+    if any(2 * len(v) - 1 > anzahl_runden for v in spiele_von.values()):
+        return True
+    paar = len(spiele_von) // 2
+    return anzahl_spiele > anzahl_runden // 2 * paar + anzahl_runden % 2 * min(bretter, paar)
+
+
+def _ohne_pausen(spiele, bretter, anzahl_runden, rng, budget, versuch=1000):
+    """Runden ohne Back-to-Back bei gegebener Rundenzahl, per Neustarts zu je `versuch`
+    Knoten. None, wenn es keine gibt oder das Budget nicht reicht."""
+    spiele_von = {}
+    for i, spiel in enumerate(spiele):
+        for p in spiel:
+            spiele_von.setdefault(p, []).append(i)
+    if _pausen_unmoeglich(spiele_von, len(spiele), bretter, anzahl_runden):
+        # etwa wenn in jeder Runde fast alle Spieler gebraucht werden: gleich zur lokalen Suche
+        return None
+    for _ in range(budget // versuch):
+        runden, vollstaendig = _ohne_pausen_versuch(spiele, spiele_von, bretter, anzahl_runden, rng, versuch)
+        if runden is not None or vollstaendig:
+            return runden
+    return None
+
+
+def runden_planen(spiele, bretter, seed=None, versuche=30, schritte=4000, budget=100000):
+    """Teilt die Spiele in Runden zu höchstens `bretter` gleichzeitigen Spielen auf.
+
+    Kein Spieler spielt zweimal in einer Runde. Zuerst werden möglichst wenige Runden
+    gesucht (First-Fit-Färbung mit mehreren zufälligen Reihenfolgen, Abbruch an der
+    unteren Schranke, dann lokale Suche gegen überzählige Runden). Bei dieser
+    Rundenzahl sucht ein Backtracking (höchstens `budget` Knoten) einen Plan, in dem
+    niemand in zwei Runden direkt hintereinander spielt; ist das schon nach Spielzahlen
+    unmöglich, entfällt die Suche. Gibt es keinen, etwa weil in jeder Runde alle Spieler
+    gebraucht werden, drückt eine lokale Suche die Zahl der Back-to-Backs so weit wie möglich. Gibt eine Liste von Runden mit Indizes in
+    `spiele` zurück.
+    """
+    if not spiele:
+        return []
+    bretter = max(1, int(bretter))
+    rng = random.Random(seed)
+    grad = {}
+    for a, b in spiele:
+        grad[a] = grad.get(a, 0) + 1
+        grad[b] = grad.get(b, 0) + 1
+    untergrenze = max(-(-len(spiele) // bretter), max(grad.values()))
+    plan = None
+    for _ in range(versuche):
+        reihenfolge = list(range(len(spiele)))
+        rng.shuffle(reihenfolge)
+        reihenfolge.sort(key=lambda i: -(grad[spiele[i][0]] + grad[spiele[i][1]]))
+        versuch = _Plan(spiele, _runden_greedy(spiele, bretter, reihenfolge))
+        if len(versuch.runden) > untergrenze:
+            versuch = _verdichten(versuch, bretter, untergrenze, rng, schritte // 4)
+        if plan is None or len(versuch.runden) < len(plan.runden):
+            plan = versuch
+        if len(plan.runden) == untergrenze:
+            break
+    runden = _ohne_pausen(spiele, bretter, len(plan.runden), rng, budget)
+    if runden is not None:
+        return runden
+    kosten = plan.kosten()
+    n = len(plan.runden)
+    for _ in range(schritte):
+        if kosten == 0 or n < 2:
+            break
+        if rng.random() < 0.5:
+            r1, r2 = rng.sample(range(n), 2)
+            delta = plan.runden_tauschen(r1, r2)
+            if delta > 0:
+                plan.runden_tauschen(r1, r2)
+            else:
+                kosten += delta
+        else:
+            i = rng.randrange(len(spiele))
+            quelle = plan.runde_von[i]
+            delta = plan.verschieben(i, rng.randrange(n), bretter)
+            if delta is None:
+                continue
+            if delta > 0:
+                plan._setzen(i, plan.runde_von[i], quelle)
+            else:
+                kosten += delta
+    return [r for r in plan.runden if r]
+
+
+def reihenfolge_aus_runden(spiele, runden):
+    """Runden hintereinander; innerhalb einer Runde beginnt möglichst ein Spiel ohne
+    Spieler aus dem vorigen Spiel, damit niemand zweimal direkt nacheinander dran ist."""
+    reihenfolge = []
+    for runde in runden:
+        runde = list(runde)
+        if reihenfolge:
+            zuletzt = set(spiele[reihenfolge[-1]])
+            frei = [i for i in runde if not zuletzt & set(spiele[i])]
+            if frei:
+                runde.remove(frei[0])
+                runde.insert(0, frei[0])
+        reihenfolge += runde
+    return reihenfolge
+
+
+def erstelle_spielplan(paarungen, bretter=1, seed=None):
+    """Spielplan als [a, b, runde] (Runden ab 1) und die Reihenfolge als Indizes darin."""
+    spiele = spiele_aus_paarungen(paarungen)
+    runden = runden_planen(spiele, bretter, seed=seed)
+    spielplan = [list(s) for s in spiele]
+    for nr, runde in enumerate(runden, start=1):
+        for i in runde:
+            spielplan[i].append(nr)
+    return spielplan, reihenfolge_aus_runden(spiele, runden)
+
+
+def benchmark(spieler_anzahlen=(4, 5, 7, 10, 15, 20, 25, 30, 40, 50, 59, 60), gegner_anzahlen=(3, 4, 5),
+              wiederholungen=20, ausgeglichen=False):
+    """Laufzeit von `auslosen` in ms je (Spieler, Gegner); None, wenn nicht lösbar.
+    Mit `ausgeglichen` nach zufälligen Ratings (Elo-Modus)."""
+    ergebnis = {}
+    rng = random.Random(0)
+    for n in spieler_anzahlen:
+        spieler = [f"Spieler {i}" for i in range(n)]
+        elo = {s: rng.gauss(1000, 120) for s in spieler} if ausgeglichen else None
+        for g in gegner_anzahlen:
+            start = time.perf_counter()
+            for seed in range(wiederholungen):
+                paarungen, _ = auslosen(spieler, g, seed=seed, elo=elo)
+                if paarungen is None:
+                    break
+            ergebnis[(n, g)] = None if paarungen is None else (time.perf_counter() - start) / wiederholungen * 1000
+    return ergebnis
+
+
+if __name__ == "__main__":
+    gegner_anzahlen = (3, 4, 5)
+    for titel, ausgeglichen in (("Zufällig", False), ("Elo-ausgeglichen", True)):
+        zeiten = benchmark(gegner_anzahlen=gegner_anzahlen, wiederholungen=5 if ausgeglichen else 20, ausgeglichen=ausgeglichen)
+        print(titel)
+        print("Spieler " + "".join(f"{g:>10} Gegner" for g in gegner_anzahlen))
+        for n in sorted({n for n, _ in zeiten}):
+            werte = [zeiten[(n, g)] for g in gegner_anzahlen]
+            print(f"{n:7d} " + "".join(f"{'–':>14}   " if w is None else f"{w:14.2f} ms" for w in werte))
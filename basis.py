@@ -0,0 +1,377 @@
+import os
+import pandas as pd
+import streamlit as st
+
+import datenstand
+import elo_engine
+import messung
+import speicher
+import statistik
+
+
+# ---------------------
+# KONFIGURATION
+# ---------------------
+START_ELO = elo_engine.START_ELO
+K_FAKTOR = elo_engine.K_FAKTOR
+PASSWORT = "bfelo"
+DB_BATCH_GROESSE = 500
+DB_PRUEF_INTERVALL = 10  # Sekunden zwischen zwei Prüfungen auf fremde Änderungen
+STATISTIK_LRU = 4  # so viele Log-Stände behält der Statistik-Cache
+FORM_FENSTER = 8  # letzte Spiele pro Spieler für Form, Serie und Spielliste
+AUSLOSUNG_MAX_ABSTAND = 150  # Elo-Abstand, ab dem die ausgeglichene Auslosung stark bestraft
+AUSLOSUNG_WIEDERHOLUNG = 3  # Paarungen aus so vielen letzten Spieltagen möglichst vermeiden
+PROGNOSE_SIMULATIONEN = 5000  # simulierte Spieltage für die Ranglisten-Prognose
+SPIELPLAN_LIVE_INTERVALL = 3  # Sekunden zwischen zwei Blicken der Zuschauer auf den Änderungszähler
+
+
+# ---------------------
+# SPEICHER (SUPABASE ODER LOKAL)
+# ---------------------
+@st.cache_resource
+def get_speicher():
+    # ELO_SQLITE=<pfad> (oder [sqlite] pfad in secrets) -> offline mit lokaler SQLite-Datei
+    pfad = os.environ.get("ELO_SQLITE")
+    if not pfad and "sqlite" in st.secrets:
+        pfad = st.secrets["sqlite"]["pfad"]
+    # jeder Round-Trip wird für das Admin-Protokoll gemessen
+    if pfad:
+        return messung.GemessenerSpeicher(speicher.SqliteSpeicher(pfad))
+    return messung.GemessenerSpeicher(speicher.SupabaseSpeicher(st.secrets["supabase"]["url"], st.secrets["supabase"]["key"]))
+
+
+# ---------------------
+# DATEIEN LADEN/SPEICHERN
+# ---------------------
+@st.cache_resource
+def get_datenstand():
+    # prozessweit für alle Sessions: Write-Through-Stand von spieler, spiele_log, turniere, aktiver_spielplan
+    return datenstand.DatenStand(get_speicher(), pruef_intervall=DB_PRUEF_INTERVALL)
+
+
+def db_anfragen():
+    return get_speicher().anfragen
+
+
+@messung.gemessen()
+def lade_spieler():
+    return get_datenstand().spieler()
+
+
+@messung.gemessen()
+def speichere_spieler(df):
+    return get_datenstand().upsert("spieler", [
+        {"name": name, "elo": int(row["Elo"]), "spiele": int(row["Spiele"])}
+        for name, row in df.iterrows()
+    ], DB_BATCH_GROESSE)
+
+
+@messung.gemessen()
+def lade_log():
+    return get_datenstand().log()
+
+
+@messung.gemessen()
+def speichere_log(df):
+    """Schreibt bestehende Log-Zeilen zurück; neue Spiele kommen über `insert_spiel`, fremd
+    gelöschte bleiben gelöscht."""
+    if "id" not in df.columns:
+        return 0
+    return get_datenstand().upsert("spiele_log", [
+        {
+            "id": int(row["id"]),
+            "datum": row["Datum"],
+            "spieler_a": row["Spieler A"],
+            "spieler_b": row["Spieler B"],
+            "legs_a": int(row["Legs A"]),
+            "legs_b": int(row["Legs B"]),
+            "avg_a": float(row["Avg A"]),
+            "avg_b": float(row["Avg B"]),
+            "elo_a": int(row["Elo A"]),
+            "elo_b": int(row["Elo B"])
+        }
+        for _, row in df.iterrows() if pd.notna(row.get("id"))
+    ], DB_BATCH_GROESSE, nur_vorhandene=True)
+
+
+@messung.gemessen()
+def insert_spiel(datum, a, b, la, lb, avga, avgb, elo_a=0, elo_b=0):
+    get_datenstand().insert("spiele_log", [{
+        "datum": datum, "spieler_a": a, "spieler_b": b,
+        "legs_a": int(la), "legs_b": int(lb),
+        "avg_a": float(avga), "avg_b": float(avgb),
+        "elo_a": int(elo_a), "elo_b": int(elo_b)
+    }], DB_BATCH_GROESSE)
+
+
+@messung.gemessen()
+def aktualisiere_spiel(id, datum, a, b, la, lb, avga, avgb):
+    get_datenstand().update("spiele_log", id, {
+        "datum": datum, "spieler_a": a, "spieler_b": b,
+        "legs_a": int(la), "legs_b": int(lb), "avg_a": float(avga), "avg_b": float(avgb)
+    })
+
+
+@messung.gemessen()
+def loesche_spiel(id):
+    get_datenstand().loesche("spiele_log", id)
+
+
+@messung.gemessen()
+def insert_spieltag(df_spiele):
+    """Bulk-Insert bereits bewerteter Spiele (Spalten wie lade_log) in möglichst wenigen Requests."""
+    zeilen = [{
+        "datum": row["Datum"], "spieler_a": row["Spieler A"], "spieler_b": row["Spieler B"],
+        "legs_a": int(row["Legs A"]), "legs_b": int(row["Legs B"]),
+        "avg_a": float(row["Avg A"]), "avg_b": float(row["Avg B"]),
+        "elo_a": int(row["Elo A"]), "elo_b": int(row["Elo B"])
+    } for _, row in df_spiele.iterrows()]
+    get_datenstand().insert("spiele_log", zeilen, DB_BATCH_GROESSE)
+
+
+# ---------------------
+# AKTIVER SPIELPLAN
+# ---------------------
+@messung.gemessen()
+def lade_spielplan_db():
+    try:
+        row = get_datenstand().spielplan()
+        if row is None:
+            return None
+        spielplan = row["spielplan"] if isinstance(row["spielplan"], list) else []
+        ergebnisse_raw = row.get("ergebnisse") or {}
+        ergebnisse = {int(k): v for k, v in ergebnisse_raw.items()}
+        locked_raw = row.get("locked") or []
+        locked = [int(x) for x in locked_raw]
+        reihenfolge_raw = row.get("reihenfolge") or list(range(len(spielplan)))
+        reihenfolge = [int(x) for x in reihenfolge_raw]
+        return {
+            "spielplan": spielplan, "spieltag": row.get("spieltag", ""),
+            "extra_spieler": row.get("extra_spieler"), "ergebnisse": ergebnisse,
+            "locked": locked, "reihenfolge": reihenfolge
+        }
+    except Exception as e:
+        st.warning(f"Spielplan konnte nicht geladen werden: {e}")
+        return None
+
+
+@st.cache_resource
+def _spielplan_feed():
+    # prozessweit: Änderungen am aktiven Plan für die Zuschauer-Ansicht
+    return datenstand.AenderungsFeed()
+
+
+def spielplan_aenderungen(seit):
+    """(Feed-Version, geänderte Spiele seit `seit`) oder (Version, None) = Plan neu lesen.
+    Kostet nur den Stand im Speicher; fremde Änderungen kommen über die übliche Prüfung."""
+    daten = get_datenstand()
+    with daten.lock:
+        _spielplan_feed().abgleichen(daten.versions_schluessel("aktiver_spielplan")[0])
+        return _spielplan_feed().seit(seit)
+
+
+@messung.gemessen()
+def speichere_spielplan_db(spielplan, spieltag, extra_spieler, ergebnisse, locked, reihenfolge):
+    try:
+        ergebnisse_str = {str(k): v for k, v in ergebnisse.items()}
+        with get_datenstand().lock:
+            zeile = {
+                "id": 1, "spielplan": spielplan, "spieltag": str(spieltag),
+                "extra_spieler": extra_spieler, "ergebnisse": ergebnisse_str,
+                "locked": [int(x) for x in locked], "reihenfolge": [int(x) for x in reihenfolge]
+            }
+            alt = get_datenstand().spielplan()
+            if alt is not None and alt.get("version") is not None:
+                # neue Version, damit Ergebnis-Patches auf den alten Plan scheitern
+                zeile["version"] = alt["version"] + 1
+            get_datenstand().upsert("aktiver_spielplan", [zeile], DB_BATCH_GROESSE)
+            if alt is None:
+                # neu angelegt: Version aus der DB lesen
+                get_datenstand().invalidieren("aktiver_spielplan")
+            _spielplan_feed().zuruecksetzen(get_datenstand().versionen["aktiver_spielplan"])
+    except Exception as e:
+        st.error(f"Fehler beim Speichern des Spielplans: {e}")
+
+
+@messung.gemessen()
+def speichere_ergebnis_db(idx, ergebnis, gesperrt, versuche=3):
+    """Ein Ergebnis des aktiven Plans setzen: nur dieser Eintrag wird mit Versionsprüfung
+    geschrieben; hat eine andere Session die Zeile inzwischen geändert, mit dem neu
+    geladenen Stand noch einmal."""
+    daten = get_datenstand()
+    try:
+        for versuch in range(versuche):
+            with daten.lock:
+                zeile = daten.spielplan()
+                if zeile is None:
+                    return
+                locked = [int(x) for x in zeile.get("locked") or [] if int(x) != idx] + ([idx] if gesperrt else [])
+                try:
+                    daten.patche("aktiver_spielplan", 1, zeile.get("version"),
+                                 {"ergebnisse": {str(idx): ergebnis}}, {"locked": locked})
+                except speicher.VeralteterStand:
+                    if versuch == versuche - 1:
+                        raise
+                    continue
+                _spielplan_feed().melden({"idx": idx, "ergebnis": ergebnis, "gesperrt": gesperrt},
+                                         daten.versionen["aktiver_spielplan"])
+                return
+    except Exception as e:
+        st.error(f"Fehler beim Speichern des Ergebnisses: {e}")
+
+
+@messung.gemessen()
+def loesche_spielplan_db():
+    try:
+        with get_datenstand().lock:
+            get_datenstand().loesche("aktiver_spielplan", 1)
+            _spielplan_feed().zuruecksetzen(get_datenstand().versionen["aktiver_spielplan"])
+    except Exception as e:
+        st.error(f"Fehler beim Löschen des Spielplans: {e}")
+
+
+# ---------------------
+# ELO-BERECHNUNG
+# ---------------------
+@st.cache_resource
+def _elo_checkpoints():
+    # prozessweit: Checkpoints des letzten Replays, für Suffix-Replays nach Änderungen
+    return {}
+
+
+@messung.gemessen("elo.replay")
+def _elo_kern(df_spieler, df_log):
+    df, df_log_neu, checkpoints = elo_engine.replay_mit_checkpoints(df_spieler, df_log, start_elo=START_ELO, k=K_FAKTOR)
+    _elo_checkpoints()["letzte"] = checkpoints
+    return df, df_log_neu
+
+
+def berechne_elo_nur_lesen(df_log):
+    return _elo_kern(lade_spieler(), df_log)
+
+
+def elo_tabelle():
+    """Replay des aktuellen Logs, einmal pro Log-Stand berechnet (Kopien, dürfen verändert werden)."""
+    df, df_log = aktuelle_statistik().elo
+    return df.copy(), df_log.copy()
+
+
+@messung.gemessen()
+def berechne_elo_aus_log(df_log):
+    df_spieler = lade_spieler()
+    df, df_log_neu = _elo_kern(df_spieler, df_log)
+    speichere_spieler(df)
+    speichere_log(df_log_neu)
+    return df, df_log_neu
+
+
+@messung.gemessen()
+def berechne_elo_nach_aenderung(df_log):
+    """Nach Bearbeiten/Löschen eines Spiels: Replay nur ab dem Checkpoint vor der ersten
+    geänderten Zeile."""
+    df_spieler = lade_spieler()
+    checkpoints = _elo_checkpoints().get("letzte")
+    if checkpoints is None:
+        df, df_log_neu = _elo_kern(df_spieler, df_log)
+        ab = 0
+    else:
+        df, df_log_neu, checkpoints, ab = elo_engine.replay_suffix(checkpoints, df_spieler, df_log, k=K_FAKTOR)
+        _elo_checkpoints()["letzte"] = checkpoints
+    # die Writer überspringen unveränderte Zeilen selbst
+    speichere_spieler(df)
+    speichere_log(df_log_neu.iloc[ab:])
+    return df, df_log_neu
+
+
+@st.cache_resource
+def _statistik_cache():
+    # prozessweit für alle Sessions, ältere Log-Stände fallen per LRU heraus
+    return statistik.StatistikCache(STATISTIK_LRU)
+
+
+def aktuelle_statistik():
+    schluessel = get_datenstand().versions_schluessel("spieler", "spiele_log")
+    return _statistik_cache().holen(schluessel, lambda: statistik.Statistik(
+        lade_spieler(), lade_log(), _elo_kern, form_fenster=FORM_FENSTER))
+
+
+@messung.gemessen()
+def log_spieltag(spieltag, spiele):
+    """Neue Spiele (a, b, legs_a, legs_b, avg_a, avg_b) am Ende des Logs: bewertet ab dem
+    gespeicherten Stand, ein Bulk-Insert und ein Upsert der beteiligten Spieler."""
+    df_spiele = pd.DataFrame(spiele, columns=["Spieler A", "Spieler B", "Legs A", "Legs B", "Avg A", "Avg B"])
+    zustand = elo_engine.zustand_aus_spielern(lade_spieler(), start_elo=START_ELO)
+    delta_a, delta_b = elo_engine.spiele_anhaengen(zustand, df_spiele["Spieler A"], df_spiele["Spieler B"],
+                                                   *elo_engine.log_spalten(df_spiele), k=K_FAKTOR)
+    df_spiele.insert(0, "Datum", spieltag)
+    df_spiele["Elo A"] = delta_a
+    df_spiele["Elo B"] = delta_b
+    insert_spieltag(df_spiele)
+    df = zustand.als_dataframe()
+    beteiligte = pd.concat([df_spiele["Spieler A"], df_spiele["Spieler B"]]).unique()
+    speichere_spieler(df.loc[beteiligte])
+    return df, df_spiele
+
+
+def log_spiel(a, b, la, lb, avga, avgb, spieltag):
+    return log_spieltag(spieltag, [(a, b, la, lb, avga, avgb)])
+
+
+def fmt(v):
+    v = int(v)
+    if v > 0: return f"<span style='color:green'>+{v} ▴</span>"
+    elif v < 0: return f"<span style='color:red'>{v} ▾</span>"
+    else: return "<span style='color:gray'>0</span>"
+
+
+def fmt_elo(v):
+    v = int(v)
+    if v > 0: return f"<span style='color:green'>+{v} ▲</span>"
+    elif v < 0: return f"<span style='color:red'>{v} ▼</span>"
+    else: return "<span style='color:gray'>0</span>"
+
+
+def zeige_spieltag_zusammenfassung(spieltag_nr):
+    z = aktuelle_statistik().spieltag(spieltag_nr)
+    if z is None:
+        st.warning("Keine Spiele für diesen Spieltag gefunden.")
+        return
+    gewinner, verlierer = z["gewinner"], z["verlierer"]
+    avg_king, groesste_ueberraschung = z["avg_king"], z["groesste_ueberraschung"]
+    gesamtaverage = z["gesamtaverage"]
+    st.markdown(f"""
+    <div style='padding:20px 0 16px 0;border-bottom:2px solid #e0e0e0;margin-bottom:24px;'>
+        <h2 style='margin:0 0 8px 0;font-size:28px;font-weight:700;'>Spieltag {spieltag_nr}</h2>
+        <div style='display:flex;gap:32px;'>
+            <span style='color:#555;font-size:14px;'>{z['anzahl']} Spiele ausgetragen</span>
+            <span style='color:#555;font-size:14px;'>Ø Average: <strong>{gesamtaverage}</strong></span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("<span style='font-size:18px;font-weight:bold;text-decoration:underline;'>Spieltagsgewinner</span>", unsafe_allow_html=True)
+        medals = ["🥇", "🥈", "🥉"]
+        for idx, (name, delta) in enumerate(gewinner):
+            sign = f"+{delta}" if delta >= 0 else str(delta)
+            color = "green" if delta >= 0 else "red"
+            st.markdown(f"{medals[idx]} {name} &nbsp; <span style='color:{color};font-weight:bold;'>{sign}</span>", unsafe_allow_html=True)
+    with col2:
+        st.markdown("<span style='font-size:18px;font-weight:bold;text-decoration:underline;'>Spieltagsverlierer</span>", unsafe_allow_html=True)
+        for idx, (name, delta) in enumerate(verlierer):
+            st.markdown(f"#{idx+1} {name} &nbsp; <span style='color:red;font-weight:bold;'>{delta}</span>", unsafe_allow_html=True)
+    st.markdown("---")
+    col3, col4 = st.columns(2)
+    with col3:
+        if avg_king:
+            st.markdown("<span style='font-size:18px;font-weight:bold;text-decoration:underline;'>Bestleistung</span>", unsafe_allow_html=True)
+            st.markdown(f"{avg_king[0]} ({z['avg_king_ergebnis']} vs {avg_king[2]})")
+            st.markdown(f"<span style='color:green;font-weight:bold;font-size:20px;'>{avg_king[1]:.1f} Avg</span>", unsafe_allow_html=True)
+    with col4:
+        st.markdown("<span style='font-size:18px;font-weight:bold;text-decoration:underline;'>Größte Überraschung</span>", unsafe_allow_html=True)
+        if groesste_ueberraschung:
+            gew_s, ver_s, diff, la, lb = groesste_ueberraschung
+            st.markdown(f"{gew_s} ({la}:{lb} vs {ver_s})")
+            st.markdown(f"<span style='color:green;font-weight:bold;font-size:20px;'>+{diff} Elo-Differenz</span>", unsafe_allow_html=True)
+        else:
+            st.markdown("Keine Underdog-Siege in diesem Spieltag.")
@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+import auslosung
+import basis
+import statistik
+import turnier
+from benchmark.liga import liga, schreiben
+from datenstand import DatenStand
+from speicher import SqliteSpeicher, importiere_csv
+
+# (Spieler, Spieltage, Spiele)
+GROESSEN = {"klein": (20, 20, 400), "mittel": (60, 100, 4000), "gross": (150, 400, 40000)}
+GRUPPEN_GROESSE = 5
+
+
+def messen(f, wiederholungen):
+    """Median und Minimum von `wiederholungen` Aufrufen in ms (nach einem Aufwärmlauf)."""
+    f()
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        f()
+        zeiten.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(zeiten), "min_ms": min(zeiten), "wiederholungen": wiederholungen}
+
+
+def gruppenturnier(spieler, seed):
+    """Gruppen zu GRUPPEN_GROESSE mit fertig gespielten Gruppenspielen."""
+    gruppen = {f"G{i // GRUPPEN_GROESSE + 1:02d}": list(spieler[i:i + GRUPPEN_GROESSE])
+               for i in range(0, len(spieler), GRUPPEN_GROESSE)}
+    spiele = turnier.t_erstelle_gruppenspiele(gruppen, 4)
+    for sp in spiele:
+        sieg_a = (sp["id"] * 7 + seed) % 3 != 0
+        sp.update(legs_a=3 if sieg_a else sp["id"] % 3, legs_b=sp["id"] % 3 if sieg_a else 3,
+                  avg_a=40 + sp["id"] % 20, avg_b=45 + sp["id"] % 15, abgeschlossen=True)
+    return gruppen, spiele
+
+
+def faelle(db, seed):
+    """Die gemessenen Pfade für eine Liga in der SQLite-Datei `db`: name -> Funktion ohne Argumente."""
+    ds = DatenStand(SqliteSpeicher(db))
+    df_sp, df_log = ds.spieler(), ds.log()
+    df_elo, df_log_elo = basis._elo_kern(df_sp, df_log)
+    lang = statistik.spieler_spiele(df_log_elo)
+    spieler = pd.concat([df_log_elo["Spieler A"], df_log_elo["Spieler B"]]).unique()
+    spieltage = sorted(df_log_elo["Datum"].astype(str).unique(), key=statistik.spieltag_sortierung)
+    verlauf = statistik.rating_verlauf(lang, spieler, spieltage)
+    letzter = df_log_elo[df_log_elo["Datum"].astype(str) == spieltage[-1]]
+    elo_vorher = verlauf.iloc[-2].drop("Spieltag").to_dict()
+    elo = df_elo["Elo"].to_dict()
+    namen = list(df_elo.index)
+    letzte_paare = statistik.Statistik(df_sp, df_log, lambda *_: (df_elo, df_log_elo)).letzte_paarungen(
+        basis.AUSLOSUNG_WIEDERHOLUNG)
+    paarungen, _ = auslosung.auslosen(namen, 4, seed=seed, elo=elo, letzte_paare=letzte_paare)
+    gruppen, gruppen_spiele = gruppenturnier(namen, seed)
+
+    def laden():
+        frisch = DatenStand(SqliteSpeicher(db))
+        frisch.spieler(), frisch.log()
+
+    return {
+        "laden (SQLite)": laden,
+        "_elo_kern": lambda: basis._elo_kern(df_sp, df_log),
+        "elo_verlauf": lambda: statistik.rating_verlauf(lang, spieler, spieltage),
+        "spieltag_zusammenfassung": lambda: statistik.spieltag_zusammenfassung(letzter, elo_vorher),
+        "bestenlisten": lambda: statistik.spieler_statistik(df_elo, statistik.spieler_aggregate(statistik.spieler_spiele(df_log_elo))),
+        "auslosen": lambda: auslosung.auslosen(namen, 4, seed=seed, elo=elo, letzte_paare=letzte_paare,
+                                               max_abstand=basis.AUSLOSUNG_MAX_ABSTAND),
+        "erstelle_spielplan": lambda: auslosung.erstelle_spielplan(paarungen, 4, seed=seed),
+        "t_berechne_tabelle": lambda: [turnier.t_berechne_tabelle(gk, m, gruppen_spiele) for gk, m in gruppen.items()],
+    }
+
+
+def lauf(groessen, wiederholungen=5, seed=0):
+    ergebnisse = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in groessen:
+            n, m, k = GROESSEN[name]
+            verzeichnis = os.path.join(tmp, name)
+            os.makedirs(verzeichnis)
+            db = os.path.join(verzeichnis, "elo.sqlite")
+            importiere_csv(SqliteSpeicher(db), *schreiben(verzeichnis, *liga(n, m, k, seed=seed)))
+            for fall, f in faelle(db, seed).items():
+                ergebnisse.append({"groesse": name, "spieler": n, "spieltage": m, "spiele": k, "fall": fall,
+                                   **messen(f, wiederholungen)})
+    return ergebnisse
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Laufzeiten der heißen Pfade auf synthetischen Ligen")
+    parser.add_argument("--groessen", nargs="+", choices=list(GROESSEN), default=list(GROESSEN))
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--aus", default="benchmark_ergebnisse.json", help="JSON-Datei für die Ergebnisse")
+    parser.add_argument("--vergleich", help="frühere JSON-Datei, Verhältnis neu/alt je Fall")
+    args = parser.parse_args()
+    ergebnisse = lauf(args.groessen, args.wiederholungen, args.seed)
+    with open(args.aus, "w") as f:
+        json.dump({"commit": commit(), "zeit": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                   "seed": args.seed, "ergebnisse": ergebnisse}, f, indent=1, ensure_ascii=False)
+    alt = {}
+    if args.vergleich:
+        with open(args.vergleich) as f:
+            alt = {(e["groesse"], e["fall"]): e["median_ms"] for e in json.load(f)["ergebnisse"]}
+    print(f"{'Größe':<8}{'Fall':<28}{'Median':>12}{'Min':>12}" + (f"{'neu/alt':>10}" if alt else ""))
+    for e in ergebnisse:
+        vorher = alt.get((e["groesse"], e["fall"]))
+        print(f"{e['groesse']:<8}{e['fall']:<28}{e['median_ms']:9.2f} ms{e['min_ms']:9.2f} ms"
+              + (f"{e['median_ms'] / vorher:10.2f}" if vorher else ("" if not alt else f"{'–':>10}")))
+    print(f"-> {args.aus}", file=sys.stderr)
@@ -0,0 +1,61 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+from elo_engine import START_ELO, K_FAKTOR, replay
+
+LOG_SPALTEN = ["Datum", "Spieler A", "Spieler B", "Legs A", "Legs B", "Avg A", "Avg B", "Elo A", "Elo B"]
+
+
+def liga(spieler, spieltage, spiele, seed=0, legs=3):
+    """Synthetische Liga: `spieler` Spieler, `spieltage` Spieltage ("1", "2", ...) und `spiele`
+    Spiele insgesamt, reproduzierbar über `seed`.
+
+    Jeder Spieler hat eine verdeckte Stärke; sie bestimmt Sieg (first to `legs`) und Average.
+    An jedem Spieltag spielt eine zufällige Auswahl, die Elo-Spalten kommen aus dem Replay.
+    Gibt (Log wie dart_log.csv, Ratings wie dart_elo.csv) zurück.
+    """
+    rng = np.random.default_rng(seed)
+    namen = np.array([f"Spieler {i + 1:03d}" for i in range(spieler)], dtype=object)
+    staerke = rng.normal(50, 8, spieler)
+    pro_tag = np.diff(np.linspace(0, spiele, spieltage + 1).round().astype(int))
+    zeilen = []
+    for tag, n in enumerate(pro_tag, start=1):
+        if n == 0:
+            continue
+        # etwa so viele Anwesende, dass jeder 3–5 Spiele macht
+        anwesend = rng.choice(spieler, size=min(spieler, max(2, -(-2 * n // 4))), replace=False)
+        for _ in range(n):
+            a, b = rng.choice(anwesend, size=2, replace=False)
+            sieg_a = rng.random() < 1 / (1 + np.exp((staerke[b] - staerke[a]) / 6))
+            verlierer = int(rng.integers(legs))
+            la, lb = (legs, verlierer) if sieg_a else (verlierer, legs)
+            avga, avgb = (max(15.0, round(float(rng.normal(staerke[s], 6)), 2)) for s in (a, b))
+            zeilen.append((str(tag), namen[a], namen[b], la, lb, avga, avgb, 0, 0))
+    df_log = pd.DataFrame(zeilen, columns=LOG_SPALTEN)
+    df_spieler = pd.DataFrame({"Elo": START_ELO, "Spiele": 0}, index=pd.Index(namen))
+    df_elo, df_log = replay(df_spieler, df_log, start_elo=START_ELO, k=K_FAKTOR)
+    return df_log, df_elo[["Elo", "Spiele"]]
+
+
+def schreiben(verzeichnis, df_log, df_elo):
+    """Legt dart_log.csv und dart_elo.csv in `verzeichnis` an und gibt die Pfade zurück."""
+    log_pfad = os.path.join(verzeichnis, "dart_log.csv")
+    elo_pfad = os.path.join(verzeichnis, "dart_elo.csv")
+    df_log.to_csv(log_pfad, index=False)
+    df_elo.to_csv(elo_pfad)
+    return log_pfad, elo_pfad
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetische Liga als dart_log.csv / dart_elo.csv")
+    parser.add_argument("--spieler", type=int, default=60)
+    parser.add_argument("--spieltage", type=int, default=100)
+    parser.add_argument("--spiele", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ziel", default=".", help="Verzeichnis für die CSV-Dateien")
+    args = parser.parse_args()
+    os.makedirs(args.ziel, exist_ok=True)
+    for pfad in schreiben(args.ziel, *liga(args.spieler, args.spieltage, args.spiele, seed=args.seed)):
+        print(pfad)
@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from seiten import SEITEN
+
+# läuft in einem frischen Interpreter: Import von streamlit, dann erster Lauf der App mit der Seite;
+# `module` zählt, was der Lauf über streamlit hinaus importiert
+KIND = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+vorher = set(sys.modules)
+t1 = time.perf_counter()
+at = AppTest.from_file("dart1.py", default_timeout=300)
+at.session_state["menu"] = sys.argv[1]
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0,
+    "render": t2 - t1,
+    "fehler": [str(e.value) for e in at.exception],
+    "module": len(set(sys.modules) - vorher),
+    "seiten": sorted(m for m in sys.modules if m.startswith("seiten.")),
+}))
+"""
+
+
+def messen(seite, db, wiederholungen=3):
+    """Zeit bis zur ersten Darstellung von `seite`, jeweils in einem neuen Prozess (Minimum der Läufe)."""
+    wurzel = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "ELO_SQLITE": db}
+    env.pop("SUPABASE_URL", None)
+    laeufe = []
+    for _ in range(wiederholungen):
+        aus = subprocess.run([sys.executable, "-c", KIND, seite], cwd=wurzel, env=env,
+                             capture_output=True, text=True, check=True)
+        laeufe.append(json.loads(aus.stdout.strip().splitlines()[-1]))
+    bester = min(laeufe, key=lambda l: l["import"] + l["render"])
+    return {"seite": seite, **bester}
+
+
+def testdatenbank(pfad):
+    from speicher import SqliteSpeicher, importiere_csv
+    importiere_csv(SqliteSpeicher(pfad))
+    return pfad
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kaltstart je Seite: Zeit bis zur ersten Darstellung")
+    parser.add_argument("--db", help="SQLite-Datenbank (sonst temporär aus dart_log.csv/dart_elo.csv)")
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Ergebnisse als JSON-Zeilen")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = args.db or testdatenbank(os.path.join(tmp, "elo.sqlite"))
+        if not args.json:
+            print(f"{'Seite':<24}{'streamlit':>12}{'1. Lauf':>12}{'gesamt':>12}{'Module':>8}   Seitenmodule")
+        for seite in SEITEN:
+            r = messen(seite, db, args.wiederholungen)
+            if args.json:
+                print(json.dumps(r, ensure_ascii=False))
+                continue
+            fehler = "  FEHLER: " + "; ".join(r["fehler"]) if r["fehler"] else ""
+            print(f"{seite:<24}{r['import'] * 1000:9.0f} ms{r['render'] * 1000:9.0f} ms"
+                  f"{(r['import'] + r['render']) * 1000:9.0f} ms"
+                  f"{r['module']:8d}   {', '.join(m.split('.')[1] for m in r['seiten'])}{fehler}")
@@ -0,0 +1,294 @@
+import copy
+import threading
+import time
+from collections import deque
+import pandas as pd
+
+from speicher import SCHLUESSEL, LOG_SPALTEN, VeralteterStand
+
+TABELLEN = ("spieler", "spiele_log", "turniere", "aktiver_spielplan")
+# Tabellen, die per Wasserstand (größte id + Spalte `geaendert`) inkrementell nachgeladen werden
+DELTA_TABELLEN = ("spiele_log",)
+
+
+class DatenStand:
+    """Prozessweiter Stand von Spielern, Log, Turnier und Spielplan mit Write-Through.
+
+    Leser bekommen den Stand aus dem Speicher des Prozesses, Schreiber aktualisieren
+    ihn nach dem Datenbank-Write an Ort und Stelle und erhöhen `version`. Neu geladen
+    wird nur nach `invalidieren` oder wenn sich die Änderungsmarke des Backends (höchstens
+    alle `pruef_intervall` Sekunden abgefragt) seit dem letzten Blick bewegt hat. Zählt
+    die Marke auch eigene Writes mit, kostet das einen Neuladevorgang danach, dafür geht
+    keine fremde Änderung aus demselben Zeitfenster verloren. Das Log wird nicht komplett
+    neu geholt, sondern per Delta ab dem gesehenen Wasserstand.
+    """
+
+    def __init__(self, speicher, pruef_intervall=10):
+        self.speicher = speicher
+        self.pruef_intervall = pruef_intervall
+        self.lock = threading.RLock()
+        self.version = 0
+        self.versionen = {t: 0 for t in TABELLEN}
+        self._zeilen = {}      # tabelle -> {schluessel: zeile}, in Schlüsselreihenfolge
+        self._frames = {}      # tabelle -> (version, DataFrame)
+        self._marken = {}      # tabelle -> zuletzt gesehene Änderungsmarke
+        self._geprueft = {}    # tabelle -> Zeitpunkt der letzten Prüfung
+        self._wasserstand = {} # tabelle -> (größter Schlüssel, größtes `geaendert`)
+
+    # ---------------------
+    # LADEN / PRÜFEN
+    # ---------------------
+    def _laden(self, tabelle):
+        order = SCHLUESSEL[tabelle] if tabelle == "spiele_log" else None
+        zeilen = self.speicher.alle(tabelle, order=order)
+        neu = {z[SCHLUESSEL[tabelle]]: z for z in zeilen}
+        # gleicher Inhalt (die Marke hat sich nur durch eigene Writes bewegt): Version bleibt,
+        # abgeleitete Frames und Feeds gelten weiter
+        unveraendert = self._zeilen.get(tabelle) == neu
+        self._zeilen[tabelle] = neu
+        self._wasserstand.pop(tabelle, None)
+        self._wasserstand_nachfuehren(tabelle, zeilen)
+        if not unveraendert:
+            self._geaendert(tabelle)
+
+    def _wasserstand_nachfuehren(self, tabelle, zeilen):
+        if tabelle not in DELTA_TABELLEN:
+            return
+        pk = SCHLUESSEL[tabelle]
+        max_id, seit = self._wasserstand.get(tabelle, (0, None))
+        for z in zeilen:
+            max_id = max(max_id, z[pk])
+            if z.get("geaendert") is not None and (seit is None or z["geaendert"] > seit):
+                seit = z["geaendert"]
+        self._wasserstand[tabelle] = (max_id, seit)
+
+    def _delta_sync(self, tabelle):
+        """Holt nur Zeilen oberhalb des Wasserstands (neu oder bearbeitet) und prüft über
+        die Zeilenanzahl, ob etwas gelöscht wurde; erst dann kommen die Schlüssel."""
+        pk = SCHLUESSEL[tabelle]
+        max_id, seit = self._wasserstand.get(tabelle, (0, None))
+        stand = self._zeilen[tabelle]
+        neu = [z for z in self.speicher.delta(tabelle, max_id, seit) if stand.get(z[pk]) != z]
+        if neu:
+            self._schreiben(tabelle, neu)
+            stand = self._zeilen[tabelle]
+        if self.speicher.anzahl(tabelle) != len(stand):
+            vorhanden = set(self.speicher.schluessel(tabelle))
+            for k in [k for k in stand if k not in vorhanden]:
+                del stand[k]
+            self._geaendert(tabelle)
+
+    def _geaendert(self, tabelle):
+        self.version += 1
+        self.versionen[tabelle] = self.version
+
+    def _aktuell(self, tabelle, sofort=False):
+        """Stand der Tabelle; geprüft wird alle `pruef_intervall` Sekunden oder mit `sofort`."""
+        with self.lock:
+            if tabelle not in self._zeilen:
+                if tabelle not in DELTA_TABELLEN:
+                    self._marken[tabelle] = self.speicher.marke(tabelle)
+                self._geprueft[tabelle] = time.monotonic()
+                self._laden(tabelle)
+            elif sofort or time.monotonic() - self._geprueft.get(tabelle, 0) > self.pruef_intervall:
+                self._geprueft[tabelle] = time.monotonic()
+                if tabelle in DELTA_TABELLEN:
+                    self._delta_sync(tabelle)
+                    return self._zeilen[tabelle]
+                marke = self.speicher.marke(tabelle)
+                alt = self._marken.get(tabelle)
+                self._marken[tabelle] = marke
+                # Die Marke sagt nicht, wer geschrieben hat: jede Bewegung lädt neu, auch die
+                # durch eigene Writes. Ohne Marke (None) wird wie mit einer TTL neu geladen.
+                if marke is None or marke != alt:
+                    self._laden(tabelle)
+            return self._zeilen[tabelle]
+
+    def versions_schluessel(self, *tabellen):
+        """Versionen der Tabellen nach der üblichen Prüfung, als Cache-Schlüssel für abgeleitete Werte."""
+        with self.lock:
+            for t in tabellen:
+                self._aktuell(t)
+            return tuple(self.versionen[t] for t in tabellen)
+
+    def invalidieren(self, tabelle=None):
+        with self.lock:
+            for t in ([tabelle] if tabelle else TABELLEN):
+                self._zeilen.pop(t, None)
+                self._frames.pop(t, None)
+                self._wasserstand.pop(t, None)
+
+    # ---------------------
+    # LESEN
+    # ---------------------
+    def _frame(self, tabelle, bauen):
+        with self.lock:
+            zeilen = self._aktuell(tabelle)
+            version, df = self._frames.get(tabelle, (None, None))
+            if version != self.versionen[tabelle]:
+                df = bauen(list(zeilen.values()))
+                self._frames[tabelle] = (self.versionen[tabelle], df)
+            return df.copy()
+
+    def spieler(self):
+        def bauen(zeilen):
+            if not zeilen:
+                return pd.DataFrame(columns=["Elo", "Spiele"])
+            df = pd.DataFrame(zeilen).set_index("name")
+            df = df.rename(columns={"elo": "Elo", "spiele": "Spiele"})
+            return df[["Elo", "Spiele"]]
+        return self._frame("spieler", bauen)
+
+    def log(self):
+        def bauen(zeilen):
+            if not zeilen:
+                return pd.DataFrame(columns=list(LOG_SPALTEN.values()))
+            return pd.DataFrame(zeilen).rename(columns=LOG_SPALTEN)
+        return self._frame("spiele_log", bauen)
+
+    def turnier(self):
+        with self.lock:
+            zeile = self._aktuell("turniere").get(1)
+            return copy.deepcopy(zeile)
+
+    def spielplan(self):
+        with self.lock:
+            zeile = self._aktuell("aktiver_spielplan").get(1)
+            return copy.deepcopy(zeile)
+
+    # ---------------------
+    # SCHREIBEN (WRITE-THROUGH)
+    # ---------------------
+    def _schreiben(self, tabelle, zeilen):
+        pk = SCHLUESSEL[tabelle]
+        stand = self._zeilen.get(tabelle)
+        if stand is not None:
+            letzter = next(reversed(stand), None)
+            umsortieren = False
+            for z in zeilen:
+                if z[pk] not in stand and letzter is not None and z[pk] < letzter:
+                    umsortieren = True
+                stand[z[pk]] = {**stand.get(z[pk], {}), **z}
+            # das Log muss in id-Reihenfolge bleiben (Replay-Reihenfolge)
+            if umsortieren and tabelle == "spiele_log":
+                self._zeilen[tabelle] = dict(sorted(stand.items()))
+            self._wasserstand_nachfuehren(tabelle, zeilen)
+        self._geaendert(tabelle)
+
+    def upsert(self, tabelle, zeilen, batch_groesse, nur_vorhandene=False):
+        """Upsert nur der Zeilen, die vom Stand abweichen, in Batches. Gibt die Anzahl Round-Trips zurück.
+
+        Mit `nur_vorhandene` fallen Zeilen weg, die es im frisch geprüften Stand nicht gibt:
+        wer einen früher gelesenen Stand zurückschreibt, legt fremd gelöschte Zeilen nicht neu an."""
+        with self.lock:
+            pk = SCHLUESSEL[tabelle]
+            # verglichen wird nur gegen einen frisch geprüften Stand, sonst gingen Writes
+            # verloren, die zufällig einem veralteten Stand entsprechen
+            stand = self._aktuell(tabelle, sofort=True)
+            if nur_vorhandene:
+                zeilen = [z for z in zeilen if z[pk] in stand]
+            geaendert = [z for z in zeilen if any(stand.get(z[pk], {}).get(k) != v for k, v in z.items())]
+            for i in range(0, len(geaendert), batch_groesse):
+                self.speicher.upsert(tabelle, geaendert[i:i + batch_groesse])
+            if geaendert:
+                self._schreiben(tabelle, geaendert)
+            return -(-len(geaendert) // batch_groesse)
+
+    def insert(self, tabelle, zeilen, batch_groesse):
+        with self.lock:
+            neu = []
+            for i in range(0, len(zeilen), batch_groesse):
+                neu += self.speicher.insert(tabelle, zeilen[i:i + batch_groesse])
+            if neu:
+                self._schreiben(tabelle, neu)
+            return neu
+
+    def update(self, tabelle, id, werte):
+        with self.lock:
+            self.speicher.update(tabelle, id, werte)
+            if id in self._zeilen.get(tabelle, {}):
+                self._schreiben(tabelle, [{SCHLUESSEL[tabelle]: id, **werte}])
+            else:
+                self.invalidieren(tabelle)
+
+    def patche(self, tabelle, id, version, elemente, werte):
+        """Schreibt nur einzelne Einträge von JSON-Spalten ({spalte: {index oder schlüssel: wert}}) und die
+        Spalten in `werte`, sofern die Zeile noch auf `version` steht (wie vom Aufrufer
+        gelesen). Sonst wird der Stand verworfen und VeralteterStand geworfen; Fehler des
+        Backends gehen ebenfalls nach oben."""
+        with self.lock:
+            pk = SCHLUESSEL[tabelle]
+            zeile = self._aktuell(tabelle).get(id)
+            if zeile is None or zeile.get("version") != version:
+                # schon der eigene Stand ist neuer als der des Aufrufers, kein Round-Trip nötig
+                raise VeralteterStand(f"{tabelle} {id}: Version {version} ist veraltet")
+            neu = dict(werte)
+            for spalte, el in elemente.items():
+                alt = zeile.get(spalte)
+                eintraege = dict(alt or {}) if isinstance(alt, dict) or any(isinstance(i, str) for i in el) else list(alt or [])
+                for i, w in el.items():
+                    eintraege[i] = w
+                neu[spalte] = eintraege
+            try:
+                geschrieben = self.speicher.patche(tabelle, id, version, elemente, werte)
+                if geschrieben is None:
+                    # Backend kann keine Einzeleinträge setzen: ganze Spalten, gleiche Versionsprüfung
+                    neue_version = {"version": version + 1} if version is not None else {}
+                    geschrieben = self.speicher.update(tabelle, id, {**neu, **neue_version}, version=version)
+            except Exception:
+                # ob geschrieben wurde, ist offen: beim nächsten Lesen neu laden
+                self.invalidieren(tabelle)
+                raise
+            if not geschrieben:
+                self.invalidieren(tabelle)
+                raise VeralteterStand(f"{tabelle} {id}: Version {version} ist veraltet")
+            self._schreiben(tabelle, [{pk: id, **neu, "version": version + 1 if version is not None else None}])
+
+    def loesche(self, tabelle, id):
+        with self.lock:
+            self.speicher.loesche(tabelle, id)
+            if tabelle in self._zeilen:
+                self._zeilen[tabelle].pop(id, None)
+            self._geaendert(tabelle)
+
+
+class AenderungsFeed:
+    """Versionszähler mit den zuletzt gemeldeten Änderungen, für Leser, die nur Neues wollen.
+
+    Schreiber melden einzelne Änderungen mit `melden` oder mit `zuruecksetzen`, dass alles
+    neu zu lesen ist. `stand` ist die Version des DatenStands nach dem eigenen Schreiben;
+    weicht sie später ab (Änderung aus einem anderen Prozess), setzt `abgleichen` zurück.
+    """
+
+    def __init__(self, laenge=200):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.basis = 0         # ältere Versionen müssen neu lesen
+        self.stand = None
+        self._eintraege = deque(maxlen=laenge)
+
+    def melden(self, aenderung, stand=None):
+        with self.lock:
+            self.version += 1
+            self._eintraege.append(aenderung)
+            self.stand = stand
+
+    def zuruecksetzen(self, stand=None):
+        with self.lock:
+            self.version += 1
+            self.basis = self.version
+            self._eintraege.clear()
+            self.stand = stand
+
+    def abgleichen(self, stand):
+        with self.lock:
+            if stand != self.stand:
+                self.zuruecksetzen(stand)
+
+    def seit(self, version):
+        """(aktuelle Version, Änderungen danach); None statt der Liste, wenn neu zu lesen ist."""
+        with self.lock:
+            if version < self.basis or version < self.version - len(self._eintraege):
+                return self.version, None
+            return self.version, list(self._eintraege)[len(self._eintraege) - (self.version - version):]
+
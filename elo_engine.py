@@ -0,0 +1,245 @@
+import math
+import numpy as np
+import pandas as pd
+
+# ---------------------
+# KONFIGURATION
+# ---------------------
+START_ELO = 1000
+K_FAKTOR = 28
+
+
+def erwartung(a, b):
+    return 1 / (1 + math.pow(10, (b - a) / 400))
+
+
+# ---------------------
+# RATING-ZUSTAND
+# ---------------------
+class EloZustand:
+    """Elo und Spielanzahl aller Spieler als flache Arrays, Namen -> Integer-ID."""
+
+    def __init__(self, namen=(), start_elo=START_ELO):
+        self.start_elo = start_elo
+        self.namen = []
+        self.ids = {}
+        self.elo = np.zeros(0, dtype=np.int64)
+        self.spiele = np.zeros(0, dtype=np.int64)
+        self.ids_fuer(namen)
+
+    def ids_fuer(self, namen):
+        neu = []
+        ids = []
+        for n in namen:
+            i = self.ids.get(n)
+            if i is None:
+                i = len(self.namen)
+                self.ids[n] = i
+                self.namen.append(n)
+                neu.append(n)
+            ids.append(i)
+        if neu:
+            self.elo = np.concatenate([self.elo, np.full(len(neu), self.start_elo, dtype=np.int64)])
+            self.spiele = np.concatenate([self.spiele, np.zeros(len(neu), dtype=np.int64)])
+        return np.asarray(ids, dtype=np.int64)
+
+    def kopie(self):
+        k = EloZustand(start_elo=self.start_elo)
+        k.namen = list(self.namen)
+        k.ids = dict(self.ids)
+        k.elo = self.elo.copy()
+        k.spiele = self.spiele.copy()
+        return k
+
+    def als_dataframe(self):
+        return pd.DataFrame({"Elo": self.elo, "Spiele": self.spiele}, index=pd.Index(self.namen, name="name"))
+
+
+# ---------------------
+# REPLAY
+# ---------------------
+def match_faktoren(la, lb, avga, avgb):
+    """Alles, was nur vom Spiel selbst abhängt: Ergebnis, G- und M-Faktoren."""
+    la = np.asarray(la, dtype=np.int64)
+    lb = np.asarray(lb, dtype=np.int64)
+    avga = np.asarray(avga, dtype=np.float64)
+    avgb = np.asarray(avgb, dtype=np.float64)
+    sa = (la > lb).astype(np.int64)
+    sb = 1 - sa
+    G = 1 + np.abs(la - lb) / 10
+    ma = 0.3 * (avga - 50) / 50
+    mb = 0.3 * (avgb - 50) / 50
+    M_a = np.where(sa == 1, 1 + ma, 1 - ma)
+    M_b = np.where(sb == 1, 1 + mb, 1 - mb)
+    return sa, G, M_a, M_b
+
+
+def spiele_anwenden(zustand, ia, ib, la, lb, avga, avgb, k=K_FAKTOR):
+    """Wendet Spiele der Reihe nach auf `zustand` an und gibt die gerundeten Deltas zurück.
+
+    Erwartung und D hängen vom laufenden Rating ab und bleiben deshalb sequenziell,
+    der Rest kommt vektorisiert aus `match_faktoren`.
+    """
+    sa, G, M_a, M_b = match_faktoren(la, lb, avga, avgb)
+    n = len(sa)
+    delta_a = np.zeros(n, dtype=np.int64)
+    delta_b = np.zeros(n, dtype=np.int64)
+    elo, spiele = zustand.elo, zustand.spiele
+    for i, (a, b, s, g, m_a, m_b) in enumerate(zip(ia.tolist(), ib.tolist(), sa.tolist(),
+                                                   G.tolist(), M_a.tolist(), M_b.tolist())):
+        ea, eb = int(elo[a]), int(elo[b])
+        exp_a = erwartung(ea, eb)
+        exp_b = erwartung(eb, ea)
+        D = min(1.3, 1 + abs(ea - eb) / 1200)
+        da = k * g * D * (s - exp_a) * m_a
+        db = k * g * D * ((1 - s) - exp_b) * m_b
+        elo[a] = round(ea + da)
+        elo[b] = round(eb + db)
+        delta_a[i] = round(da)
+        delta_b[i] = round(db)
+        spiele[a] += 1
+        spiele[b] += 1
+    return delta_a, delta_b
+
+
+def log_spalten(df_log):
+    return (df_log["Legs A"].astype(int).to_numpy(), df_log["Legs B"].astype(int).to_numpy(),
+            df_log["Avg A"].astype(float).to_numpy(), df_log["Avg B"].astype(float).to_numpy())
+
+
+def _eingabe(df_log):
+    """Die für das Rating relevanten Spalten, zum Vergleich zweier Log-Stände."""
+    return (df_log["Spieler A"].to_numpy(dtype=object), df_log["Spieler B"].to_numpy(dtype=object)) + log_spalten(df_log)
+
+
+def _spieltag_grenzen(df_log):
+    datum = df_log["Datum"].astype(str).to_numpy()
+    if len(datum) == 0:
+        return [0]
+    return [0] + (np.flatnonzero(datum[1:] != datum[:-1]) + 1).tolist()
+
+
+class EloCheckpoints:
+    """Ratingzustände vor jedem Spieltag eines Replays, dazu die abgespielte Eingabe.
+
+    Solange die ersten n Zeilen eines Logs mit der Eingabe übereinstimmen, ist jeder
+    Checkpoint an Position <= n weiterhin gültig und ein Replay kann dort aufsetzen.
+    """
+
+    def __init__(self, positionen, zustaende, eingabe):
+        self.positionen = positionen
+        self.zustaende = zustaende
+        self.eingabe = eingabe
+
+    def gleicher_anfang(self, df_log):
+        neu = _eingabe(df_log)
+        n = min(len(neu[0]), len(self.eingabe[0]))
+        abweichend = np.zeros(n, dtype=bool)
+        for alt_spalte, neu_spalte in zip(self.eingabe, neu):
+            abweichend |= alt_spalte[:n] != neu_spalte[:n]
+        treffer = np.flatnonzero(abweichend)
+        return int(treffer[0]) if len(treffer) else n
+
+    def vor(self, pos):
+        i = int(np.searchsorted(self.positionen, pos, side="right")) - 1
+        return self.positionen[i], self.zustaende[i].kopie()
+
+
+def _replay_ab(zustand, df_log, ab, k):
+    """Spielt df_log ab Zeile `ab` auf `zustand` ab und merkt sich die Zustände an den Spieltagsgrenzen."""
+    grenzen = [g for g in _spieltag_grenzen(df_log) if g > ab]
+    positionen, zustaende = [], []
+    delta_a = np.zeros(len(df_log) - ab, dtype=np.int64)
+    delta_b = np.zeros(len(df_log) - ab, dtype=np.int64)
+    ia = zustand.ids_fuer(df_log["Spieler A"].iloc[ab:])
+    ib = zustand.ids_fuer(df_log["Spieler B"].iloc[ab:])
+    spalten = log_spalten(df_log.iloc[ab:])
+    for von, bis in zip([ab] + grenzen, grenzen + [len(df_log)]):
+        positionen.append(von)
+        zustaende.append(zustand.kopie())
+        t = slice(von - ab, bis - ab)
+        delta_a[t], delta_b[t] = spiele_anwenden(zustand, ia[t], ib[t], *(c[t] for c in spalten), k=k)
+    return delta_a, delta_b, positionen, zustaende
+
+
+def replay_mit_checkpoints(df_spieler, df_log, start_elo=START_ELO, k=K_FAKTOR):
+    """Komplettes Replay des Logs ab START_ELO; Ergebnis wie früher `_elo_kern`, plus Checkpoints."""
+    alle = pd.concat([df_spieler.index.to_series(), df_log["Spieler A"], df_log["Spieler B"]]).dropna().unique()
+    zustand = EloZustand(alle, start_elo=start_elo)
+    df_log = df_log.copy()
+    delta_a, delta_b, positionen, zustaende = _replay_ab(zustand, df_log, 0, k)
+    if not df_log.empty:
+        df_log["Elo A"] = delta_a
+        df_log["Elo B"] = delta_b
+    df = df_spieler.reindex(zustand.namen)
+    df["Elo"] = zustand.elo
+    df["Spiele"] = zustand.spiele
+    return df, df_log, EloCheckpoints(positionen, zustaende, _eingabe(df_log))
+
+
+def replay(df_spieler, df_log, start_elo=START_ELO, k=K_FAKTOR):
+    df, df_log, _ = replay_mit_checkpoints(df_spieler, df_log, start_elo=start_elo, k=k)
+    return df, df_log
+
+
+def replay_suffix(checkpoints, df_spieler, df_log, k=K_FAKTOR):
+    """Replay nur ab dem letzten Checkpoint vor der ersten geänderten Zeile.
+
+    Gibt (df, df_log, checkpoints, ab) zurück; Zeilen vor `ab` bleiben unverändert.
+    """
+    ab, zustand = checkpoints.vor(checkpoints.gleicher_anfang(df_log))
+    alle = pd.concat([df_spieler.index.to_series(), df_log["Spieler A"], df_log["Spieler B"]]).dropna().unique()
+    zustand.ids_fuer(alle)
+    df_log = df_log.copy()
+    delta_a, delta_b, positionen, zustaende = _replay_ab(zustand, df_log, ab, k)
+    if len(df_log) > ab:
+        df_log["Elo A"] = np.concatenate([df_log["Elo A"].iloc[:ab].astype(np.int64).to_numpy(), delta_a])
+        df_log["Elo B"] = np.concatenate([df_log["Elo B"].iloc[:ab].astype(np.int64).to_numpy(), delta_b])
+    i = checkpoints.positionen.index(ab)
+    checkpoints = EloCheckpoints(checkpoints.positionen[:i] + positionen,
+                                 checkpoints.zustaende[:i] + zustaende, _eingabe(df_log))
+    ids = zustand.ids_fuer(alle)
+    df = df_spieler.reindex(alle)
+    df["Elo"] = zustand.elo[ids]
+    df["Spiele"] = zustand.spiele[ids]
+    return df, df_log, checkpoints, ab
+
+
+# ---------------------
+# VEKTORISIERT ÜBER UNABHÄNGIGE VARIANTEN
+# ---------------------
+def erwartung_np(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return 1 / (1 + np.power(10.0, (b - a) / 400))
+
+
+def spiel_parallel(ea, eb, la, lb, avga, avgb, k=K_FAKTOR):
+    """Ein Spiel in vielen Varianten gleichzeitig (z. B. Simulationen): Arrays gleicher
+    Länge rein, neue Ratings raus. Gleiche Formel wie `spiele_anwenden`."""
+    ea = np.asarray(ea, dtype=np.int64)
+    eb = np.asarray(eb, dtype=np.int64)
+    sa, G, M_a, M_b = match_faktoren(la, lb, avga, avgb)
+    D = np.minimum(1.3, 1 + np.abs(ea - eb) / 1200)
+    da = k * G * D * (sa - erwartung_np(ea, eb)) * M_a
+    db = k * G * D * ((1 - sa) - erwartung_np(eb, ea)) * M_b
+    return np.round(ea + da).astype(np.int64), np.round(eb + db).astype(np.int64)
+
+
+# ---------------------
+# INKREMENTELL
+# ---------------------
+def zustand_aus_spielern(df_spieler, start_elo=START_ELO):
+    """Gespeicherter Stand aus der Spielertabelle als Ausgangspunkt für neue Spiele."""
+    zustand = EloZustand(df_spieler.index, start_elo=start_elo)
+    if len(df_spieler):
+        zustand.elo[:] = df_spieler["Elo"].astype(float).round().astype(np.int64).to_numpy()
+        zustand.spiele[:] = df_spieler["Spiele"].astype(np.int64).to_numpy()
+    return zustand
+
+
+def spiele_anhaengen(zustand, spieler_a, spieler_b, la, lb, avga, avgb, k=K_FAKTOR):
+    """Bewertet neue Spiele am Ende des Logs, ohne die Historie erneut abzuspielen."""
+    ia = zustand.ids_fuer(spieler_a)
+    ib = zustand.ids_fuer(spieler_b)
+    return spiele_anwenden(zustand, ia, ib, la, lb, avga, avgb, k=k)
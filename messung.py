@@ -0,0 +1,147 @@
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# obere Grenzen der Histogramm-Fächer in ms, dazu ein Fach für alles darüber
+GRENZEN_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+SPEICHER_METHODEN = ("alle", "zeile", "upsert", "insert", "update", "patche", "loesche", "marke", "delta",
+                     "anzahl", "schluessel")
+
+
+class Messpunkt:
+    """Ein offener Abschnitt; `zeilen` setzt der gemessene Code, `kinder_ms` die Abschnitte darin."""
+
+    __slots__ = ("zeilen", "kinder_ms")
+
+    def __init__(self):
+        self.zeilen = 0
+        self.kinder_ms = 0.0
+
+
+class Protokoll:
+    """Prozessweite Messwerte: Latenz-Histogramme je Abschnitt und die letzten `laenge` Seitenläufe.
+
+    Ein Seitenlauf (`lauf`) sammelt je Abschnitt Aufrufe, Gesamtzeit, eigene Zeit (ohne
+    darin verschachtelte Abschnitte) und übertragene Zeilen. Abschnitte außerhalb eines
+    Laufs (z. B. Fragment-Reruns) landen nur in den Histogrammen.
+    """
+
+    def __init__(self, laenge=50):
+        self.lock = threading.Lock()
+        self.histogramme = {}  # name -> [Aufrufe je Fach]
+        self.zeilen = {}       # name -> übertragene Zeilen insgesamt
+        self.laeufe = deque(maxlen=laenge)
+        self._lokal = threading.local()
+
+    def _stapel(self):
+        if not hasattr(self._lokal, "stapel"):
+            self._lokal.stapel = []
+        return self._lokal.stapel
+
+    @contextmanager
+    def abschnitt(self, name):
+        stapel = self._stapel()
+        m = Messpunkt()
+        stapel.append(m)
+        start = time.perf_counter()
+        try:
+            yield m
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            stapel.pop()
+            if stapel:
+                stapel[-1].kinder_ms += ms
+            self._buchen(name, ms, ms - m.kinder_ms, m.zeilen)
+
+    def _buchen(self, name, ms, eigen_ms, zeilen):
+        fach = next((i for i, g in enumerate(GRENZEN_MS) if ms <= g), len(GRENZEN_MS))
+        with self.lock:
+            self.histogramme.setdefault(name, [0] * (len(GRENZEN_MS) + 1))[fach] += 1
+            self.zeilen[name] = self.zeilen.get(name, 0) + zeilen
+        lauf = getattr(self._lokal, "lauf", None)
+        if lauf is not None:
+            a = lauf["abschnitte"].setdefault(name, {"aufrufe": 0, "ms": 0.0, "eigen_ms": 0.0, "zeilen": 0})
+            a["aufrufe"] += 1
+            a["ms"] += ms
+            a["eigen_ms"] += eigen_ms
+            a["zeilen"] += zeilen
+
+    @contextmanager
+    def lauf(self, seite):
+        """Ein Skriptlauf für `seite`; wird auch bei st.rerun/st.stop (Ausnahmen) eingetragen."""
+        lauf = {"seite": seite, "zeit": time.time(), "ms": 0.0, "abschnitte": {}}
+        self._lokal.lauf = lauf
+        self._lokal.stapel = []
+        start = time.perf_counter()
+        try:
+            yield lauf
+        finally:
+            lauf["ms"] = (time.perf_counter() - start) * 1000
+            self._lokal.lauf = None
+            with self.lock:
+                self.laeufe.append(lauf)
+
+    def letzte(self, n):
+        with self.lock:
+            return list(self.laeufe)[-n:][::-1]
+
+    def histogramm(self):
+        """{name: (Aufrufe je Fach, Zeilen)} als Kopie."""
+        with self.lock:
+            return {name: (list(h), self.zeilen[name]) for name, h in self.histogramme.items()}
+
+
+PROTOKOLL = Protokoll()
+
+
+def lauf(seite):
+    return PROTOKOLL.lauf(seite)
+
+
+def abschnitt(name):
+    """Misst den Block als `name`; `with abschnitt(...) as m: m.zeilen = n` zählt Zeilen."""
+    return PROTOKOLL.abschnitt(name)
+
+
+def gemessen(name=None):
+    """Dekorator: jeder Aufruf ist ein Abschnitt `name` (sonst der Funktionsname)."""
+    def dekorator(f):
+        titel = name or f.__name__
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            with PROTOKOLL.abschnitt(titel):
+                return f(*args, **kwargs)
+        return wrapper
+    return dekorator
+
+
+def _speicher_zeilen(methode, args, ergebnis):
+    if methode in ("upsert", "insert"):
+        return len(args[0])
+    if methode in ("alle", "delta", "schluessel"):
+        return len(ergebnis)
+    if methode in ("zeile", "update", "patche", "loesche"):
+        return 1 if ergebnis or methode == "loesche" else 0
+    return 0
+
+
+class GemessenerSpeicher:
+    """Reicht alles an `speicher` durch; jeder Round-Trip wird als "db.<methode> <tabelle>" gemessen."""
+
+    def __init__(self, speicher):
+        self.speicher = speicher
+
+    def __getattr__(self, name):
+        ziel = getattr(self.speicher, name)
+        if name not in SPEICHER_METHODEN:
+            return ziel
+
+        def methode(tabelle, *args, **kwargs):
+            with PROTOKOLL.abschnitt(f"db.{name} {tabelle}") as m:
+                ergebnis = ziel(tabelle, *args, **kwargs)
+                m.zeilen = _speicher_zeilen(name, args, ergebnis)
+                return ergebnis
+        return methode
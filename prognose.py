@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from elo_engine import K_FAKTOR, START_ELO, erwartung_np, spiel_parallel
+from messung import gemessen
+
+
+def sieg_wahrscheinlichkeiten(spiele, elo):
+    """P(Spieler A gewinnt) für jedes Spiel (a, b) aus den Ratings vor dem Spieltag."""
+    if not spiele:
+        return np.zeros(0)
+    ea = np.array([elo.get(a, START_ELO) for a, _ in spiele], dtype=np.float64)
+    eb = np.array([elo.get(b, START_ELO) for _, b in spiele], dtype=np.float64)
+    return erwartung_np(ea, eb)
+
+
+def leg_verteilung(df_log):
+    """Bisherige Ergebnisse als (Legs Sieger, Legs Verlierer), daraus wird gezogen."""
+    if df_log.empty:
+        return np.array([[3, 1]])
+    la = df_log["Legs A"].astype(int).to_numpy()
+    lb = df_log["Legs B"].astype(int).to_numpy()
+    legs = np.column_stack([np.maximum(la, lb), np.minimum(la, lb)])
+    legs = legs[legs[:, 0] > legs[:, 1]]
+    return legs if len(legs) else np.array([[3, 1]])
+
+
+@gemessen("prognose.spieltag")
+def spieltag_prognose(spiele, df_spieler, avgs, legs, fest=None, simulationen=5000, seed=None, k=K_FAKTOR):
+    """Monte Carlo über `simulationen` Spieltage auf einmal (eine Spalte pro Spieler).
+
+    `spiele` sind (a, b) in Spielreihenfolge, `fest` bildet Positionen darin auf schon
+    bekannte Ergebnisse (legs_a, legs_b, avg_a, avg_b) ab. Sieger werden nach der
+    Erwartung zum jeweiligen simulierten Stand gezogen, das Leg-Ergebnis aus `legs`,
+    als Average nimmt jeder Spieler seinen Durchschnitt aus `avgs` (sonst 50).
+    Gibt (P(A gewinnt) je Spiel, Tabelle je Spieler) zurück.
+    """
+    fest = fest or {}
+    rng = np.random.default_rng(seed)
+    elo_start = df_spieler["Elo"].astype(float).round().astype(np.int64).to_dict()
+    im_plan = {s for spiel in spiele for s in spiel}
+    aktiv = [s for s in df_spieler.index if df_spieler.loc[s, "Spiele"] > 0 or s in im_plan]
+    aktiv += [s for s in sorted(im_plan) if s not in df_spieler.index]
+    aktiv.sort(key=lambda s: -elo_start.get(s, START_ELO))
+    spalte = {s: i for i, s in enumerate(aktiv)}
+    elo = np.tile(np.array([elo_start.get(s, START_ELO) for s in aktiv], dtype=np.int64), (simulationen, 1))
+    start = elo[0].copy()
+    p_sieg = sieg_wahrscheinlichkeiten(spiele, elo_start)
+    for pos, (a, b) in enumerate(spiele):
+        ia, ib = spalte[a], spalte[b]
+        if pos in fest:
+            la, lb, avga, avgb = fest[pos]
+            p_sieg[pos] = 1.0 if la > lb else 0.0
+        else:
+            sieg_a = rng.random(simulationen) < erwartung_np(elo[:, ia], elo[:, ib])
+            gezogen = legs[rng.integers(len(legs), size=simulationen)]
+            la = np.where(sieg_a, gezogen[:, 0], gezogen[:, 1])
+            lb = np.where(sieg_a, gezogen[:, 1], gezogen[:, 0])
+            avga, avgb = avgs.get(a, 50.0), avgs.get(b, 50.0)
+        n = simulationen
+        elo[:, ia], elo[:, ib] = spiel_parallel(elo[:, ia], elo[:, ib], np.broadcast_to(la, n),
+                                                np.broadcast_to(lb, n), np.broadcast_to(avga, n),
+                                                np.broadcast_to(avgb, n), k=k)
+    reihenfolge = np.argsort(-elo, axis=1, kind="stable")
+    rang = np.empty_like(reihenfolge)
+    rang[np.arange(simulationen)[:, None], reihenfolge] = np.arange(1, len(aktiv) + 1)
+    tabelle = pd.DataFrame({
+        "Elo": start,
+        "Erw. Änderung": (elo - start).mean(axis=0),
+        "Ø Rang": rang.mean(axis=0),
+        "Platz 1": (rang == 1).mean(axis=0),
+        "Top 3": (rang <= 3).mean(axis=0),
+        "Rang 5%": np.percentile(rang, 5, axis=0, method="lower"),
+        "Rang 95%": np.percentile(rang, 95, axis=0, method="higher"),
+    }, index=pd.Index(aktiv, name="Spieler"))
+    return p_sieg, tabelle.sort_values("Ø Rang")
@@ -0,0 +1,13 @@
+# Menüpunkt -> Modul mit `anzeigen()`; importiert wird erst, wenn die Seite gezeigt wird
+SEITEN = {
+    "Rangliste 🥇": "seiten.rangliste",
+    "Spiel eintragen 🎯": "seiten.spiel_eintragen",
+    "Vergangene Spiele 📄": "seiten.vergangene_spiele",
+    "Head-to-Head ⚔️": "seiten.head_to_head",
+    "Bestenlisten 🏅": "seiten.bestenlisten",
+    "Spieler anlegen ➕": "seiten.spieler_anlegen",
+    "Auslosung 🎲": "seiten.auslosung_seite",
+    "Spieltage 📊": "seiten.spieltage",
+    "Turnier 🏆": "seiten.turnier_seite",
+    "Admin 🔐": "seiten.admin",
+}
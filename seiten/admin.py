@@ -0,0 +1,82 @@
+import time
+import pandas as pd
+import streamlit as st
+
+import messung
+from basis import (PASSWORT, berechne_elo_aus_log, db_anfragen, get_datenstand, lade_log, lade_spieler,
+                   loesche_spielplan_db, speichere_spieler)
+
+
+def _abschnitte(lauf):
+    """Abschnitte eines Seitenlaufs nach eigener Zeit, plus der ungemessene Rest der Seite."""
+    zeilen = [{"Abschnitt": name, "Aufrufe": a["aufrufe"], "Gesamt ms": a["ms"], "Eigene ms": a["eigen_ms"],
+               "Zeilen": a["zeilen"]} for name, a in lauf["abschnitte"].items()]
+    rest = lauf["ms"] - sum(a["eigen_ms"] for a in lauf["abschnitte"].values())
+    zeilen.append({"Abschnitt": "(übrige Seite)", "Aufrufe": 1, "Gesamt ms": rest, "Eigene ms": rest, "Zeilen": 0})
+    df = pd.DataFrame(zeilen).sort_values("Eigene ms", ascending=False, ignore_index=True)
+    df["Anteil %"] = df["Eigene ms"] / max(lauf["ms"], 1e-9) * 100
+    return df.round(1)
+
+
+def _db_summe(lauf, feld):
+    return sum(a[feld] for name, a in lauf["abschnitte"].items() if name.startswith("db."))
+
+
+def zeige_laufzeiten():
+    n = st.number_input("Letzte Seitenläufe", min_value=1, max_value=messung.PROTOKOLL.laeufe.maxlen, value=10)
+    laeufe = messung.PROTOKOLL.letzte(int(n))
+    if not laeufe:
+        st.info("Noch keine Seitenläufe gemessen.")
+        return
+    uebersicht = pd.DataFrame([{
+        "Zeit": time.strftime("%H:%M:%S", time.localtime(l["zeit"])), "Seite": l["seite"], "ms": round(l["ms"], 1),
+        "DB-Aufrufe": _db_summe(l, "aufrufe"), "Zeilen": _db_summe(l, "zeilen"),
+        "Größter Abschnitt": "{Abschnitt} ({Anteil %:.0f} %)".format(**_abschnitte(l).iloc[0]),
+    } for l in laeufe])
+    st.dataframe(uebersicht, hide_index=True, use_container_width=True)
+    wahl = st.selectbox("Seitenlauf", range(len(laeufe)),
+                        format_func=lambda i: f"{uebersicht['Zeit'][i]} {laeufe[i]['seite']} – {laeufe[i]['ms']:.0f} ms")
+    st.dataframe(_abschnitte(laeufe[wahl]), hide_index=True, use_container_width=True)
+    with st.expander("Latenz-Histogramme seit Prozessstart"):
+        faecher = [f"≤{g} ms" for g in messung.GRENZEN_MS] + [f">{messung.GRENZEN_MS[-1]} ms"]
+        histogramm = messung.PROTOKOLL.histogramm()
+        df = pd.DataFrame([h for h, _ in histogramm.values()], columns=faecher, index=list(histogramm))
+        df.insert(0, "Aufrufe", df.sum(axis=1))
+        df["Zeilen"] = [z for _, z in histogramm.values()]
+        st.dataframe(df.sort_index(), use_container_width=True)
+
+
+def anzeigen():
+    st.subheader("🔐 Admin")
+    pw = st.text_input("Passwort", type="password", key="admin")
+    if pw == PASSWORT:
+        df = lade_spieler()
+        st.markdown("### Saison Multiplikator (Abstände zusammenziehen)")
+        faktor = st.slider("Multiplikator", 0.1, 1.0, 0.5, 0.05)
+        preview = df.copy()
+        preview["Neu"] = 1000 + ((preview["Elo"] - 1000) * faktor)
+        st.dataframe(preview[["Elo", "Neu"]].round(0))
+        if st.button("Abschließend übernehmen"):
+            df["Elo"] = preview["Neu"].round(0)
+            speichere_spieler(df)
+            st.success("Punkteabstände übernommen!")
+        st.markdown("---")
+        st.markdown("### Elos neu berechnen")
+        if st.button("🔄 Alle Elos neu berechnen"):
+            df_log = lade_log()
+            vorher = db_anfragen()
+            berechne_elo_aus_log(df_log)
+            st.success(f"Elos wurden neu berechnet! ({db_anfragen() - vorher} DB-Anfragen)")
+        st.markdown("---")
+        st.markdown("### Daten neu laden")
+        if st.button("♻️ Zwischenspeicher verwerfen"):
+            get_datenstand().invalidieren()
+            st.success("Daten werden beim nächsten Aufruf neu geladen.")
+        st.markdown("---")
+        st.markdown("### Aktiven Spielplan zurücksetzen")
+        if st.button("🗑 Spielplan in DB löschen"):
+            loesche_spielplan_db()
+            st.success("Spielplan gelöscht.")
+        st.markdown("---")
+        st.markdown("### Laufzeiten")
+        zeige_laufzeiten()
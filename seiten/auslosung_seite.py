@@ -0,0 +1,279 @@
+import pandas as pd
+import streamlit as st
+
+import auslosung
+import prognose
+from basis import (AUSLOSUNG_MAX_ABSTAND, AUSLOSUNG_WIEDERHOLUNG, PASSWORT, PROGNOSE_SIMULATIONEN,
+                   SPIELPLAN_LIVE_INTERVALL, aktuelle_statistik, lade_log, lade_spieler, lade_spielplan_db,
+                   loesche_spielplan_db, log_spieltag, speichere_ergebnis_db, speichere_spielplan_db,
+                   spielplan_aenderungen, zeige_spieltag_zusammenfassung)
+
+
+def zeige_prognose(spielplan, reihenfolge, ergebnisse, locked):
+    if not st.checkbox("📈 Prognose anzeigen", key="prognose_anzeigen"):
+        return
+    stat = aktuelle_statistik()
+    spiele = [(spielplan[i][0], spielplan[i][1]) for i in reihenfolge]
+    fest = {}
+    for pos, i in enumerate(reihenfolge):
+        if i in locked and i in ergebnisse:
+            e = ergebnisse[i]
+            fest[pos] = (int(e["legs_a"]), int(e["legs_b"]), float(e["avg_a"]), float(e["avg_b"]))
+    avgs = stat.aggregate["avg"].astype(float).to_dict()
+    p_sieg, tabelle = prognose.spieltag_prognose(spiele, lade_spieler(), avgs, prognose.leg_verteilung(stat.df_log),
+                                                 fest=fest, simulationen=PROGNOSE_SIMULATIONEN)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Siegwahrscheinlichkeiten**")
+        for (a, b), p in zip(spiele, p_sieg):
+            st.markdown(f"{a} **{p * 100:.0f}%** : **{(1 - p) * 100:.0f}%** {b}")
+    with col2:
+        st.markdown(f"**Rangliste danach** ({PROGNOSE_SIMULATIONEN} Simulationen)")
+        anzeige = pd.DataFrame({
+            "Elo": tabelle["Elo"],
+            "Erw. Δ": tabelle["Erw. Änderung"].map(lambda x: f"{x:+.1f}"),
+            "Ø Rang": tabelle["Ø Rang"].round(1),
+            "Platz 1": (tabelle["Platz 1"] * 100).round(1).astype(str) + "%",
+            "Top 3": (tabelle["Top 3"] * 100).round(1).astype(str) + "%",
+            "Rang 90%": tabelle["Rang 5%"].astype(str) + "–" + tabelle["Rang 95%"].astype(str),
+        })
+        st.dataframe(anzeige, use_container_width=True)
+
+
+# Ergebnisfeld -> (Widget-Präfix, Vorgabe)
+ERGEBNIS_FELDER = {"legs_a": ("la", 0), "legs_b": ("lb", 0), "avg_a": ("avga", 50.0), "avg_b": ("avgb", 50.0)}
+
+
+def ergebnisbogen(plan):
+    """Ergebnisse aller Spiele: gesperrte aus dem Plan, offene aus den Eingabefeldern."""
+    bogen = {}
+    for i in plan["reihenfolge"]:
+        vorher = plan["ergebnisse"].get(i, {})
+        if i in plan["locked"]:
+            bogen[i] = {f: vorher.get(f, v) for f, (_, v) in ERGEBNIS_FELDER.items()}
+        else:
+            bogen[i] = {f: st.session_state.get(f"{k}_{i}", vorher.get(f, v)) for f, (k, v) in ERGEBNIS_FELDER.items()}
+    return bogen
+
+
+def _sperren(idx):
+    speichere_ergebnis_db(idx, {f: st.session_state[f"{k}_{idx}"] for f, (k, _) in ERGEBNIS_FELDER.items()}, True)
+    # die Prognose unten hängt an den gesperrten Ergebnissen
+    st.session_state.plan_neu_zeichnen = bool(st.session_state.get("prognose_anzeigen"))
+
+
+def _entsperren(idx):
+    speichere_ergebnis_db(idx, lade_spielplan_db()["ergebnisse"].get(idx, {}), False)
+    st.session_state.plan_neu_zeichnen = bool(st.session_state.get("prognose_anzeigen"))
+
+
+def _entfernen(idx):
+    plan = lade_spielplan_db()
+    speichere_spielplan_db(plan["spielplan"], plan["spieltag"], plan["extra_spieler"],
+        {k: v for k, v in ergebnisbogen(plan).items() if k != idx},
+        [x for x in plan["locked"] if x != idx], [x for x in plan["reihenfolge"] if x != idx])
+    st.session_state.plan_neu_zeichnen = True
+
+
+@st.fragment
+def ergebnis_zeile(orig_idx):
+    """Eine Zeile des Ergebnisbogens. Eingaben laufen nur diese Zeile neu durch, Sperren und
+    Entsperren schreiben nur ihr Ergebnis; der Plan kommt aus dem Stand im Speicher."""
+    if st.session_state.pop("plan_neu_zeichnen", False):
+        st.rerun()
+    plan = lade_spielplan_db()
+    if plan is None or orig_idx not in plan["reihenfolge"]:
+        return
+    a, b = plan["spielplan"][orig_idx][:2]
+    vorher = plan["ergebnisse"].get(orig_idx, {})
+    if orig_idx in plan["locked"]:
+        la = vorher.get("legs_a", 0); lb = vorher.get("legs_b", 0)
+        avga = vorher.get("avg_a", 50.0); avgb = vorher.get("avg_b", 50.0)
+        cols = st.columns([6, 1, 1])
+        with cols[0]:
+            st.markdown(
+                f"<div style='background:#f0fdf4;border:1px solid #bbf7d0;border-radius:6px;"
+                f"padding:8px 10px;font-size:14px;'>"
+                f"✅ <b>{a}</b> {int(la)}:{int(lb)} <b>{b}</b>"
+                f" &nbsp;·&nbsp; Avg {float(avga):.1f} / {float(avgb):.1f}</div>",
+                unsafe_allow_html=True)
+        with cols[1]:
+            st.button("🔓", key=f"unlock_{orig_idx}", on_click=_entsperren, args=(orig_idx,))
+        with cols[2]:
+            st.button("🗑", key=f"del_{orig_idx}", on_click=_entfernen, args=(orig_idx,))
+    else:
+        cols = st.columns([3, 3, 2, 2, 2, 2, 1, 1])
+        with cols[0]: st.markdown(f"**{a}**")
+        with cols[1]: st.markdown(f"**{b}**")
+        with cols[2]:
+            st.number_input("", min_value=0, step=1, value=vorher.get("legs_a", 0), key=f"la_{orig_idx}", label_visibility="collapsed")
+        with cols[3]:
+            st.number_input("", min_value=0, step=1, value=vorher.get("legs_b", 0), key=f"lb_{orig_idx}", label_visibility="collapsed")
+        with cols[4]:
+            st.number_input("", min_value=0.0, step=0.1, value=vorher.get("avg_a", 50.0), key=f"avga_{orig_idx}", label_visibility="collapsed")
+        with cols[5]:
+            st.number_input("", min_value=0.0, step=0.1, value=vorher.get("avg_b", 50.0), key=f"avgb_{orig_idx}", label_visibility="collapsed")
+        with cols[6]:
+            st.button("🔒", key=f"lock_{orig_idx}", on_click=_sperren, args=(orig_idx,))
+        with cols[7]:
+            st.button("🗑", key=f"del2_{orig_idx}", on_click=_entfernen, args=(orig_idx,))
+
+
+def hat_runden(spielplan):
+    # Runden nur anzeigen, wenn mehrere Spiele parallel laufen (ältere Pläne haben keine)
+    return bool(spielplan) and all(len(s) > 2 for s in spielplan) and len({s[2] for s in spielplan}) < len(spielplan)
+
+
+@st.fragment(run_every=SPIELPLAN_LIVE_INTERVALL)
+def spielplan_live():
+    """Schreibgeschützter Spielplan für Zuschauer. Je Tick nur ein Blick auf den Feed; die
+    Session hält eine Kopie des Plans und übernimmt nur die geänderten Spiele."""
+    ss = st.session_state
+    version, aenderungen = spielplan_aenderungen(ss.get("live_version", -1))
+    if aenderungen is None or "live_plan" not in ss:
+        alt, neu = ss.get("live_plan"), lade_spielplan_db()
+        ss.live_plan, ss.live_version = neu, version
+        # anderer Plan (oder keiner mehr): Kopfzeile und Prognose gehören zur ganzen Seite
+        if alt is not None and (neu is None or (neu["spieltag"], neu["spielplan"]) != (alt["spieltag"], alt["spielplan"])):
+            st.rerun()
+    else:
+        for a in aenderungen:
+            ss.live_plan["ergebnisse"][a["idx"]] = a["ergebnis"]
+            ss.live_plan["locked"] = [x for x in ss.live_plan["locked"] if x != a["idx"]] + ([a["idx"]] if a["gesperrt"] else [])
+    ss.live_version = version
+    plan = ss.live_plan
+    if plan is None:
+        return
+    spielplan, ergebnisse, locked = plan["spielplan"], plan["ergebnisse"], set(plan["locked"])
+    mit_runden = hat_runden(spielplan)
+    runde_vorher = None
+    for orig_idx in plan["reihenfolge"]:
+        spiel = spielplan[orig_idx]
+        a, b = spiel[0], spiel[1]
+        if mit_runden and spiel[2] != runde_vorher:
+            runde_vorher = spiel[2]
+            st.markdown(f"**Runde {runde_vorher}**")
+        vorher = ergebnisse.get(orig_idx, {})
+        ist_gesperrt = orig_idx in locked
+        la = vorher.get("legs_a", 0); lb = vorher.get("legs_b", 0)
+        if ist_gesperrt:
+            st.markdown(f"✅ ~~{a}~~ vs ~~{b}~~ &nbsp; → **{int(la)}:{int(lb)}**")
+        elif la > 0 or lb > 0:
+            st.markdown(f"⏳ **{a}** vs **{b}** &nbsp; → {int(la)}:{int(lb)} *(nicht gesperrt)*")
+        else:
+            st.markdown(f"⏳ **{a}** vs **{b}**")
+
+
+def anzeigen():
+    st.subheader("🎲 Spieltags-Auslosung")
+    df_spieler_liste = list(lade_spieler().index)
+    db_plan = lade_spielplan_db()
+
+    if db_plan is None:
+        if st.session_state.zeige_zusammenfassung and st.session_state.zusammenfassung_spieltag:
+            st.success(f"✅ Spieltag {st.session_state.zusammenfassung_spieltag} wurde in die Rangliste übernommen!")
+            st.markdown("---")
+            zeige_spieltag_zusammenfassung(st.session_state.zusammenfassung_spieltag)
+            st.markdown("---")
+            if st.button("Neue Auslosung starten"):
+                st.session_state.zeige_zusammenfassung = False
+                st.session_state.zusammenfassung_spieltag = None
+                st.rerun()
+        else:
+            st.markdown("### Anwesende Spieler auswählen")
+            anwesend = st.multiselect("Spieler", df_spieler_liste)
+            gegner_anzahl = st.slider("Anzahl Gegner pro Spieler", min_value=3, max_value=5, value=4)
+            bretter = st.number_input("Anzahl Boards", min_value=1, max_value=16, value=1, step=1)
+            ausgeglichen = st.checkbox("Elo-ausgeglichen losen (ähnlich starke Gegner, keine Wiederholungen der letzten Spieltage)")
+            spieltag_nr = st.text_input("Spieltag-Nummer (z.B. 3)")
+            if st.button("🎯 Auslosung starten"):
+                if len(anwesend) < 4:
+                    st.error("Mindestens 4 Spieler erforderlich.")
+                elif spieltag_nr.strip() == "":
+                    st.error("Bitte Spieltag-Nummer eingeben.")
+                else:
+                    if ausgeglichen:
+                        stat = aktuelle_statistik()
+                        elo = stat.elo[0]["Elo"].to_dict()
+                        ergebnis, extra_spieler = auslosung.auslosen(anwesend, gegner_anzahl, elo=elo,
+                            letzte_paare=stat.letzte_paarungen(AUSLOSUNG_WIEDERHOLUNG), max_abstand=AUSLOSUNG_MAX_ABSTAND)
+                    else:
+                        ergebnis, extra_spieler = auslosung.auslosen(anwesend, gegner_anzahl)
+                    if ergebnis is None:
+                        st.error("Keine gültige Auslosung möglich.")
+                    else:
+                        spielplan, reihenfolge = auslosung.erstelle_spielplan(ergebnis, bretter)
+                        speichere_spielplan_db(spielplan=spielplan, spieltag=spieltag_nr.strip(),
+                            extra_spieler=extra_spieler, ergebnisse={}, locked=[],
+                            reihenfolge=reihenfolge)
+                        st.rerun()
+    else:
+        spielplan = db_plan["spielplan"]
+        reihenfolge = db_plan["reihenfolge"]
+        extra_spieler = db_plan["extra_spieler"]
+        spieltag_nr = db_plan["spieltag"]
+        ergebnisse = db_plan["ergebnisse"]
+        locked = set(db_plan["locked"])
+
+        mit_runden = hat_runden(spielplan)
+
+        st.markdown(f"### Spieltag {spieltag_nr}")
+        if extra_spieler:
+            st.info(f"⚠️ Ungerade Spieleranzahl: **{extra_spieler}** hat einen Gegner mehr.")
+
+        pw = st.text_input("Passwort zum Eintragen", type="password", key="pw_spielplan")
+        if pw == PASSWORT:
+            st.caption("🔒 sperrt ein Ergebnis · 🔓 entsperrt · 🗑 entfernt")
+            st.markdown("""
+            <div style='display:grid;grid-template-columns:3fr 3fr 2fr 2fr 2fr 2fr 1fr 1fr;gap:6px;margin-bottom:2px;'>
+                <div></div><div></div>
+                <div style='grid-column:3/5;text-align:center;font-weight:bold;text-decoration:underline;font-size:13px;'>Legs</div>
+                <div style='grid-column:5/7;text-align:center;font-weight:bold;text-decoration:underline;font-size:13px;'>Avg</div>
+                <div></div><div></div>
+            </div>
+            """, unsafe_allow_html=True)
+            runde_vorher = None
+            for orig_idx in reihenfolge:
+                spiel = spielplan[orig_idx]
+                if mit_runden and spiel[2] != runde_vorher:
+                    runde_vorher = spiel[2]
+                    st.markdown(f"**Runde {runde_vorher}**")
+                ergebnis_zeile(orig_idx)
+            ergebnisse_temp = ergebnisbogen(db_plan)
+
+            st.markdown("---")
+            if st.button("💾 Zwischenspeichern"):
+                speichere_spielplan_db(spielplan, spieltag_nr, extra_spieler, ergebnisse_temp, list(locked), reihenfolge)
+                st.success("Gespeichert!")
+
+            st.markdown("---")
+            col_submit, col_reset = st.columns([1, 1])
+            with col_submit:
+                if st.button("✅ In Rangliste übernehmen"):
+                    df_log_check = lade_log()
+                    if not df_log_check.empty and str(spieltag_nr) in df_log_check["Datum"].astype(str).values:
+                        st.error(f"⚠️ Spieltag {spieltag_nr} ist bereits in der Datenbank!")
+                    else:
+                        unvollstaendig = [f"{spielplan[i][0]} vs {spielplan[i][1]}" for i in reihenfolge if ergebnisse_temp[i]["legs_a"] == 0 and ergebnisse_temp[i]["legs_b"] == 0]
+                        if unvollstaendig:
+                            st.warning(f"Noch keine Ergebnisse bei: {', '.join(unvollstaendig)}")
+                        else:
+                            log_spieltag(spieltag_nr, [
+                                (spielplan[i][0], spielplan[i][1], ergebnisse_temp[i]["legs_a"], ergebnisse_temp[i]["legs_b"],
+                                 ergebnisse_temp[i]["avg_a"], ergebnisse_temp[i]["avg_b"])
+                                for i in reihenfolge
+                            ])
+                            loesche_spielplan_db()
+                            st.session_state.zeige_zusammenfassung = True
+                            st.session_state.zusammenfassung_spieltag = spieltag_nr
+                            st.rerun()
+            with col_reset:
+                if st.button("🗑 Spielplan verwerfen"):
+                    loesche_spielplan_db()
+                    st.rerun()
+            zeige_prognose(spielplan, reihenfolge, ergebnisse, locked)
+        else:
+            st.info(f"📋 Aktiver Spielplan für **Spieltag {spieltag_nr}** — Passwort eingeben zum Bearbeiten.")
+            st.markdown("---")
+            spielplan_live()
+            zeige_prognose(spielplan, reihenfolge, ergebnisse, locked)
@@ -0,0 +1,52 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from basis import START_ELO, aktuelle_statistik
+
+
+def anzeigen():
+    st.subheader("🏅 Bestenlisten")
+    stat = aktuelle_statistik()
+    if stat.df_log.empty:
+        st.info("Noch keine Spiele eingetragen.")
+    else:
+        stats = stat.spieler_statistik
+        tab1, tab2, tab3, tab4 = st.tabs(["🏆 Meiste Siege", "🎯 Höchster Average", "📈 Höchste Siegquote", "⚡ Elo-Rangliste"])
+        medals = ["🥇", "🥈", "🥉"]
+        with tab1:
+            for i, (name, s) in enumerate(sorted(stats.items(), key=lambda x: x[1]["siege"], reverse=True)):
+                prefix = medals[i] if i < 3 else f"#{i+1}"
+                st.markdown(f"{prefix} **{name}** &nbsp; <span style='color:#22c55e;font-weight:bold;'>{s['siege']} Siege</span> &nbsp; <span style='color:#888;font-size:13px;'>aus {s['spiele']} Spielen ({s['siegquote']}%)</span>", unsafe_allow_html=True)
+        with tab2:
+            for i, (name, s) in enumerate(sorted(stats.items(), key=lambda x: x[1]["avg"], reverse=True)):
+                prefix = medals[i] if i < 3 else f"#{i+1}"
+                st.markdown(f"{prefix} **{name}** &nbsp; <span style='color:#f59e0b;font-weight:bold;'>{s['avg']} Ø Avg</span> &nbsp; <span style='color:#888;font-size:13px;'>Best: {s['best_avg']}</span>", unsafe_allow_html=True)
+        with tab3:
+            st.caption("Nur Spieler mit mindestens 3 Spielen")
+            for i, (name, s) in enumerate(sorted([(n, s) for n, s in stats.items() if s["spiele"] >= 3], key=lambda x: x[1]["siegquote"], reverse=True)):
+                prefix = medals[i] if i < 3 else f"#{i+1}"
+                st.markdown(f"{prefix} **{name}** &nbsp; <span style='color:#00aaff;font-weight:bold;'>{s['siegquote']}%</span> &nbsp; <span style='color:#888;font-size:13px;'>{s['siege']}S / {s['niederlagen']}N</span>", unsafe_allow_html=True)
+        with tab4:
+            for i, (name, s) in enumerate(sorted(stats.items(), key=lambda x: x[1]["elo"], reverse=True)):
+                prefix = medals[i] if i < 3 else f"#{i+1}"
+                diff = s["elo"] - START_ELO
+                diff_str = f"+{diff}" if diff >= 0 else str(diff)
+                farbe = "#22c55e" if diff >= 0 else "#ef4444"
+                st.markdown(f"{prefix} **{name}** &nbsp; <span style='color:#00aaff;font-weight:bold;'>{s['elo']}</span> &nbsp; <span style='color:{farbe};font-size:13px;'>({diff_str} seit Start)</span>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown("#### Elo-Verlauf aller Spieler")
+        verlauf_df = stat.verlauf
+        if not verlauf_df.empty:
+            spieler_cols = [c for c in verlauf_df.columns if c != "Spieltag"]
+            fig = go.Figure()
+            farben = px.colors.qualitative.Set2
+            for idx, s in enumerate(spieler_cols):
+                fig.add_trace(go.Scatter(x=verlauf_df["Spieltag"], y=verlauf_df[s], mode="lines+markers", name=s,
+                    line=dict(width=2, color=farben[idx % len(farben)]), marker=dict(size=6)))
+            fig.add_hline(y=START_ELO, line_dash="dot", line_color="#444", opacity=0.4)
+            fig.update_layout(plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+                font_color="#aaa", height=380, margin=dict(l=0, r=0, t=10, b=0),
+                xaxis=dict(showgrid=False), yaxis=dict(showgrid=True, gridcolor="#1e2d45"),
+                legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(size=12)))
+            st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,69 @@
+import streamlit as st
+
+import statistik
+from basis import aktuelle_statistik, lade_spieler
+
+
+def anzeigen():
+    st.subheader("⚔️ Head-to-Head")
+    stat = aktuelle_statistik()
+    df_spieler_liste = list(lade_spieler().index)
+    col1, col2 = st.columns(2)
+    with col1:
+        p1 = st.selectbox("Spieler 1", df_spieler_liste, key="h2h_p1")
+    with col2:
+        p2 = st.selectbox("Spieler 2", [s for s in df_spieler_liste if s != p1], key="h2h_p2")
+    if p1 and p2:
+        duell = stat.duell(p1, p2)
+        if duell is None:
+            st.info(f"Noch keine Duelle zwischen {p1} und {p2}.")
+        else:
+            h2h = stat.df_log.iloc[duell["zeilen"]]
+            leer = {"siege": 0, "legs": 0, "elo": 0}
+            w1, w2 = duell["spieler"].get(p1, leer), duell["spieler"].get(p2, leer)
+            siege_p1, siege_p2 = w1["siege"], w2["siege"]
+            legs_p1, legs_p2 = w1["legs"], w2["legs"]
+            elo_p1, elo_p2 = w1["elo"], w2["elo"]
+            st.markdown(f"""
+            <div style='background:linear-gradient(135deg,#1a1a2e,#16213e);padding:20px;border-radius:12px;margin-bottom:20px;border:1px solid #2a3555;'>
+                <div style='display:grid;grid-template-columns:1fr auto 1fr;align-items:center;gap:16px;'>
+                    <div style='text-align:center;'>
+                        <div style='font-size:26px;font-weight:900;color:#fff;'>{p1}</div>
+                        <div style='font-size:48px;font-weight:900;color:{"#22c55e" if siege_p1 > siege_p2 else "#ef4444" if siege_p1 < siege_p2 else "#fff"};line-height:1.1;'>{siege_p1}</div>
+                        <div style='font-size:11px;color:#6b7fa3;letter-spacing:2px;text-transform:uppercase;'>Siege</div>
+                    </div>
+                    <div style='text-align:center;'><div style='font-size:13px;color:#6b7fa3;'>{len(h2h)} Duelle</div></div>
+                    <div style='text-align:center;'>
+                        <div style='font-size:26px;font-weight:900;color:#fff;'>{p2}</div>
+                        <div style='font-size:48px;font-weight:900;color:{"#22c55e" if siege_p2 > siege_p1 else "#ef4444" if siege_p2 < siege_p1 else "#fff"};line-height:1.1;'>{siege_p2}</div>
+                        <div style='font-size:11px;color:#6b7fa3;letter-spacing:2px;text-transform:uppercase;'>Siege</div>
+                    </div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            def stat_row(label, val1, val2, higher_is_better=True):
+                besser1 = (val1 > val2) if higher_is_better else (val1 < val2)
+                besser2 = (val2 > val1) if higher_is_better else (val2 < val1)
+                c1, c2, c3 = st.columns([2, 2, 2])
+                with c1:
+                    col = "#22c55e" if besser1 else ("#ef4444" if besser2 else "#fff")
+                    st.markdown(f"<div style='text-align:center;font-size:18px;font-weight:700;color:{col};'>{val1}</div>", unsafe_allow_html=True)
+                with c2:
+                    st.markdown(f"<div style='text-align:center;font-size:12px;color:#6b7fa3;text-transform:uppercase;padding-top:4px;'>{label}</div>", unsafe_allow_html=True)
+                with c3:
+                    col = "#22c55e" if besser2 else ("#ef4444" if besser1 else "#fff")
+                    st.markdown(f"<div style='text-align:center;font-size:18px;font-weight:700;color:{col};'>{val2}</div>", unsafe_allow_html=True)
+            stat_row("Legs gewonnen", int(legs_p1), int(legs_p2))
+            stat_row("Elo-Gewinn gesamt", f"{elo_p1:+d}", f"{elo_p2:+d}")
+            st.markdown("---")
+            st.markdown("#### Alle Duelle")
+            for _, r in h2h.iloc[::-1].iterrows():
+                gew_p = p1 if ((r["Spieler A"] == p1 and r["Legs A"] > r["Legs B"]) or (r["Spieler B"] == p1 and r["Legs B"] > r["Legs A"])) else p2
+                la = int(r["Legs A"]) if r["Spieler A"] == p1 else int(r["Legs B"])
+                lb = int(r["Legs B"]) if r["Spieler A"] == p1 else int(r["Legs A"])
+                st.markdown(f"**Spieltag {r['Datum']}** — {p1} **{la}:{lb}** {p2} &nbsp; → <span style='font-weight:bold;'>Sieg {gew_p}</span>", unsafe_allow_html=True)
+    if stat.h2h:
+        with st.expander("Bilanzmatrix (Siege Zeile gegen Spalte)"):
+            matrix = statistik.h2h_matrix(stat.h2h, df_spieler_liste)
+            st.dataframe(matrix, use_container_width=True)
+            st.download_button("Als CSV herunterladen", matrix.to_csv().encode("utf-8"), "head_to_head.csv", "text/csv")
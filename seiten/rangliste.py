@@ -0,0 +1,159 @@
+import streamlit as st
+
+from basis import START_ELO, aktuelle_statistik, elo_tabelle
+
+
+@st.dialog("Spielerprofil", width="large")
+def zeige_spieler_popup(gew, df, df_log, rang_liste):
+    import plotly.graph_objects as go  # erst, wenn ein Profil geöffnet wird
+    stat = aktuelle_statistik()
+    kennzahlen = stat.aggregate.loc[gew] if gew in stat.aggregate.index else None
+    anzahl = int(kennzahlen["spiele"]) if kennzahlen is not None else 0
+    siege = int(kennzahlen["siege"]) if kennzahlen is not None else 0
+    niederlagen = anzahl - siege
+    leg_diff = int(kennzahlen["leg_diff"]) if kennzahlen is not None else 0
+    gesamt_avg = float(kennzahlen["avg"]) if kennzahlen is not None else 0
+    elo_aktuell = int(df.loc[gew, "Elo"])
+    rang = rang_liste.index(gew) + 1
+    siegquote = round(float(kennzahlen["siegquote"]), 1) if kennzahlen is not None else 0
+    best_avg = float(kennzahlen["best_avg"]) if kennzahlen is not None else 0
+    form_str = ""
+    for gewonnen in stat.form.serie(gew, 5):
+        form_str += "🟢" if gewonnen else "🔴"
+    st.markdown(f"""
+    <div style='background:linear-gradient(135deg,#1a1a2e,#16213e);padding:24px;border-radius:12px;margin-bottom:20px;border:1px solid #2a3555;'>
+        <div style='display:flex;justify-content:space-between;align-items:flex-start;'>
+            <div>
+                <div style='font-size:12px;letter-spacing:3px;text-transform:uppercase;color:#6b7fa3;margin-bottom:4px;'>Spielerprofil</div>
+                <div style='font-size:32px;font-weight:900;color:#ffffff;letter-spacing:1px;'>{gew}</div>
+                <div style='font-size:13px;color:#6b7fa3;margin-top:4px;'>Rang #{rang} · Form: {form_str if form_str else "–"}</div>
+            </div>
+            <div style='text-align:right;'>
+                <div style='font-size:12px;color:#6b7fa3;letter-spacing:2px;text-transform:uppercase;'>Elo</div>
+                <div style='font-size:44px;font-weight:900;color:#00aaff;line-height:1;'>{elo_aktuell}</div>
+            </div>
+        </div>
+        <div style='display:grid;grid-template-columns:repeat(5,1fr);gap:12px;margin-top:20px;'>
+            <div style='text-align:center;'><div style='font-size:20px;font-weight:700;color:#fff;'>{anzahl}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Spiele</div></div>
+            <div style='text-align:center;'><div style='font-size:20px;font-weight:700;color:#22c55e;'>{siege}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Siege</div></div>
+            <div style='text-align:center;'><div style='font-size:20px;font-weight:700;color:#ef4444;'>{niederlagen}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Niederlagen</div></div>
+            <div style='text-align:center;'><div style='font-size:20px;font-weight:700;color:#f59e0b;'>{siegquote}%</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Siegquote</div></div>
+            <div style='text-align:center;'><div style='font-size:20px;font-weight:700;color:#fff;'>{round(gesamt_avg, 1)}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Avg</div></div>
+        </div>
+        <div style='display:grid;grid-template-columns:repeat(2,1fr);gap:12px;margin-top:14px;padding-top:14px;border-top:1px solid #2a3555;'>
+            <div style='text-align:center;'><div style='font-size:16px;font-weight:700;color:#fff;'>{leg_diff:+d}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Leg-Differenz</div></div>
+            <div style='text-align:center;'><div style='font-size:16px;font-weight:700;color:#fff;'>{round(best_avg, 1)}</div><div style='font-size:10px;color:#6b7fa3;letter-spacing:1px;text-transform:uppercase;margin-top:2px;'>Best Average</div></div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    if not df_log.empty:
+        verlauf_df = aktuelle_statistik().verlauf
+        if gew in verlauf_df.columns:
+            st.markdown("**Elo-Verlauf**")
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=verlauf_df["Spieltag"], y=verlauf_df[gew], mode="lines+markers", name=gew,
+                line=dict(color="#00aaff", width=3), marker=dict(size=8, color="#00aaff"),
+                fill="tozeroy", fillcolor="rgba(0,170,255,0.08)"))
+            fig.add_hline(y=START_ELO, line_dash="dot", line_color="#444", opacity=0.5)
+            fig.update_layout(plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+                font_color="#aaa", height=220, margin=dict(l=0, r=0, t=8, b=0),
+                xaxis=dict(showgrid=False, tickfont=dict(size=11)),
+                yaxis=dict(showgrid=True, gridcolor="#1e2d45", tickfont=dict(size=11)), showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+    if anzahl:
+        st.markdown("**Letzte Spiele**")
+        for _, r in stat.spieler_spiele.iloc[stat.form.letzte(gew, 8)[::-1]].iterrows():
+            gewonnen, gegner = r["Sieg"], r["Gegner"]
+            legs_gew, legs_geg, avg_gew = r["Legs"], r["Legs Gegner"], r["Avg"]
+            elo_d = int(r["Elo"])
+            elo_str = f"+{elo_d}" if elo_d >= 0 else str(elo_d)
+            farbe = "green" if gewonnen else "red"
+            ergebnis = "Sieg" if gewonnen else "Niederlage"
+            st.markdown(
+                f"<span style='color:{farbe};font-weight:bold;'>{'▲' if gewonnen else '▼'} {ergebnis}</span> &nbsp; "
+                f"vs **{gegner}** &nbsp; {int(legs_gew)}:{int(legs_geg)} &nbsp; Avg {avg_gew:.1f} &nbsp; "
+                f"<span style='color:{farbe};font-weight:bold;'>{elo_str}</span> &nbsp; "
+                f"<span style='color:#888;font-size:12px;'>Spieltag {r['Datum']}</span>",
+                unsafe_allow_html=True)
+
+
+def anzeigen():
+    st.markdown("<h2 style='font-size:28px;'>🥇 Rangliste</h2>", unsafe_allow_html=True)
+    df, df_log = elo_tabelle()
+    df = df.sort_values("Elo", ascending=False)
+    rang_liste = list(df.index)
+    df_aktiv = df[df["Spiele"] > 0]
+    df_inaktiv = df[df["Spiele"] == 0]
+
+    form_index = aktuelle_statistik().form
+    table_rows = ""
+    for i, s in enumerate(df_aktiv.index):
+        form = form_index.summe(s, 3)
+        elo = int(df_aktiv.loc[s, "Elo"])
+        spiele_anz = int(df_aktiv.loc[s, "Spiele"])
+        medal = ["🥇","🥈","🥉"][i] if i < 3 else f"{i+1}."
+        if form > 0:
+            form_html = f"<span style='color:green;font-size:12px;font-weight:600;'>+{int(form)}&nbsp;▲</span>"
+        elif form < 0:
+            form_html = f"<span style='color:red;font-size:12px;font-weight:600;'>{int(form)}&nbsp;▼</span>"
+        else:
+            form_html = "<span style='color:#aaa;font-size:12px;'>–</span>"
+        table_rows += f"""<tr style='border-bottom:1px solid #eee;'>
+            <td style='padding:10px 6px;width:38px;font-size:15px;'>{medal}</td>
+            <td style='padding:10px 6px;font-size:15px;'>{s}</td>
+            <td style='padding:10px 6px;width:68px;text-align:center;font-size:13px;color:#888;'>{spiele_anz}</td>
+            <td style='padding:10px 8px;width:130px;text-align:right;white-space:nowrap;'>
+                <span style='font-size:15px;font-weight:700;'>{elo}</span>
+                <span style='display:inline-block;width:68px;text-align:right;font-size:12px;font-weight:600;'>{form_html}</span>
+            </td>
+        </tr>"""
+
+    st.markdown(f"""
+    <style>
+    .rl-wrap{{width:100%;border-collapse:collapse;table-layout:fixed;}}
+    .rl-wrap th{{font-size:11px;color:#888;font-weight:700;text-transform:uppercase;
+        letter-spacing:1px;padding:6px;border-bottom:2px solid #e0e0e0;}}
+    </style>
+    <table class='rl-wrap'>
+        <thead><tr>
+            <th style='text-align:left;width:38px;'>#</th>
+            <th style='text-align:left;'>Spieler</th>
+            <th style='text-align:center;width:68px;'>Spiele</th>
+            <th style='text-align:right;width:130px;padding-right:76px;'>Punkte</th>
+        </tr></thead>
+        <tbody>{table_rows}</tbody>
+    </table>""", unsafe_allow_html=True)
+
+    st.markdown("<div style='margin-top:10px;'></div>", unsafe_allow_html=True)
+    ausw = st.selectbox("Spielerprofil", ["– Spieler auswählen –"] + list(df_aktiv.index), key="profil_select")
+    if ausw and ausw != "– Spieler auswählen –":
+        zeige_spieler_popup(ausw, df, df_log, rang_liste)
+
+    if not df_inaktiv.empty:
+        if st.checkbox(f"Inaktive Spieler anzeigen ({len(df_inaktiv)})"):
+            inaktiv_rows = "".join([
+                f"<tr><td style='padding:8px 6px;color:#ccc;'>–</td>"
+                f"<td style='padding:8px 6px;color:#aaa;'>{s}</td>"
+                f"<td style='padding:8px 6px;width:68px;text-align:center;color:#ccc;'>0</td>"
+                f"<td style='padding:8px 6px;width:130px;text-align:right;color:#ccc;padding-right:76px;'>{START_ELO}</td>"
+                f"<td style='padding:8px 6px;'></td></tr>"
+                for s in df_inaktiv.index
+            ])
+            st.markdown(f"<table class='rl-wrap'><tbody>{inaktiv_rows}</tbody></table>", unsafe_allow_html=True)
+
+    st.markdown("------")
+    st.markdown("""
+    <div style="background-color:#f5f5f5; padding:15px; border-radius:10px; font-size:16px;">
+    <h2 style='font-size:28px;'>ℹ️ Erklärung</h2>
+Das **Bulls&Friends Power-Ranking** ist ein **Elo-basiertes Punktesystem**, welches die Leistung der Spieler bei jedem offiziellen Spiel bewertet.
+
+***Ablauf:***
+    Die Saison besteht aus **fix terminierten Spieltagen** (1-2x pro Monat).
+    Alle anwesende Spieler bekommen **zufällig 4 Gegner zugelost**.
+    Punktzahl und Platzierungen verändern sich je nach Leistung.
+
+***Vorteile einer hohen Ranglistenplatzierung:***
+    Die **Top 16 Spieler** sind automatisch für die **Vereinsmeisterschaft** gesetzt.
+    Die **Top 4 Spieler** erhalten das **Spielrecht bei Ligaspielen**.
+    Achtung: Mindestens **8 Spiele** erforderlich (3 Spieltage).
+    </div>""", unsafe_allow_html=True)
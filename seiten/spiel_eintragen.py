@@ -0,0 +1,28 @@
+import streamlit as st
+
+from basis import PASSWORT, fmt, lade_spieler, log_spiel
+
+
+def anzeigen():
+    st.subheader("🎯 Spiel eintragen")
+    pw = st.text_input("Passwort", type="password")
+    if pw == PASSWORT:
+        df_spieler = list(lade_spieler().index)
+        with st.form("spiel_form"):
+            a = st.selectbox("Spieler A", df_spieler)
+            b = st.selectbox("Spieler B", df_spieler)
+            legs_a = st.number_input("Legs A", min_value=0, step=1)
+            legs_b = st.number_input("Legs B", min_value=0, step=1)
+            avg_a = st.number_input("Average A", min_value=0.0, value=50.0, step=0.1)
+            avg_b = st.number_input("Average B", min_value=0.0, value=50.0, step=0.1)
+            spieltag = st.text_input("Spieltag (z.B. 3)")
+            submitted = st.form_submit_button("Match eintragen")
+            if submitted:
+                if a != b:
+                    df, df_spiel = log_spiel(a, b, legs_a, legs_b, avg_a, avg_b, spieltag)
+                    last = df_spiel.iloc[-1]
+                    st.success(f"{a} {legs_a}:{legs_b} {b} eingetragen!")
+                    st.markdown("### Elo-Veränderung")
+                    st.markdown(f"{fmt(int(last['Elo A']))} | {fmt(int(last['Elo B']))}", unsafe_allow_html=True)
+                else:
+                    st.error("Bitte zwei unterschiedliche Spieler auswählen!")
@@ -0,0 +1,20 @@
+import streamlit as st
+
+from basis import PASSWORT, START_ELO, lade_spieler, speichere_spieler
+
+
+def anzeigen():
+    st.subheader("➕ Spieler anlegen")
+    pw = st.text_input("Passwort", type="password", key="spieler")
+    if pw == PASSWORT:
+        df = lade_spieler()
+        with st.form("spieler_form"):
+            name = st.text_input("Spielername")
+            submitted = st.form_submit_button("Spieler anlegen")
+            if submitted:
+                if name.strip() != "" and name.strip() not in df.index:
+                    df.loc[name.strip()] = {"Elo": START_ELO, "Spiele": 0}
+                    speichere_spieler(df)
+                    st.success(f"Spieler {name.strip()} angelegt!")
+                else:
+                    st.error("Ungültiger oder bereits existierender Name.")
@@ -0,0 +1,14 @@
+import streamlit as st
+
+from basis import aktuelle_statistik, zeige_spieltag_zusammenfassung
+
+
+def anzeigen():
+    st.subheader("📊 Spieltags-Übersicht")
+    stat = aktuelle_statistik()
+    if stat.df_log.empty:
+        st.info("Noch keine Spiele eingetragen.")
+    else:
+        spieltage = stat.spieltage
+        ausgewaehlter_spieltag = st.selectbox("Spieltag auswählen", spieltage, index=len(spieltage)-1, format_func=lambda x: f"Spieltag {x}")
+        zeige_spieltag_zusammenfassung(ausgewaehlter_spieltag)
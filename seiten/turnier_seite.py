@@ -0,0 +1,617 @@
+import streamlit as st
+
+import messung
+import prognose
+import speicher
+import turnier as turnier_sim
+from basis import DB_BATCH_GROESSE, PASSWORT, aktuelle_statistik, get_datenstand
+from turnier import t_erstelle_gruppenspiele, t_erstelle_ko_spiele, t_propagiere_sieger
+
+
+# =====================================================
+# TURNIER — 32 Teilnehmer, 8 Gruppen, manuell
+# =====================================================
+TURNIER_BOARDS = 4
+TURNIER_GRUPPEN = ["A","B","C","D","E","F","G","H"]
+TURNIER_PRO_GRUPPE = 4
+TURNIER_SIMULATIONEN = 20000
+
+
+@messung.gemessen()
+def lade_turnier():
+    try:
+        row = get_datenstand().turnier()
+        if row is None:
+            return None
+        return {
+            "name": row.get("name", "Turnier"),
+            "status": row.get("status", "setup"),
+            "config": row.get("config") or {},
+            "gruppen": row.get("gruppen") or {},
+            "gruppen_spiele": row.get("gruppen_spiele") or [],
+            "ko_spiele": row.get("ko_spiele") or [],
+            "qualifizierte": row.get("qualifizierte") or {},
+            "version": row.get("version")
+        }
+    except Exception:
+        return None
+
+
+@messung.gemessen()
+def speichere_turnier(data):
+    """Ein geladenes Turnier (mit `version`) wird nur geschrieben, wenn es seitdem niemand
+    geändert hat; ein neues wird angelegt und danach neu gelesen (Version aus der DB)."""
+    werte = {
+        "name": data.get("name", "Turnier"),
+        "status": data.get("status", "setup"),
+        "config": data.get("config", {}),
+        "gruppen": data.get("gruppen", {}),
+        "gruppen_spiele": data.get("gruppen_spiele", []),
+        "ko_spiele": data.get("ko_spiele", []),
+        "qualifizierte": data.get("qualifizierte", {})
+    }
+    if "version" not in data:
+        get_datenstand().upsert("turniere", [{"id": 1, **werte}], DB_BATCH_GROESSE)
+        get_datenstand().invalidieren("turniere")
+        return True
+    return patche_turnier(data, werte=werte)
+
+
+@messung.gemessen()
+def patche_turnier(turnier, listen=None, werte=None):
+    """Schreibt von den Spiellisten in `listen` nur die geänderten Spiele (plus `werte`),
+    geprüft gegen die Version, mit der `turnier` geladen wurde. False bei veraltetem Stand."""
+    elemente, werte = {}, dict(werte or {})
+    for spalte, neu in (listen or {}).items():
+        alt = turnier.get(spalte, [])
+        if len(alt) != len(neu):
+            werte[spalte] = neu
+        else:
+            elemente[spalte] = {i: sp for i, sp in enumerate(neu) if sp != alt[i]}
+    try:
+        get_datenstand().patche("turniere", 1, turnier.get("version"), elemente, werte)
+    except speicher.VeralteterStand:
+        st.session_state["turnier_veraltet"] = True
+        return False
+    return True
+
+
+@messung.gemessen()
+def loesche_turnier():
+    get_datenstand().loesche("turniere", 1)
+
+
+@st.cache_resource
+def _gruppen_tabellen_stand():
+    # prozessweit: gepflegte Gruppentabellen zum zuletzt gesehenen Turnier
+    return {}
+
+
+def gruppen_tabellen(turnier):
+    """Gepflegte Gruppentabellen; neu aufgebaut nur, wenn das Turnier nicht mehr zu den
+    gebuchten Spielen passt (anderer Prozess, neues Turnier)."""
+    stand = _gruppen_tabellen_stand()
+    gruppen, gs = turnier.get("gruppen", {}), turnier.get("gruppen_spiele", [])
+    with get_datenstand().lock:
+        tabellen = stand.get("tabellen")
+        if tabellen is None or not tabellen.passt_zu(gruppen, gs):
+            tabellen = stand["tabellen"] = turnier_sim.GruppenTabellen(gruppen, gs)
+        return tabellen
+
+
+# --- Bracket HTML (inkl. Avg) ---
+def t_bracket_html(ko_spiele):
+    if not ko_spiele:
+        return ""
+    max_r = max(s["runde_idx"] for s in ko_spiele)
+    n_first = len([s for s in ko_spiele if s["runde_idx"] == 0])
+    MATCH_H = 80
+    total_h = max(n_first * MATCH_H, 120)
+
+    css = """<style>
+.brk{display:flex;overflow-x:auto;padding:16px;background:#0a1020;border-radius:12px;}
+.brk-col{display:flex;flex-direction:column;align-items:stretch;min-width:185px;margin-right:8px;}
+.brk-head{font-size:11px;color:#6b7fa3;text-transform:uppercase;letter-spacing:1px;
+    text-align:center;padding:4px 8px;background:#1a2540;border-radius:3px;margin-bottom:8px;white-space:nowrap;}
+.brk-matches{display:flex;flex-direction:column;justify-content:space-around;flex:1;}
+.brk-match{display:flex;flex-direction:column;gap:2px;margin-bottom:4px;}
+.brk-board{font-size:10px;color:#4a5568;text-align:center;margin-bottom:1px;}
+.brk-p{padding:5px 10px;background:#1e2d45;border-radius:4px;font-size:12px;color:#9bacc8;
+    white-space:nowrap;overflow:hidden;text-overflow:ellipsis;max-width:175px;}
+.brk-p.win{color:#22c55e;font-weight:700;background:#0f2a1a;}
+.brk-p.tbd{color:#374151;font-style:italic;}
+.brk-avg{font-size:10px;color:#6b9c6b;margin-left:4px;}
+.brk-p.win .brk-avg{color:#86efac;}
+</style>"""
+
+    def p_cls(name, is_win):
+        if not name or name == "TBD": return "tbd"
+        return "win" if is_win else ""
+
+    html = css + "<div class='brk'>"
+    for r in range(0, max_r + 1):
+        runde_spiele = sorted([s for s in ko_spiele if s["runde_idx"] == r], key=lambda x: x["match_nr"])
+        rname = runde_spiele[0]["runde_name"] if runde_spiele else ""
+        html += f"<div class='brk-col'><div class='brk-head'>{rname}</div>"
+        html += f"<div class='brk-matches' style='height:{total_h}px;'>"
+        for sp in runde_spiele:
+            la = sp.get("legs_a"); lb = sp.get("legs_b")
+            done = sp.get("abgeschlossen", False)
+            win_a = done and la is not None and lb is not None and la > lb
+            win_b = done and la is not None and lb is not None and lb > la
+            pa = sp.get("spieler_a") or "TBD"
+            pb = sp.get("spieler_b") or "TBD"
+            la_str = f" ({la})" if done and la is not None else ""
+            lb_str = f" ({lb})" if done and lb is not None else ""
+            avg_a_val = sp.get("avg_a")
+            avg_b_val = sp.get("avg_b")
+            avg_a_str = f"<span class='brk-avg'>· {float(avg_a_val):.1f}</span>" if done and avg_a_val is not None else ""
+            avg_b_str = f"<span class='brk-avg'>· {float(avg_b_val):.1f}</span>" if done and avg_b_val is not None else ""
+            board_h = f"<div class='brk-board'>Board {sp['board']}</div>" if sp.get("board") else "<div class='brk-board'>&nbsp;</div>"
+            html += (f"<div class='brk-match'>{board_h}"
+                     f"<div class='brk-p {p_cls(pa, win_a)}'>{pa}{la_str}{avg_a_str}</div>"
+                     f"<div class='brk-p {p_cls(pb, win_b)}'>{pb}{lb_str}{avg_b_str}</div></div>")
+        html += "</div></div>"
+    html += "</div>"
+    return html
+
+
+# --- Setup UI ---
+def _t_setup_ui():
+    st.markdown("""
+    <div style='text-align:center;padding:24px 0 10px 0;'>
+        <div style='font-size:44px;'>🏆</div>
+        <div style='font-size:20px;font-weight:700;color:#1a202c;margin-top:8px;'>Neues Turnier erstellen</div>
+        <div style='font-size:13px;color:#64748b;margin-top:4px;'>32 Teilnehmer · 8 Gruppen · 16er KO</div>
+    </div>
+    """, unsafe_allow_html=True)
+    with st.form("neues_turnier_form"):
+        name = st.text_input("Turniername", placeholder="z.B. Vereinsmeisterschaft 2026")
+        submitted = st.form_submit_button("🏆 Turnier erstellen", type="primary")
+        if submitted:
+            if not name.strip():
+                st.error("Bitte einen Turniernamen eingeben.")
+            else:
+                gruppen = {g: [] for g in TURNIER_GRUPPEN}
+                speichere_turnier({
+                    "name": name.strip(), "status": "gruppen_setup",
+                    "config": {"boards": TURNIER_BOARDS},
+                    "gruppen": gruppen, "gruppen_spiele": [],
+                    "ko_spiele": [], "qualifizierte": {}
+                })
+                st.rerun()
+
+
+# --- Gruppen-Setup UI ---
+def _t_gruppen_setup_ui(turnier):
+    pw = st.text_input("Admin-Passwort", type="password", key="t_setup_pw")
+    if pw != PASSWORT:
+        st.info("Passwort eingeben um Gruppen zu bearbeiten.")
+        gruppen = turnier.get("gruppen", {})
+        cols = st.columns(4)
+        for i, gk in enumerate(TURNIER_GRUPPEN):
+            with cols[i % 4]:
+                spieler = gruppen.get(gk, [])
+                st.markdown(f"**Gruppe {gk}**")
+                for s in spieler:
+                    st.markdown(f"· {s}")
+                if len(spieler) < TURNIER_PRO_GRUPPE:
+                    st.markdown(f"<span style='color:#f59e0b;font-size:12px;'>{len(spieler)}/{TURNIER_PRO_GRUPPE}</span>", unsafe_allow_html=True)
+                else:
+                    st.markdown(f"<span style='color:#22c55e;font-size:12px;'>✅ {len(spieler)}/{TURNIER_PRO_GRUPPE}</span>", unsafe_allow_html=True)
+        return
+
+    gruppen = turnier.get("gruppen", {})
+    st.markdown("### Gruppen befüllen")
+    st.caption("Trage pro Gruppe genau 4 Spielernamen ein (einer pro Zeile).")
+
+    neue_gruppen = {}
+    cols = st.columns(4)
+    for i, gk in enumerate(TURNIER_GRUPPEN):
+        with cols[i % 4]:
+            st.markdown(f"**Gruppe {gk}**")
+            aktuell = "\n".join(gruppen.get(gk, []))
+            text = st.text_area(f"Gruppe {gk}", value=aktuell, height=130,
+                                key=f"gruppe_{gk}", label_visibility="collapsed",
+                                placeholder="Spieler 1\nSpieler 2\nSpieler 3\nSpieler 4")
+            eintraege = [x.strip() for x in text.strip().split("\n") if x.strip()]
+            neue_gruppen[gk] = eintraege
+            n = len(eintraege)
+            if n == TURNIER_PRO_GRUPPE:
+                st.markdown(f"<span style='color:#22c55e;font-size:12px;'>✅ {n}/4</span>", unsafe_allow_html=True)
+            else:
+                st.markdown(f"<span style='color:#f59e0b;font-size:12px;'>⚠️ {n}/4</span>", unsafe_allow_html=True)
+
+    st.markdown("---")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        if st.button("💾 Gruppen speichern"):
+            speichere_turnier({**turnier, "gruppen": neue_gruppen})
+            st.success("Gespeichert!")
+            st.rerun()
+
+    alle_voll = all(len(neue_gruppen.get(g, [])) == TURNIER_PRO_GRUPPE for g in TURNIER_GRUPPEN)
+    alle_names = [n for g in TURNIER_GRUPPEN for n in neue_gruppen.get(g, [])]
+    duplikate = len(alle_names) != len(set(alle_names))
+
+    with col2:
+        if st.button("▶️ Spielplan erstellen", disabled=not alle_voll or duplikate, type="primary"):
+            gs = t_erstelle_gruppenspiele(neue_gruppen, TURNIER_BOARDS)
+            speichere_turnier({**turnier, "gruppen": neue_gruppen, "gruppen_spiele": gs, "status": "gruppen"})
+            st.rerun()
+
+    if duplikate:
+        st.error("⚠️ Doppelte Spielernamen gefunden! Bitte jeden Spieler nur einmal eintragen.")
+    elif not alle_voll:
+        fehlend = sum(1 for g in TURNIER_GRUPPEN if len(neue_gruppen.get(g, [])) != TURNIER_PRO_GRUPPE)
+        st.warning(f"Noch {fehlend} Gruppe(n) nicht vollständig (je 4 Spieler benötigt).")
+
+    with st.expander("⚠️ Turnier löschen"):
+        if st.button("🗑 Turnier löschen", type="secondary"):
+            loesche_turnier()
+            st.rerun()
+
+
+# --- Gruppenphase UI ---
+def zeige_turnier_prognose(turnier):
+    stat = aktuelle_statistik()
+    elo = stat.elo[0]["Elo"].to_dict()
+    avgs = stat.aggregate["avg"].astype(float).to_dict()
+    df = turnier_sim.simuliere_turnier(turnier, elo, avgs, prognose.leg_verteilung(stat.df_log),
+                                       anzahl=TURNIER_SIMULATIONEN, boards=TURNIER_BOARDS)
+    if df.empty:
+        st.info("Keine Prognose möglich.")
+        return
+    st.caption(f"{TURNIER_SIMULATIONEN} simulierte Turniere ab dem aktuellen Stand, Sieger nach Elo-Erwartung.")
+    st.dataframe((df * 100).round(1).astype(str) + "%", use_container_width=True)
+
+
+def _t_gruppenphase_ui(turnier):
+    gruppen = turnier.get("gruppen", {})
+    gs = turnier.get("gruppen_spiele", [])
+    ko = turnier.get("ko_spiele", [])
+
+    # Turnierbaum immer sichtbar oben (bleibt dunkel)
+    if ko:
+        st.markdown("---")
+        st.markdown("#### 🌳 Turnierbaum")
+        st.markdown(t_bracket_html(ko), unsafe_allow_html=True)
+        # Champion anzeigen
+        finale = [s for s in ko if s["runde_name"] == "Finale"]
+        if finale and finale[0].get("sieger"):
+            st.markdown(f"""
+            <div style='text-align:center;margin:16px 0;padding:20px;
+                background:linear-gradient(135deg,#1a1a0e,#2a2000);border-radius:14px;
+                border:2px solid #f59e0b88;'>
+                <div style='font-size:44px;'>🏆</div>
+                <div style='font-size:28px;font-weight:900;color:#f59e0b;margin-top:8px;'>{finale[0]['sieger']}</div>
+                <div style='font-size:12px;color:#92814a;letter-spacing:3px;text-transform:uppercase;margin-top:4px;'>Turniersieger</div>
+            </div>
+            """, unsafe_allow_html=True)
+        st.markdown("---")
+
+    tab_labels = ["📅 Spielplan", "📊 Gruppentabellen"]
+    if ko:
+        tab_labels.append("🏆 KO-Phase")
+    mit_prognose = turnier.get("status") in ("gruppen", "ko")
+    if mit_prognose:
+        tab_labels.append("🎲 Prognose")
+    tabs = st.tabs(tab_labels)
+
+    # ── SPIELPLAN ──
+    with tabs[0]:
+        pw = st.text_input("Passwort zum Eintragen", type="password", key="t_sp_pw")
+        admin_mode = (pw == PASSWORT)
+
+        done_g = sum(1 for s in gs if s.get("abgeschlossen"))
+        st.caption(f"{done_g}/{len(gs)} Gruppenspiele abgeschlossen")
+
+        board_filter = st.radio("Anzeigen:", ["Alle"] + [f"Board {b}" for b in range(1, TURNIER_BOARDS+1)],
+                                horizontal=True, key="t_board_filter")
+
+        aktion = None
+
+        for sp in gs:
+            if board_filter != "Alle" and f"Board {sp['board']}" != board_filter:
+                continue
+
+            sid = sp["id"]
+            a, b = sp["spieler_a"], sp["spieler_b"]
+            gk = sp.get("gruppe", "?")
+            ist_fertig = sp.get("abgeschlossen", False)
+            board_badge = (f"<span style='background:#1e3a5f;color:#93c5fd;border-radius:3px;"
+                           f"padding:1px 7px;font-size:11px;font-weight:600;'>B{sp['board']}</span>")
+            gr_badge = (f"<span style='background:#e2e8f0;color:#475569;border-radius:3px;"
+                        f"padding:1px 5px;font-size:11px;'>Gr.{gk}</span>")
+
+            if ist_fertig:
+                la = sp.get("legs_a", 0); lb = sp.get("legs_b", 0)
+                avga = sp.get("avg_a") or 0.0; avgb = sp.get("avg_b") or 0.0
+                cols = st.columns([8, 1] if admin_mode else [10])
+                with cols[0]:
+                    win_a_style = "color:#16a34a;font-weight:700;" if la > lb else ""
+                    win_b_style = "color:#16a34a;font-weight:700;" if lb > la else ""
+                    st.markdown(
+                        f"<div style='background:#f0fdf4;border:1px solid #bbf7d0;border-radius:6px;"
+                        f"padding:8px 12px;margin-bottom:4px;font-size:14px;'>"
+                        f"{board_badge} {gr_badge} &nbsp; ✅ "
+                        f"<span style='{win_a_style}'>{a}</span>"
+                        f" <b>{int(la)}:{int(lb)}</b> "
+                        f"<span style='{win_b_style}'>{b}</span>"
+                        f" &nbsp; <span style='color:#64748b;font-size:12px;'>"
+                        f"Avg {float(avga):.1f} / {float(avgb):.1f}</span></div>",
+                        unsafe_allow_html=True)
+                if admin_mode and len(cols) > 1:
+                    with cols[1]:
+                        if st.button("🔓", key=f"t_unlock_{sid}"):
+                            aktion = ("unlock", sid)
+            else:
+                if admin_mode:
+                    c = st.columns([3, 1, 1, 1, 1, 1])
+                    with c[0]:
+                        st.markdown(f"{board_badge} {gr_badge} &nbsp; **{a}** vs **{b}**", unsafe_allow_html=True)
+                    with c[1]:
+                        la = st.number_input("L-A", 0, step=1, value=0, key=f"t_la_{sid}", label_visibility="collapsed")
+                    with c[2]:
+                        lb = st.number_input("L-B", 0, step=1, value=0, key=f"t_lb_{sid}", label_visibility="collapsed")
+                    with c[3]:
+                        avg_a_v = st.number_input("Ø-A", 0.0, step=0.1,
+                                                   value=float(sp.get("avg_a") or 50.0),
+                                                   key=f"t_avga_{sid}", label_visibility="collapsed")
+                    with c[4]:
+                        avg_b_v = st.number_input("Ø-B", 0.0, step=0.1,
+                                                   value=float(sp.get("avg_b") or 50.0),
+                                                   key=f"t_avgb_{sid}", label_visibility="collapsed")
+                    with c[5]:
+                        if st.button("✅", key=f"t_lock_{sid}"):
+                            aktion = ("lock", sid, la, lb, avg_a_v, avg_b_v)
+                else:
+                    st.markdown(
+                        f"<div style='background:#f8fafc;border:1px solid #e2e8f0;border-radius:6px;"
+                        f"padding:8px 12px;margin-bottom:4px;font-size:14px;color:#374151;'>"
+                        f"{board_badge} {gr_badge} &nbsp; ⏳ <b>{a}</b> vs <b>{b}</b></div>",
+                        unsafe_allow_html=True)
+
+        if aktion and admin_mode:
+            neue_gs = []
+            for sp in gs:
+                sp = dict(sp)
+                if sp["id"] == aktion[1]:
+                    if aktion[0] == "lock":
+                        sp["legs_a"] = aktion[2]; sp["legs_b"] = aktion[3]
+                        sp["avg_a"] = aktion[4]; sp["avg_b"] = aktion[5]
+                        sp["abgeschlossen"] = True
+                    elif aktion[0] == "unlock":
+                        sp["abgeschlossen"] = False
+                    geaendert = sp
+                neue_gs.append(sp)
+            tabellen = gruppen_tabellen(turnier)
+            if patche_turnier(turnier, {"gruppen_spiele": neue_gs}):
+                # nur das eine Spiel in den Tabellen nachbuchen
+                with get_datenstand().lock:
+                    if aktion[0] == "lock":
+                        tabellen.anwenden(geaendert)
+                    else:
+                        tabellen.zuruecknehmen(geaendert["id"])
+            st.rerun()
+
+        # Gruppenphase abschließen
+        if admin_mode and not ko:
+            st.markdown("---")
+            fehlend = [s for s in gs if not s.get("abgeschlossen")]
+            if not fehlend:
+                st.success("✅ Alle Gruppenspiele eingetragen!")
+                if st.button("🏆 KO-Phase starten", type="primary"):
+                    qual_list = gruppen_tabellen(turnier).qualifizierte()
+                    ko_spiele = t_erstelle_ko_spiele(qual_list, TURNIER_BOARDS)
+                    qual_dict = {str(i+1): n for i, n in enumerate(qual_list)}
+                    speichere_turnier({**turnier, "status": "ko", "ko_spiele": ko_spiele, "qualifizierte": qual_dict})
+                    st.rerun()
+            else:
+                st.warning(f"Noch {len(fehlend)} Gruppenspiel(e) ausstehend.")
+
+    # ── GRUPPENTABELLEN ──
+    with tabs[1]:
+        # 2-Spalten-Layout: je 2 Gruppen nebeneinander
+        pairs = [("A", "B"), ("C", "D"), ("E", "F"), ("G", "H")]
+        tabellen = gruppen_tabellen(turnier)
+        for pair in pairs:
+            cols = st.columns(2)
+            for ci, gk in enumerate(pair):
+                tab = tabellen.tabelle(gk) if gk in gruppen else []
+                with cols[ci]:
+                    st.markdown(f"**Gruppe {gk}**")
+                    header = (
+                        "<tr style='border-bottom:2px solid #e2e8f0;background:#f8fafc;'>"
+                        "<th style='padding:4px 6px;font-size:10px;color:#64748b;font-weight:600;text-align:center;'>#</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:left;padding:4px 8px;font-weight:600;'>Spieler</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:center;padding:4px 3px;font-weight:600;'>Sp</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:center;padding:4px 3px;font-weight:600;'>S</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:center;padding:4px 3px;font-weight:600;'>N</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:center;padding:4px 3px;font-weight:600;'>+/-</th>"
+                        "<th style='font-size:10px;color:#64748b;text-align:center;padding:4px 6px;font-weight:600;'>Avg</th>"
+                        "</tr>"
+                    )
+                    rows = ""
+                    for pos, (name, s) in enumerate(tab):
+                        bg = "background:#f0fdf4;" if pos < 2 else "background:#ffffff;"
+                        pos_label = f"{pos+1}"
+                        diff_col = "#16a34a" if s["Diff"] > 0 else "#dc2626" if s["Diff"] < 0 else "#6b7280"
+                        avg_str = f"{s.get('Avg', 0.0):.1f}" if s["Sp"] > 0 else "–"
+                        rows += (
+                            f"<tr style='{bg}border-bottom:1px solid #e2e8f0;'>"
+                            f"<td style='padding:5px 6px;font-size:12px;color:#64748b;text-align:center;'>{pos_label}</td>"
+                            f"<td style='padding:5px 8px;font-size:13px;font-weight:600;color:#1a202c;white-space:nowrap;'>{name}</td>"
+                            f"<td style='padding:5px 3px;text-align:center;font-size:12px;color:#1a202c;'>{s['Sp']}</td>"
+                            f"<td style='padding:5px 3px;text-align:center;font-size:12px;color:#1a202c;font-weight:700;'>{s['S']}</td>"
+                            f"<td style='padding:5px 3px;text-align:center;font-size:12px;color:#1a202c;font-weight:700;'>{s['N']}</td>"
+                            f"<td style='padding:5px 3px;text-align:center;font-size:12px;color:{diff_col};font-weight:600;'>{s['Diff']:+d}</td>"
+                            f"<td style='padding:5px 6px;text-align:center;font-size:12px;color:#6b7280;'>{avg_str}</td>"
+                            f"</tr>"
+                        )
+                    st.markdown(
+                        f"<table style='width:100%;border-collapse:collapse;background:#fff;"
+                        f"border:1px solid #e2e8f0;border-radius:8px;overflow:hidden;margin-bottom:28px;'>"
+                        f"<thead>{header}</thead><tbody>{rows}</tbody></table>",
+                        unsafe_allow_html=True)
+            st.markdown("<div style='margin-bottom:8px;'></div>", unsafe_allow_html=True)
+
+    # ── KO-PHASE ──
+    if ko and len(tabs) > 2:
+        with tabs[2]:
+            pw_ko = st.text_input("Passwort zum Eintragen", type="password", key="t_ko_pw")
+            admin_ko = (pw_ko == PASSWORT)
+            if admin_ko:
+                st.caption("✅ = Ergebnis speichern · 🔓 = Entsperren")
+
+            max_r = max(s["runde_idx"] for s in ko)
+            aktion_ko = None
+
+            for r in range(0, max_r + 1):
+                runde_spiele = sorted([s for s in ko if s["runde_idx"] == r], key=lambda x: x["match_nr"])
+                rname = runde_spiele[0]["runde_name"] if runde_spiele else ""
+                st.markdown(f"### {rname}")
+
+                for sp in runde_spiele:
+                    sid = sp["id"]
+                    a = sp.get("spieler_a") or "TBD"
+                    b = sp.get("spieler_b") or "TBD"
+                    board_str = f"Board {sp['board']}" if sp.get("board") else "–"
+                    ist_fertig = sp.get("abgeschlossen", False)
+                    board_badge_ko = (f"<span style='background:#1e3a5f;color:#93c5fd;border-radius:3px;"
+                                     f"padding:1px 7px;font-size:11px;font-weight:600;'>{board_str}</span>")
+                    if ist_fertig:
+                        la = sp.get("legs_a", 0); lb = sp.get("legs_b", 0)
+                        sieger = sp.get("sieger", "?")
+                        avga = sp.get("avg_a") or 0.0; avgb = sp.get("avg_b") or 0.0
+                        cols = st.columns([8, 1] if admin_ko else [10])
+                        with cols[0]:
+                            win_a_s = "color:#16a34a;font-weight:700;" if la > lb else ""
+                            win_b_s = "color:#16a34a;font-weight:700;" if lb > la else ""
+                            st.markdown(
+                                f"<div style='background:#f0fdf4;border:1px solid #bbf7d0;border-radius:6px;"
+                                f"padding:8px 12px;margin-bottom:4px;'>"
+                                f"{board_badge_ko} &nbsp; ✅ "
+                                f"<span style='{win_a_s}'>{a}</span>"
+                                f" <b>{int(la)}:{int(lb)}</b> "
+                                f"<span style='{win_b_s}'>{b}</span>"
+                                f" &nbsp; <span style='color:#16a34a;font-size:12px;'>→ {sieger}</span>"
+                                f" &nbsp; <span style='color:#64748b;font-size:12px;'>"
+                                f"Avg {float(avga):.1f}/{float(avgb):.1f}</span></div>",
+                                unsafe_allow_html=True)
+                        if admin_ko and len(cols) > 1:
+                            with cols[1]:
+                                if st.button("🔓", key=f"ko_unlock_{sid}"):
+                                    aktion_ko = ("unlock", sid)
+                    elif a == "TBD" or b == "TBD":
+                        st.markdown(
+                            f"<div style='background:#f8fafc;border:1px solid #e2e8f0;border-radius:6px;"
+                            f"padding:8px 12px;margin-bottom:4px;color:#9ca3af;'>"
+                            f"{board_badge_ko} ⏸ TBD vs TBD</div>", unsafe_allow_html=True)
+                    else:
+                        if admin_ko:
+                            c = st.columns([3, 1, 1, 1, 1, 1])
+                            with c[0]:
+                                st.markdown(
+                                    f"{board_badge_ko} &nbsp; **{a}** vs **{b}**", unsafe_allow_html=True)
+                            with c[1]:
+                                la = st.number_input("L-A", 0, step=1, value=0, key=f"ko_la_{sid}", label_visibility="collapsed")
+                            with c[2]:
+                                lb = st.number_input("L-B", 0, step=1, value=0, key=f"ko_lb_{sid}", label_visibility="collapsed")
+                            with c[3]:
+                                avg_a_v = st.number_input("Ø-A", 0.0, step=0.1, value=float(sp.get("avg_a") or 50.0),
+                                                           key=f"ko_avga_{sid}", label_visibility="collapsed")
+                            with c[4]:
+                                avg_b_v = st.number_input("Ø-B", 0.0, step=0.1, value=float(sp.get("avg_b") or 50.0),
+                                                           key=f"ko_avgb_{sid}", label_visibility="collapsed")
+                            with c[5]:
+                                if st.button("✅", key=f"ko_lock_{sid}"):
+                                    aktion_ko = ("lock", sid, la, lb, avg_a_v, avg_b_v)
+                        else:
+                            st.markdown(
+                                f"<div style='background:#f8fafc;border:1px solid #e2e8f0;border-radius:6px;"
+                                f"padding:8px 12px;margin-bottom:4px;color:#374151;'>"
+                                f"{board_badge_ko} ⏳ <b>{a}</b> vs <b>{b}</b></div>",
+                                unsafe_allow_html=True)
+
+                st.markdown("---")
+
+            if aktion_ko and admin_ko:
+                neue_ko = []
+                for sp in ko:
+                    sp = dict(sp)
+                    if sp["id"] == aktion_ko[1]:
+                        if aktion_ko[0] == "lock":
+                            la_v, lb_v = aktion_ko[2], aktion_ko[3]
+                            sp["legs_a"] = la_v; sp["legs_b"] = lb_v
+                            sp["avg_a"] = aktion_ko[4]; sp["avg_b"] = aktion_ko[5]
+                            sp["abgeschlossen"] = True
+                            sp["sieger"] = sp["spieler_a"] if la_v > lb_v else sp["spieler_b"]
+                        elif aktion_ko[0] == "unlock":
+                            sp["abgeschlossen"] = False
+                            sp["sieger"] = None
+                    neue_ko.append(sp)
+                neue_ko = t_propagiere_sieger(neue_ko, TURNIER_BOARDS)
+                neue_status = turnier.get("status", "ko")
+                finale = [s for s in neue_ko if s["runde_name"] == "Finale"]
+                if finale and finale[0].get("abgeschlossen"):
+                    neue_status = "abgeschlossen"
+                patche_turnier(turnier, {"ko_spiele": neue_ko}, {"status": neue_status})
+                st.rerun()
+
+    # ── PROGNOSE ──
+    if mit_prognose:
+        with tabs[-1]:
+            zeige_turnier_prognose(turnier)
+
+    st.markdown("---")
+    with st.expander("⚠️ Turnier verwalten"):
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✏️ Gruppen bearbeiten"):
+                speichere_turnier({**turnier, "status": "gruppen_setup", "gruppen_spiele": [], "ko_spiele": [], "qualifizierte": {}})
+                st.rerun()
+        with col2:
+            if st.button("🗑 Turnier löschen", type="secondary"):
+                loesche_turnier()
+                st.rerun()
+
+
+# --- Haupt-Dispatcher ---
+def anzeigen():
+    turnier = lade_turnier()
+    st.markdown("<h2 style='font-size:28px;'>🏆 Turnier</h2>", unsafe_allow_html=True)
+    if st.session_state.pop("turnier_veraltet", False):
+        st.warning("Das Turnier wurde inzwischen an anderer Stelle geändert. Die Eingabe wurde nicht gespeichert, bitte prüfen und erneut eintragen.")
+
+    if turnier is None:
+        _t_setup_ui()
+        return
+
+    status = turnier.get("status", "setup")
+    name = turnier.get("name", "Turnier")
+
+    status_map = {
+        "gruppen_setup": ("✏️ Gruppen-Setup", "#f59e0b"),
+        "gruppen": ("⚽ Gruppenphase", "#3b82f6"),
+        "ko": ("🏆 KO-Phase", "#16a34a"),
+        "abgeschlossen": ("✅ Abgeschlossen", "#16a34a")
+    }
+    slabel, scolor = status_map.get(status, ("⚙️ Setup", "#64748b"))
+
+    st.markdown(f"""
+    <div style='background:#f8fafc;border:1px solid #e2e8f0;padding:12px 18px;border-radius:10px;margin-bottom:20px;
+        display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:10px;'>
+        <div>
+            <div style='font-size:22px;font-weight:800;color:#1a202c;'>{name}</div>
+            <div style='font-size:12px;color:#64748b;margin-top:2px;'>32 Teilnehmer · 8 Gruppen · 16er KO · {TURNIER_BOARDS} Boards</div>
+        </div>
+        <div style='background:{scolor}22;color:{scolor};padding:4px 12px;border-radius:20px;
+            font-size:13px;font-weight:700;border:1px solid {scolor}55;'>{slabel}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if status == "gruppen_setup":
+        _t_gruppen_setup_ui(turnier)
+    elif status in ("gruppen", "ko", "abgeschlossen"):
+        _t_gruppenphase_ui(turnier)
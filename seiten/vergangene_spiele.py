@@ -0,0 +1,55 @@
+import streamlit as st
+
+from basis import (PASSWORT, aktualisiere_spiel, berechne_elo_nach_aenderung, fmt_elo, lade_log,
+                   lade_spieler, loesche_spiel)
+
+
+def anzeigen():
+    st.subheader("📄 Vergangene Spiele")
+    df_log = lade_log()
+    if df_log.empty:
+        st.info("Noch keine Spiele eingetragen.")
+    else:
+        for i, row in df_log.iterrows():
+            col1, col2, col3 = st.columns([5, 2, 1])
+            with col1:
+                st.markdown(f"**Spieltag {row['Datum']}** — {row['Spieler A']} {row['Legs A']}:{row['Legs B']} {row['Spieler B']} (Avg {row['Avg A']} / {row['Avg B']})")
+            with col2:
+                st.markdown(f"{fmt_elo(row['Elo A'])} | {fmt_elo(row['Elo B'])}", unsafe_allow_html=True)
+            with col3:
+                row_id = int(row["id"]) if "id" in df_log.columns else i
+                if st.button("🛠", key=f"edit_{row_id}"):
+                    st.session_state.edit_index = row_id
+                    st.rerun()
+
+        if st.session_state.edit_index is not None:
+            st.markdown("---")
+            st.subheader("🛠 Spiel bearbeiten")
+            idx = st.session_state.edit_index
+            df_log = lade_log()
+            row = df_log[df_log["id"] == idx].iloc[0] if "id" in df_log.columns else df_log.loc[idx]
+            pw = st.text_input("Admin-Passwort", type="password")
+            if pw == PASSWORT:
+                spieler = list(lade_spieler().index)
+                with st.form("edit_form"):
+                    a = st.selectbox("Spieler A", spieler, index=spieler.index(row["Spieler A"]))
+                    b = st.selectbox("Spieler B", spieler, index=spieler.index(row["Spieler B"]))
+                    la = st.number_input("Legs A", min_value=0, step=1, value=int(row["Legs A"]))
+                    lb = st.number_input("Legs B", min_value=0, step=1, value=int(row["Legs B"]))
+                    avga = st.number_input("Average A", min_value=0.0, step=0.1, value=float(row["Avg A"]))
+                    avgb = st.number_input("Average B", min_value=0.0, step=0.1, value=float(row["Avg B"]))
+                    spieltag = st.text_input("Spieltag", value=str(row["Datum"]))
+                    save = st.form_submit_button("💾 Änderungen speichern")
+                    delete = st.form_submit_button("🗑 Spiel löschen")
+                if save:
+                    aktualisiere_spiel(idx, spieltag, a, b, la, lb, avga, avgb)
+                    berechne_elo_nach_aenderung(lade_log())
+                    st.success("Spiel aktualisiert!")
+                    st.session_state.edit_index = None
+                    st.rerun()
+                if delete:
+                    loesche_spiel(idx)
+                    berechne_elo_nach_aenderung(lade_log())
+                    st.success("Spiel gelöscht!")
+                    st.session_state.edit_index = None
+                    st.rerun()
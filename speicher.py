@@ -0,0 +1,448 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+import pandas as pd
+
+# Primärschlüssel je Tabelle (für Upserts)
+SCHLUESSEL = {"spieler": "name", "spiele_log": "id", "aktiver_spielplan": "id", "turniere": "id"}
+
+LOG_SPALTEN = {
+    "datum": "Datum", "spieler_a": "Spieler A", "spieler_b": "Spieler B",
+    "legs_a": "Legs A", "legs_b": "Legs B",
+    "avg_a": "Avg A", "avg_b": "Avg B",
+    "elo_a": "Elo A", "elo_b": "Elo B"
+}
+
+
+class VeralteterStand(Exception):
+    """Die Zeile wurde seit dem Lesen geändert (Spalte `version` passt nicht mehr)."""
+
+
+class Speicher(ABC):
+    """Schnittstelle zu den Tabellen spieler, spiele_log, aktiver_spielplan und turniere.
+
+    Zeilen sind dicts mit den Spaltennamen der Datenbank. Jeder Aufruf ist genau ein
+    Round-Trip und wird in `anfragen` gezählt. Pflicht sind die abstrakten Methoden,
+    `patche` und `marke` sind optional.
+    """
+
+    def __init__(self):
+        self.anfragen = 0
+
+    @abstractmethod
+    def alle(self, tabelle, order=None):
+        ...
+
+    @abstractmethod
+    def zeile(self, tabelle, id):
+        ...
+
+    @abstractmethod
+    def upsert(self, tabelle, zeilen):
+        ...
+
+    @abstractmethod
+    def insert(self, tabelle, zeilen):
+        ...
+
+    @abstractmethod
+    def update(self, tabelle, id, werte, version=None):
+        """Mit `version` nur, wenn die Zeile sie noch hat; gibt dann zurück, ob geschrieben wurde."""
+        ...
+
+    def patche(self, tabelle, id, version, elemente, werte):
+        """Setzt in JSON-Spalten nur einzelne Einträge ({spalte: {index oder schlüssel: wert}})
+        und die Spalten in `werte`, wenn die Zeile noch `version` hat, und erhöht diese.
+        True/False je nachdem, ob geschrieben wurde; None, wenn das Backend nicht patchen kann."""
+        return None
+
+    @abstractmethod
+    def loesche(self, tabelle, id):
+        ...
+
+    def marke(self, tabelle):
+        """Günstige Änderungsmarke einer Tabelle, bewegt sich bei jedem Insert, Update und
+        Delete; None, wenn das Backend keine kennt (dann wird bei jeder Prüfung neu geladen)."""
+        return None
+
+    @abstractmethod
+    def delta(self, tabelle, ab_id, seit=None):
+        """Zeilen mit Schlüssel > ab_id oder Spalte `geaendert` > seit, nach Schlüssel sortiert."""
+        ...
+
+    @abstractmethod
+    def anzahl(self, tabelle):
+        ...
+
+    @abstractmethod
+    def schluessel(self, tabelle):
+        ...
+
+
+# ---------------------
+# SUPABASE
+# ---------------------
+# Fehlercodes (Postgres / PostgREST), wenn ein Teil des optionalen Schemas fehlt
+FEHLT_TABELLE = {"42P01", "PGRST205"}
+FEHLT_SPALTE = {"42703", "PGRST204"}
+FEHLT_FUNKTION = {"42883", "PGRST202"}
+PATCH_FUNKTIONEN = {"turniere": "patche_turnier", "aktiver_spielplan": "patche_spielplan"}
+
+
+def _fehlt(fehler, codes):
+    return getattr(fehler, "code", None) in codes
+
+
+class SupabaseSpeicher(Speicher):
+    """Fremde Änderungen erkennt die Änderungsmarke an einem Zähler je Tabelle, den
+    Statement-Trigger in Commit-Reihenfolge erhöhen:
+
+        create table aenderungen (tabelle text primary key, zaehler bigint not null default 0);
+        insert into aenderungen (tabelle) values ('spieler'), ('spiele_log'), ('turniere'), ('aktiver_spielplan');
+        create function zaehle_aenderung() returns trigger security definer as $$
+            begin update aenderungen set zaehler = zaehler + 1 where tabelle = TG_TABLE_NAME; return null; end
+            $$ language plpgsql;
+        create trigger spieler_aenderung after insert or update or delete on spieler
+            for each statement execute function zaehle_aenderung();
+        -- ebenso für spiele_log, turniere und aktiver_spielplan
+
+    Ohne die Tabelle wird bei jeder Prüfung neu geladen.
+
+    Für Bearbeitungen im Delta-Sync braucht spiele_log eine Spalte `geaendert`:
+
+        alter table spiele_log add column geaendert timestamptz not null default now();
+        create function setze_geaendert() returns trigger as $$
+            begin new.geaendert = now(); return new; end $$ language plpgsql;
+        create trigger spiele_log_geaendert before update on spiele_log
+            for each row execute function setze_geaendert();
+
+    Ohne die Spalte werden nur neue und gelöschte Zeilen erkannt. `now()` ist die Startzeit
+    der Transaktion, nicht die des Commits: committet eine länger laufende Bearbeitung nach
+    einer späteren, liegt ihr `geaendert` unter dem schon gesehenen Wasserstand und wird
+    vom Delta-Sync nicht abgeholt, erst wenn der Stand neu geladen wird.
+
+    Ergebnisse im Turnier und im aktiven Spielplan werden mit Versionsprüfung geschrieben,
+    dafür brauchen turniere und aktiver_spielplan eine Spalte `version` und, damit nur die
+    einzelnen Einträge übertragen werden, je eine Funktion:
+
+        alter table turniere add column version integer not null default 0;
+        create function patche_turnier(p_id bigint, p_version integer, p_pfade jsonb, p_werte jsonb)
+        returns boolean language plpgsql as $$
+            declare z jsonb; p jsonb;
+            begin
+                select to_jsonb(t) into z from turniere t where id = p_id and version = p_version for update;
+                if z is null then return false; end if;
+                for p in select * from jsonb_array_elements(p_pfade) loop
+                    z := jsonb_set(z, array[p->>0, p->>1], p->2);
+                end loop;
+                z := z || p_werte || jsonb_build_object('version', p_version + 1);
+                update turniere t set (name, status, config, gruppen, gruppen_spiele, ko_spiele, qualifizierte, version)
+                    = (select r.name, r.status, r.config, r.gruppen, r.gruppen_spiele, r.ko_spiele, r.qualifizierte, r.version
+                       from jsonb_populate_record(null::turniere, z) r)
+                    where t.id = p_id;
+                return true;
+            end $$;
+
+        alter table aktiver_spielplan add column version integer not null default 0;
+        -- patche_spielplan ebenso, auf aktiver_spielplan mit den Spalten
+        -- (spielplan, spieltag, extra_spieler, ergebnisse, locked, reihenfolge, version)
+
+    Ohne die Funktion wird die ganze Spalte geschrieben, mit derselben Versionsprüfung.
+    """
+
+    def __init__(self, url=None, key=None, client=None):
+        super().__init__()
+        if client is None:
+            from supabase import create_client
+            client = create_client(url, key)
+        self.sb = client
+        self.mit_aenderungen = True
+        self.mit_geaendert = True
+        self.ohne_patch = set()
+
+    def _ausfuehren(self, query):
+        self.anfragen += 1
+        return query.execute()
+
+    def alle(self, tabelle, order=None):
+        query = self.sb.table(tabelle).select("*")
+        if order:
+            query = query.order(order)
+        return self._ausfuehren(query).data or []
+
+    def zeile(self, tabelle, id):
+        res = self._ausfuehren(self.sb.table(tabelle).select("*").eq(SCHLUESSEL[tabelle], id))
+        return res.data[0] if res.data else None
+
+    def upsert(self, tabelle, zeilen):
+        self._ausfuehren(self.sb.table(tabelle).upsert(zeilen))
+
+    def insert(self, tabelle, zeilen):
+        return self._ausfuehren(self.sb.table(tabelle).insert(zeilen)).data or []
+
+    def update(self, tabelle, id, werte, version=None):
+        query = self.sb.table(tabelle).update(werte).eq(SCHLUESSEL[tabelle], id)
+        if version is None:
+            self._ausfuehren(query)
+            return True
+        return bool(self._ausfuehren(query.eq("version", version)).data)
+
+    def patche(self, tabelle, id, version, elemente, werte):
+        if tabelle not in PATCH_FUNKTIONEN or tabelle in self.ohne_patch:
+            return None
+        pfade = [[s, str(i), w] for s, el in elemente.items() for i, w in el.items()]
+        try:
+            res = self._ausfuehren(self.sb.rpc(PATCH_FUNKTIONEN[tabelle], {
+                "p_id": id, "p_version": version, "p_pfade": pfade, "p_werte": werte}))
+        except Exception as e:
+            # nur eine fehlende Funktion schaltet für die Tabelle dauerhaft auf ganze Spalten um
+            if not _fehlt(e, FEHLT_FUNKTION):
+                raise
+            self.ohne_patch.add(tabelle)
+            return None
+        return bool(res.data)
+
+    def loesche(self, tabelle, id):
+        self._ausfuehren(self.sb.table(tabelle).delete().eq(SCHLUESSEL[tabelle], id))
+
+    def marke(self, tabelle):
+        if not self.mit_aenderungen:
+            return None
+        try:
+            res = self._ausfuehren(self.sb.table("aenderungen").select("zaehler").eq("tabelle", tabelle))
+        except Exception as e:
+            if not _fehlt(e, FEHLT_TABELLE):
+                raise
+            self.mit_aenderungen = False
+            return None
+        return res.data[0]["zaehler"] if res.data else None
+
+    def delta(self, tabelle, ab_id, seit=None):
+        pk = SCHLUESSEL[tabelle]
+        query = self.sb.table(tabelle).select("*").order(pk)
+        if seit is not None and self.mit_geaendert:
+            try:
+                return self._ausfuehren(query.or_(f'{pk}.gt.{ab_id},geaendert.gt."{seit}"')).data or []
+            except Exception as e:
+                # nur eine fehlende Spalte schaltet dauerhaft ab, Netzwerkfehler gehen nach oben
+                if not _fehlt(e, FEHLT_SPALTE):
+                    raise
+                self.mit_geaendert = False
+                query = self.sb.table(tabelle).select("*").order(pk)
+        return self._ausfuehren(query.gt(pk, ab_id)).data or []
+
+    def anzahl(self, tabelle):
+        pk = SCHLUESSEL[tabelle]
+        return self._ausfuehren(self.sb.table(tabelle).select(pk, count="exact").limit(1)).count
+
+    def schluessel(self, tabelle):
+        pk = SCHLUESSEL[tabelle]
+        return [z[pk] for z in self._ausfuehren(self.sb.table(tabelle).select(pk)).data or []]
+
+
+# ---------------------
+# SQLITE (offline)
+# ---------------------
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spieler (
+    name TEXT PRIMARY KEY, elo INTEGER NOT NULL DEFAULT 1000, spiele INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS spiele_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, datum TEXT, spieler_a TEXT, spieler_b TEXT,
+    legs_a INTEGER, legs_b INTEGER, avg_a REAL, avg_b REAL, elo_a INTEGER, elo_b INTEGER);
+CREATE TABLE IF NOT EXISTS aktiver_spielplan (
+    id INTEGER PRIMARY KEY, spielplan TEXT, spieltag TEXT, extra_spieler TEXT,
+    ergebnisse TEXT, locked TEXT, reihenfolge TEXT, version INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS turniere (
+    id INTEGER PRIMARY KEY, name TEXT, status TEXT, config TEXT, gruppen TEXT,
+    gruppen_spiele TEXT, ko_spiele TEXT, qualifizierte TEXT, version INTEGER NOT NULL DEFAULT 0);
+"""
+
+# laufender Änderungszähler für den Delta-Sync, von Triggern gesetzt
+SQLITE_GEAENDERT = """
+CREATE INDEX IF NOT EXISTS spiele_log_geaendert ON spiele_log (geaendert);
+CREATE TRIGGER IF NOT EXISTS spiele_log_neu AFTER INSERT ON spiele_log BEGIN
+    UPDATE spiele_log SET geaendert = (SELECT COALESCE(MAX(geaendert), 0) + 1 FROM spiele_log) WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS spiele_log_bearbeitet
+AFTER UPDATE OF datum, spieler_a, spieler_b, legs_a, legs_b, avg_a, avg_b, elo_a, elo_b ON spiele_log BEGIN
+    UPDATE spiele_log SET geaendert = (SELECT COALESCE(MAX(geaendert), 0) + 1 FROM spiele_log) WHERE id = NEW.id;
+END;
+"""
+
+# Spalten, die in Supabase jsonb sind und hier als JSON-Text liegen
+JSON_SPALTEN = {
+    "aktiver_spielplan": {"spielplan", "ergebnisse", "locked", "reihenfolge"},
+    "turniere": {"config", "gruppen", "gruppen_spiele", "ko_spiele", "qualifizierte"},
+}
+
+
+class SqliteSpeicher(Speicher):
+    def __init__(self, pfad=":memory:"):
+        super().__init__()
+        self.con = sqlite3.connect(pfad, check_same_thread=False)
+        self.con.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.con:
+            self.con.executescript(SQLITE_SCHEMA)
+            spalten = [r["name"] for r in self.con.execute("PRAGMA table_info(spiele_log)")]
+            if "geaendert" not in spalten:
+                self.con.execute("ALTER TABLE spiele_log ADD COLUMN geaendert INTEGER")
+            for tabelle in ("turniere", "aktiver_spielplan"):
+                spalten = [r["name"] for r in self.con.execute(f"PRAGMA table_info({tabelle})")]
+                if "version" not in spalten:
+                    self.con.execute(f"ALTER TABLE {tabelle} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self.con.executescript(SQLITE_GEAENDERT)
+
+    def _aus_db(self, tabelle, row):
+        z = dict(row)
+        for s in JSON_SPALTEN.get(tabelle, ()):
+            if z.get(s) is not None:
+                z[s] = json.loads(z[s])
+        return z
+
+    def _in_db(self, tabelle, z):
+        json_spalten = JSON_SPALTEN.get(tabelle, ())
+        return {k: json.dumps(v) if k in json_spalten and v is not None else v for k, v in z.items()}
+
+    def _sql(self, sql, params=(), viele=False):
+        self.anfragen += 1
+        with self.lock, self.con:
+            if viele:
+                return self.con.executemany(sql, params).fetchall()
+            return self.con.execute(sql, params).fetchall()
+
+    def alle(self, tabelle, order=None):
+        sql = f"SELECT * FROM {tabelle}" + (f" ORDER BY {order}" if order else "")
+        return [self._aus_db(tabelle, r) for r in self._sql(sql)]
+
+    def zeile(self, tabelle, id):
+        rows = self._sql(f"SELECT * FROM {tabelle} WHERE {SCHLUESSEL[tabelle]} = ?", (id,))
+        return self._aus_db(tabelle, rows[0]) if rows else None
+
+    def upsert(self, tabelle, zeilen):
+        for spalten, gruppe in _nach_spalten(zeilen).items():
+            pk = SCHLUESSEL[tabelle]
+            setzen = ", ".join(f"{s} = excluded.{s}" for s in spalten if s != pk)
+            sql = (f"INSERT INTO {tabelle} ({', '.join(spalten)}) VALUES ({', '.join('?' * len(spalten))}) "
+                   f"ON CONFLICT({pk}) DO " + (f"UPDATE SET {setzen}" if setzen else "NOTHING"))
+            self._sql(sql, [tuple(self._in_db(tabelle, z)[s] for s in spalten) for z in gruppe], viele=True)
+
+    def insert(self, tabelle, zeilen):
+        if not zeilen:
+            return []
+        self.anfragen += 1
+        neu = []
+        with self.lock, self.con:
+            for z in zeilen:
+                db = self._in_db(tabelle, z)
+                cur = self.con.execute(
+                    f"INSERT INTO {tabelle} ({', '.join(db)}) VALUES ({', '.join('?' * len(db))})", tuple(db.values()))
+                # zurück kommt die gespeicherte Zeile wie bei Supabase, samt `geaendert` aus dem Trigger
+                pk = SCHLUESSEL[tabelle]
+                id = z.get(pk, cur.lastrowid)
+                row = self.con.execute(f"SELECT * FROM {tabelle} WHERE {pk} = ?", (id,)).fetchone()
+                neu.append(self._aus_db(tabelle, row))
+        return neu
+
+    def _aendern(self, sql, params):
+        self.anfragen += 1
+        with self.lock, self.con:
+            return self.con.execute(sql, params).rowcount
+
+    def update(self, tabelle, id, werte, version=None):
+        db = self._in_db(tabelle, werte)
+        setzen = ", ".join(f"{s} = ?" for s in db)
+        sql = f"UPDATE {tabelle} SET {setzen} WHERE {SCHLUESSEL[tabelle]} = ?"
+        if version is None:
+            self._aendern(sql, (*db.values(), id))
+            return True
+        return self._aendern(sql + " AND version = ?", (*db.values(), id, version)) == 1
+
+    def patche(self, tabelle, id, version, elemente, werte):
+        setzen, params = [], []
+        for spalte, el in elemente.items():
+            if el:
+                setzen.append(f"{spalte} = json_set({spalte}" + ", ?, json(?)" * len(el) + ")")
+                for i, w in el.items():
+                    params += [f"$[{i}]" if isinstance(i, int) else f'$."{i}"', json.dumps(w)]
+        for spalte, w in self._in_db(tabelle, werte).items():
+            setzen.append(f"{spalte} = ?")
+            params.append(w)
+        setzen.append("version = version + 1")
+        sql = f"UPDATE {tabelle} SET {', '.join(setzen)} WHERE {SCHLUESSEL[tabelle]} = ? AND version = ?"
+        return self._aendern(sql, (*params, id, version)) == 1
+
+    def loesche(self, tabelle, id):
+        self._sql(f"DELETE FROM {tabelle} WHERE {SCHLUESSEL[tabelle]} = ?", (id,))
+
+    def marke(self, tabelle):
+        # ändert sich nur bei Commits anderer Verbindungen auf dieselbe Datei
+        return self._sql("PRAGMA data_version")[0][0]
+
+    def delta(self, tabelle, ab_id, seit=None):
+        # die Spalte gibt es hier immer: ohne Wasserstand zählt jede je bearbeitete Zeile
+        pk = SCHLUESSEL[tabelle]
+        rows = self._sql(f"SELECT * FROM {tabelle} WHERE {pk} > ? OR geaendert > ? ORDER BY {pk}",
+                         (ab_id, 0 if seit is None else seit))
+        return [self._aus_db(tabelle, r) for r in rows]
+
+    def anzahl(self, tabelle):
+        return self._sql(f"SELECT COUNT(*) FROM {tabelle}")[0][0]
+
+    def schluessel(self, tabelle):
+        return [r[0] for r in self._sql(f"SELECT {SCHLUESSEL[tabelle]} FROM {tabelle}")]
+
+
+def _nach_spalten(zeilen):
+    gruppen = {}
+    for z in zeilen:
+        gruppen.setdefault(tuple(z), []).append(z)
+    return gruppen
+
+
+# ---------------------
+# CSV IMPORT/EXPORT
+# ---------------------
+def importiere_csv(speicher, log_pfad="dart_log.csv", elo_pfad="dart_elo.csv"):
+    """Übernimmt dart_log.csv / dart_elo.csv (Spaltenköpfe wie in der App) in den Speicher."""
+    df_elo = pd.read_csv(elo_pfad, index_col=0)
+    if not df_elo.empty:
+        speicher.upsert("spieler", [{"name": str(n), "elo": int(r["Elo"]), "spiele": int(r["Spiele"])}
+                                    for n, r in df_elo.iterrows()])
+    df_log = pd.read_csv(log_pfad, dtype={"Datum": str})
+    if not df_log.empty:
+        df_log = df_log.rename(columns={v: k for k, v in LOG_SPALTEN.items()})
+        zeilen = df_log[list(LOG_SPALTEN)].to_dict("records")
+        for z in zeilen:
+            for s in ("legs_a", "legs_b", "elo_a", "elo_b"):
+                z[s] = int(z[s]) if pd.notna(z[s]) else 0
+            for s in ("avg_a", "avg_b"):
+                z[s] = float(z[s])
+        speicher.insert("spiele_log", zeilen)
+
+
+def exportiere_csv(speicher, log_pfad="dart_log.csv", elo_pfad="dart_elo.csv"):
+    spieler = speicher.alle("spieler")
+    df_elo = pd.DataFrame(
+        {"Elo": [z["elo"] for z in spieler], "Spiele": [z["spiele"] for z in spieler]},
+        index=pd.Index([z["name"] for z in spieler]))
+    df_elo.to_csv(elo_pfad)
+    log = speicher.alle("spiele_log", order="id")
+    df_log = pd.DataFrame(log, columns=["id"] + list(LOG_SPALTEN)).rename(columns=LOG_SPALTEN)
+    df_log[list(LOG_SPALTEN.values())].to_csv(log_pfad, index=False)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="CSV <-> lokale SQLite-Datenbank")
+    parser.add_argument("aktion", choices=["import", "export"])
+    parser.add_argument("--db", default="elo.sqlite")
+    parser.add_argument("--log", default="dart_log.csv")
+    parser.add_argument("--elo", default="dart_elo.csv")
+    args = parser.parse_args()
+    speicher = SqliteSpeicher(args.db)
+    if args.aktion == "import":
+        importiere_csv(speicher, args.log, args.elo)
+    else:
+        exportiere_csv(speicher, args.log, args.elo)
@@ -0,0 +1,314 @@
+import threading
+from collections import OrderedDict
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+from elo_engine import START_ELO
+from messung import gemessen
+
+
+def spieltag_sortierung(x):
+    return (len(x), x)
+
+
+# ---------------------
+# ABGELEITETE WERTE
+# ---------------------
+def rating_verlauf(lang, spieler, spieltage):
+    """Rating jedes Spielers nach jedem Spieltag.
+
+    Die Matrix summiert die Elo-Deltas je (Spieltag, Spieler) und kumuliert sie in
+    Spieltag-Reihenfolge, so dass nachgetragene Spiele früherer Spieltage dort zählen,
+    wo sie hingehören. Gibt den Verlauf mit Spalte "Spieltag" und einer Spalte pro
+    Spieler zurück.
+    """
+    if lang.empty:
+        return pd.DataFrame()
+    matrix = (lang.groupby(["Datum", "Spieler"], sort=False)["Elo"].sum()
+              .unstack("Spieler").reindex(index=spieltage, columns=spieler)
+              .fillna(0).cumsum().add(START_ELO).astype(int))
+    start = pd.DataFrame([[START_ELO] * len(spieler)], columns=spieler, index=["Start"])
+    verlauf = pd.concat([start, matrix]).rename_axis("Spieltag").reset_index()
+    verlauf.columns.name = None
+    return verlauf
+
+
+def spieler_spiele(df_log):
+    """Log im Langformat: eine Zeile pro Spieler und Spiel, A- und B-Seite gestapelt.
+
+    `Zeile` ist die Position im Log, die Reihenfolge bleibt die des Logs.
+    """
+    spalten = ["Zeile", "Datum", "Spieler", "Gegner", "Legs", "Legs Gegner", "Avg", "Elo"]
+    if df_log.empty:
+        return pd.DataFrame(columns=spalten + ["Sieg"])
+    zeile = np.arange(len(df_log))
+    seiten = []
+    for eigen, fremd in (("A", "B"), ("B", "A")):
+        seiten.append(pd.DataFrame({
+            "Zeile": zeile,
+            "Datum": df_log["Datum"].astype(str).to_numpy(),
+            "Spieler": df_log[f"Spieler {eigen}"].to_numpy(),
+            "Gegner": df_log[f"Spieler {fremd}"].to_numpy(),
+            "Legs": df_log[f"Legs {eigen}"].astype(int).to_numpy(),
+            "Legs Gegner": df_log[f"Legs {fremd}"].astype(int).to_numpy(),
+            "Avg": df_log[f"Avg {eigen}"].astype(float).to_numpy(),
+            "Elo": df_log[f"Elo {eigen}"].astype(int).to_numpy(),
+        }))
+    lang = pd.concat(seiten, ignore_index=True).sort_values("Zeile", kind="stable", ignore_index=True)
+    lang["Sieg"] = lang["Legs"] > lang["Legs Gegner"]
+    return lang
+
+
+def spieler_aggregate(lang):
+    """Kennzahlen aller Spieler in einem groupby über die Langtabelle, ungerundet."""
+    if lang.empty:
+        return pd.DataFrame(columns=["spiele", "siege", "niederlagen", "siegquote", "avg", "best_avg", "leg_diff", "elo_gewinn"])
+    g = lang.assign(leg_diff=lang["Legs"] - lang["Legs Gegner"]).groupby("Spieler", sort=False)
+    agg = g.agg(spiele=("Zeile", "size"), siege=("Sieg", "sum"), avg=("Avg", "mean"), best_avg=("Avg", "max"),
+                leg_diff=("leg_diff", "sum"), elo_gewinn=("Elo", "sum"))
+    agg["siege"] = agg["siege"].astype(int)
+    agg["niederlagen"] = agg["spiele"] - agg["siege"]
+    agg["siegquote"] = agg["siege"] / agg["spiele"] * 100
+    return agg[["spiele", "siege", "niederlagen", "siegquote", "avg", "best_avg", "leg_diff", "elo_gewinn"]]
+
+
+def spieler_statistik(df_sp, agg):
+    """Bestenlisten-Einträge für alle Spieler aus `df_sp`, die schon gespielt haben."""
+    stats = {}
+    for s, r in agg.reindex([s for s in df_sp.index if s in agg.index]).iterrows():
+        stats[s] = {
+            "spiele": int(r["spiele"]), "siege": int(r["siege"]),
+            "niederlagen": int(r["niederlagen"]),
+            "siegquote": round(float(r["siegquote"]), 1),
+            "avg": round(float(r["avg"]), 2), "best_avg": round(float(r["best_avg"]), 2),
+            "elo": int(df_sp.loc[s, "Elo"])
+        }
+    return stats
+
+
+def h2h_index(lang):
+    """Direkter Vergleich aller Paare, Schlüssel ist das sortierte Namenspaar.
+
+    Pro Paar: Log-Positionen der Duelle und je Spieler Siege, Legs und Elo-Summe.
+    """
+    index = {}
+    if lang.empty:
+        return index
+    zeile = lang["Zeile"].to_numpy()
+    sieg = lang["Sieg"].to_numpy()
+    legs = lang["Legs"].to_numpy()
+    elo = lang["Elo"].to_numpy()
+    for (s, g), pos in lang.groupby(["Spieler", "Gegner"], sort=False).indices.items():
+        eintrag = index.setdefault(h2h_schluessel(s, g), {"zeilen": zeile[pos], "spieler": {}})
+        eintrag["spieler"][s] = {"siege": int(sieg[pos].sum()), "legs": int(legs[pos].sum()), "elo": int(elo[pos].sum())}
+    return index
+
+
+def h2h_schluessel(p1, p2):
+    return (p1, p2) if p1 <= p2 else (p2, p1)
+
+
+def h2h_matrix(index, spieler):
+    """Siege von Zeile gegen Spalte; Paare ohne Duell bleiben leer."""
+    matrix = pd.DataFrame(index=list(spieler), columns=list(spieler), dtype="Int64")
+    for eintrag in index.values():
+        for s, werte in eintrag["spieler"].items():
+            gegner = [g for g in eintrag["spieler"] if g != s]
+            if gegner and s in matrix.index and gegner[0] in matrix.columns:
+                matrix.loc[s, gegner[0]] = werte["siege"]
+    return matrix
+
+
+def spieltag_zusammenfassung(spiele, elo_vorher):
+    """Kennzahlen eines Spieltags aus seinen Spielen und den Ratings davor; None ohne Spiele."""
+    if spiele.empty:
+        return None
+    elo_changes = {}
+    for _, row in spiele.iterrows():
+        a, b = row["Spieler A"], row["Spieler B"]
+        elo_changes[a] = elo_changes.get(a, 0) + int(row["Elo A"])
+        elo_changes[b] = elo_changes.get(b, 0) + int(row["Elo B"])
+    sorted_elo = sorted(elo_changes.items(), key=lambda x: x[1], reverse=True)
+    avgs = []
+    for _, row in spiele.iterrows():
+        avgs.append((row["Spieler A"], float(row["Avg A"]), row["Spieler B"]))
+        avgs.append((row["Spieler B"], float(row["Avg B"]), row["Spieler A"]))
+    avgs.sort(key=lambda x: x[1], reverse=True)
+    avg_king = avgs[0] if avgs else None
+    ergebnis_str = "–"
+    if avg_king:
+        for _, row in spiele.iterrows():
+            if row["Spieler A"] == avg_king[0] and row["Spieler B"] == avg_king[2]:
+                ergebnis_str = f"{int(row['Legs A'])}:{int(row['Legs B'])}"; break
+            elif row["Spieler B"] == avg_king[0] and row["Spieler A"] == avg_king[2]:
+                ergebnis_str = f"{int(row['Legs B'])}:{int(row['Legs A'])}"; break
+    ueberraschungen = []
+    for _, row in spiele.iterrows():
+        a, b = row["Spieler A"], row["Spieler B"]
+        la, lb = int(row["Legs A"]), int(row["Legs B"])
+        if la == lb: continue
+        gew_s = a if la > lb else b
+        ver_s = b if la > lb else a
+        diff = elo_vorher.get(ver_s, START_ELO) - elo_vorher.get(gew_s, START_ELO)
+        if diff > 0:
+            ueberraschungen.append((gew_s, ver_s, diff, la, lb))
+    ueberraschungen.sort(key=lambda x: x[2], reverse=True)
+    alle_avgs = list(spiele["Avg A"].astype(float)) + list(spiele["Avg B"].astype(float))
+    return {
+        "anzahl": len(spiele),
+        "gewinner": sorted_elo[:3],
+        "verlierer": sorted_elo[-3:][::-1],
+        "avg_king": avg_king,
+        "avg_king_ergebnis": ergebnis_str,
+        "groesste_ueberraschung": ueberraschungen[0] if ueberraschungen else None,
+        "gesamtaverage": round(sum(alle_avgs) / len(alle_avgs), 2) if alle_avgs else 0,
+    }
+
+
+# ---------------------
+# FORM (LETZTE N SPIELE)
+# ---------------------
+class FormIndex:
+    """Pro Spieler die letzten `fenster` Spiele als (Position, Elo-Delta, Sieg).
+
+    Die Position zeigt in die Langtabelle von `spieler_spiele` (Seite A eines Spiels
+    an 2 * Zeile, Seite B an 2 * Zeile + 1). Aufgebaut wird je Log-Stand in einem
+    groupby über die Langtabelle. Angehängt wird bewusst nicht: der Index gehört zu
+    einem Statistik-Objekt, das Sessions teilen und das unverändert bleibt; ein neues
+    Spiel ist ein neuer Log-Stand mit eigenem Index.
+    """
+
+    def __init__(self, fenster):
+        self.fenster = fenster
+        self.letzte_spiele = {}
+
+    @classmethod
+    def aufbauen(cls, lang, fenster):
+        index = cls(fenster)
+        for s, gruppe in lang.groupby("Spieler", sort=False).tail(fenster).groupby("Spieler", sort=False):
+            index.letzte_spiele[s] = list(zip(gruppe.index.tolist(), gruppe["Elo"].tolist(), gruppe["Sieg"].tolist()))
+        return index
+
+    def letzte(self, spieler, n=None):
+        """Positionen der letzten n Spiele, älteste zuerst."""
+        return [pos for pos, _, _ in self.letzte_spiele.get(spieler, [])[-(n or self.fenster):]]
+
+    def summe(self, spieler, n):
+        return sum(elo for _, elo, _ in self.letzte_spiele.get(spieler, [])[-n:])
+
+    def serie(self, spieler, n):
+        return [sieg for _, _, sieg in self.letzte_spiele.get(spieler, [])[-n:]]
+
+
+# ---------------------
+# MEMOISIERUNG JE LOG-STAND
+# ---------------------
+class Statistik:
+    """Alle abgeleiteten Werte eines Log-Stands, jeweils beim ersten Zugriff berechnet.
+
+    Die Objekte werden zwischen Sessions geteilt: Ergebnisse nicht verändern.
+    """
+
+    def __init__(self, df_spieler, df_log_roh, replay, form_fenster=8):
+        self.df_spieler = df_spieler
+        self.df_log_roh = df_log_roh
+        self._replay = replay
+        self._spieltage = {}
+        self.form_fenster = form_fenster
+
+    @cached_property
+    def elo(self):
+        """(Ratingtabelle, Log mit Elo-Deltas) aus dem Replay."""
+        return self._replay(self.df_spieler, self.df_log_roh)
+
+    @property
+    def df_log(self):
+        return self.elo[1]
+
+    @cached_property
+    @gemessen("statistik.spieler_spiele")
+    def spieler_spiele(self):
+        return spieler_spiele(self.df_log)
+
+    @cached_property
+    @gemessen("statistik.aggregate")
+    def aggregate(self):
+        return spieler_aggregate(self.spieler_spiele)
+
+    @cached_property
+    @gemessen("statistik.spieler_statistik")
+    def spieler_statistik(self):
+        return spieler_statistik(self.elo[0], self.aggregate)
+
+    @cached_property
+    @gemessen("statistik.form")
+    def form(self):
+        return FormIndex.aufbauen(self.spieler_spiele, self.form_fenster)
+
+    @cached_property
+    @gemessen("statistik.h2h")
+    def h2h(self):
+        return h2h_index(self.spieler_spiele)
+
+    def duell(self, p1, p2):
+        """Eintrag des Paars aus dem Index, None ohne gemeinsames Spiel."""
+        return self.h2h.get(h2h_schluessel(p1, p2))
+
+    def letzte_paarungen(self, anzahl_spieltage):
+        """Wie oft sich jedes Paar (sortiert) in den letzten Spieltagen begegnet ist."""
+        paare = {}
+        for tag in self.spieltage[-anzahl_spieltage:] if anzahl_spieltage > 0 else []:
+            spiele = self.df_log.iloc[self._spieltag_zeilen[tag]]
+            for a, b in zip(spiele["Spieler A"], spiele["Spieler B"]):
+                paar = h2h_schluessel(a, b)
+                paare[paar] = paare.get(paar, 0) + 1
+        return paare
+
+    @cached_property
+    def spieltage(self):
+        return sorted(self.df_log["Datum"].astype(str).unique(), key=spieltag_sortierung)
+
+    @cached_property
+    def _spieltag_zeilen(self):
+        return self.df_log.groupby(self.df_log["Datum"].astype(str)).indices
+
+    @cached_property
+    @gemessen("statistik.rating_verlauf")
+    def verlauf(self):
+        """Dichte Matrix Spieltag × Spieler (erste Zeile "Start")."""
+        spieler = pd.concat([self.df_log["Spieler A"], self.df_log["Spieler B"]]).unique()
+        return rating_verlauf(self.spieler_spiele, spieler, self.spieltage)
+
+    def spieltag(self, spieltag_nr):
+        key = str(spieltag_nr)
+        if key not in self._spieltage:
+            spiele = self.df_log.iloc[self._spieltag_zeilen.get(key, [])]
+            vorher = {}
+            if key in self.spieltage:
+                # Zeile davor in der Matrix: Stand nach dem vorherigen Spieltag bzw. "Start"
+                vorher = self.verlauf.iloc[self.spieltage.index(key)].drop("Spieltag").to_dict()
+            self._spieltage[key] = spieltag_zusammenfassung(spiele, vorher)
+        return self._spieltage[key]
+
+
+class StatistikCache:
+    """Prozessweiter LRU-Cache von `Statistik`-Objekten, Schlüssel ist die Log-Version."""
+
+    def __init__(self, max_eintraege=4):
+        self.max_eintraege = max_eintraege
+        self.eintraege = OrderedDict()
+        self.lock = threading.Lock()
+
+    def holen(self, schluessel, bauen):
+        with self.lock:
+            if schluessel in self.eintraege:
+                self.eintraege.move_to_end(schluessel)
+                return self.eintraege[schluessel]
+        stat = bauen()
+        with self.lock:
+            self.eintraege[schluessel] = stat
+            self.eintraege.move_to_end(schluessel)
+            while len(self.eintraege) > self.max_eintraege:
+                self.eintraege.popitem(last=False)
+        return stat
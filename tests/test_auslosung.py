@@ -0,0 +1,130 @@
+import pytest
+
+import auslosung
+from elo_engine import START_ELO
+
+
+def liga(n, gegner, seed):
+    paarungen, _ = auslosung.auslosen([f"S{i}" for i in range(n)], gegner, seed=seed)
+    return auslosung.spiele_aus_paarungen(paarungen)
+
+
+def pruefe_paarungen(paarungen, extra, spieler, gegner):
+    assert set(paarungen) == set(spieler)
+    for s, gegner_set in paarungen.items():
+        assert s not in gegner_set
+        assert all(s in paarungen[g] for g in gegner_set)
+        assert len(gegner_set) == gegner + (s == extra)
+    assert (extra is not None) == (len(spieler) * gegner % 2 == 1)
+
+
+@pytest.mark.parametrize("n", [4, 5, 7, 10, 15, 21, 30])
+@pytest.mark.parametrize("gegner", [2, 3, 4, 5])
+def test_auslosen_gegneranzahl(n, gegner):
+    spieler = [f"S{i}" for i in range(n)]
+    paarungen, extra = auslosung.auslosen(spieler, gegner, seed=n * gegner)
+    if n < gegner + 1:
+        assert (paarungen, extra) == (None, None)
+    else:
+        pruefe_paarungen(paarungen, extra, spieler, gegner)
+
+
+def test_auslosen_seedbar():
+    spieler = [f"S{i}" for i in range(12)]
+    assert auslosung.auslosen(spieler, 3, seed=5) == auslosung.auslosen(spieler, 3, seed=5)
+    assert auslosung.auslosen(spieler, 3, seed=5) != auslosung.auslosen(spieler, 3, seed=6)
+
+
+def back_to_backs(spiele, runden):
+    belegt = {}
+    for r, runde in enumerate(runden):
+        for i in runde:
+            for p in spiele[i]:
+                belegt.setdefault(p, set()).add(r)
+    return sum(1 for rs in belegt.values() for r in rs if r + 1 in rs)
+
+
+def untergrenze(spiele, bretter):
+    grad = {}
+    for spiel in spiele:
+        for p in spiel:
+            grad[p] = grad.get(p, 0) + 1
+    return max(-(-len(spiele) // bretter), max(grad.values()))
+
+
+def pruefen(spiele, runden, bretter):
+    assert sorted(i for runde in runden for i in runde) == list(range(len(spiele)))
+    for runde in runden:
+        assert 0 < len(runde) <= bretter
+        spieler = [p for i in runde for p in spiele[i]]
+        assert len(spieler) == len(set(spieler))
+
+
+@pytest.mark.parametrize("n, gegner, bretter", [(6, 3, 1), (9, 4, 2), (15, 3, 4), (20, 5, 3), (30, 4, 2)])
+@pytest.mark.parametrize("seed", range(3))
+def test_runden_gueltig(n, gegner, bretter, seed):
+    spiele = liga(n, gegner, seed)
+    pruefen(spiele, auslosung.runden_planen(spiele, bretter, seed=seed), bretter)
+
+
+@pytest.mark.parametrize("n, gegner", [(10, 2), (11, 4), (12, 3)])
+@pytest.mark.parametrize("seed", range(5))
+def test_keine_back_to_backs_bei_kleinster_rundenzahl(n, gegner, seed):
+    spiele = liga(n, gegner, seed)
+    runden = auslosung.runden_planen(spiele, 2, seed=seed)
+    pruefen(spiele, runden, 2)
+    assert len(runden) == untergrenze(spiele, 2)
+    assert back_to_backs(spiele, runden) == 0
+
+
+@pytest.mark.parametrize("n, gegner, bretter", [(13, 5, 3), (20, 4, 3), (25, 5, 4), (30, 3, 1)])
+def test_keine_back_to_backs_in_engen_plaenen(n, gegner, bretter):
+    spiele = liga(n, gegner, 0)
+    runden = auslosung.runden_planen(spiele, bretter, seed=0)
+    pruefen(spiele, runden, bretter)
+    assert len(runden) == untergrenze(spiele, bretter)
+    assert back_to_backs(spiele, runden) == 0
+
+
+def test_back_to_backs_nur_wenn_unvermeidbar():
+    # 4 Spieler, jeder gegen jeden, 2 Boards: in jeder Runde spielen alle
+    spiele = liga(4, 3, 0)
+    runden = auslosung.runden_planen(spiele, 2, seed=0)
+    pruefen(spiele, runden, 2)
+    assert len(runden) == 3
+
+
+@pytest.mark.parametrize("n, gegner, bretter", [(4, 3, 2), (20, 4, 10), (30, 5, 16)])
+def test_unvermeidbare_back_to_backs_ohne_suche(n, gegner, bretter, monkeypatch):
+    def suche(*args):
+        raise AssertionError("Backtracking trotz unmöglichem Plan")
+
+    monkeypatch.setattr(auslosung, "_ohne_pausen_versuch", suche)
+    spiele = liga(n, gegner, 0)
+    runden = auslosung.runden_planen(spiele, bretter, seed=0)
+    pruefen(spiele, runden, bretter)
+    assert back_to_backs(spiele, runden) > 0
+
+
+def test_runden_planen_seedbar():
+    spiele = liga(16, 4, 1)
+    assert auslosung.runden_planen(spiele, 3, seed=7) == auslosung.runden_planen(spiele, 3, seed=7)
+
+
+def test_reihenfolge_ohne_direkte_wiederholung():
+    paarungen, _ = auslosung.auslosen([f"S{i}" for i in range(10)], 2, seed=0)
+    spielplan, reihenfolge = auslosung.erstelle_spielplan(paarungen, bretter=2, seed=0)
+    assert sorted(reihenfolge) == list(range(len(spielplan)))
+    for i, j in zip(reihenfolge, reihenfolge[1:]):
+        assert not set(spielplan[i][:2]) & set(spielplan[j][:2])
+
+
+def test_elo_auslosung_gegneranzahl():
+    spieler = [f"S{i}" for i in range(15)]
+    elo = {s: 900 + 15 * i for i, s in enumerate(spieler[:-3])}
+    paarungen, extra = auslosung.auslosen(spieler, 3, seed=2, elo=elo)
+    pruefe_paarungen(paarungen, extra, spieler, 3)
+
+
+def test_unbekannte_spieler_zaehlen_mit_start_elo():
+    assert auslosung.elo_abstaende({"A": {"B"}, "B": {"A"}}, {"A": START_ELO}) == [0]
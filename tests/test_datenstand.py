@@ -0,0 +1,262 @@
+import threading
+
+import pytest
+
+from datenstand import AenderungsFeed, DatenStand
+from speicher import SqliteSpeicher, VeralteterStand
+
+
+@pytest.fixture
+def zwei(tmp_path):
+    """Zwei Prozesse auf derselben SQLite-Datei, jeder mit eigener Verbindung."""
+    pfad = str(tmp_path / "elo.sqlite")
+    return (DatenStand(SqliteSpeicher(pfad), pruef_intervall=0),
+            DatenStand(SqliteSpeicher(pfad), pruef_intervall=0))
+
+
+def spieler(name, elo):
+    return {"name": name, "elo": elo, "spiele": 0}
+
+
+def test_fremde_aenderung_nach_eigenem_schreiben(zwei):
+    a, b = zwei
+    a.upsert("spieler", [spieler("X", 1000)], 100)
+    assert a.spieler().loc["X", "Elo"] == 1000
+    a.upsert("spieler", [spieler("Y", 1000)], 100)
+    b.upsert("spieler", [spieler("X", 1200)], 100)
+    assert a.spieler().loc["X", "Elo"] == 1200
+    assert a.spieler().loc["X", "Elo"] == 1200
+
+
+def test_fremde_aenderung_nach_eigenem_loeschen(zwei):
+    a, b = zwei
+    a.upsert("spieler", [spieler("X", 1000), spieler("Y", 1000)], 100)
+    a.spieler()
+    a.loesche("spieler", "Y")
+    b.upsert("spieler", [spieler("X", 1200)], 100)
+    assert a.spieler().loc["X", "Elo"] == 1200
+
+
+def test_fremde_aenderung_an_einzeiligen_tabellen(zwei):
+    a, b = zwei
+    a.upsert("aktiver_spielplan", [{"id": 1, "spieltag": "1", "ergebnisse": {}}], 100)
+    assert a.spielplan()["spieltag"] == "1"
+    b.update("aktiver_spielplan", 1, {"ergebnisse": {"0": [3, 1, 50, 50]}})
+    assert a.spielplan()["ergebnisse"] == {"0": [3, 1, 50, 50]}
+
+
+@pytest.mark.parametrize("leer_geladen", [False, True])
+def test_log_delta_sync_mit_fremden_schreibern(zwei, leer_geladen):
+    a, b = zwei
+    zeile = {"datum": "1", "spieler_a": "X", "spieler_b": "Y", "legs_a": 3, "legs_b": 1,
+             "avg_a": 50.0, "avg_b": 45.0, "elo_a": 0, "elo_b": 0}
+    if leer_geladen:
+        # neue Liga: A kennt das Log nur leer und aus den eigenen Inserts
+        assert a.log().empty
+    a.insert("spiele_log", [zeile, zeile], 100)
+    assert len(a.log()) == 2
+    neu = b.insert("spiele_log", [zeile], 100)
+    b.update("spiele_log", 1, {"legs_a": 0, "legs_b": 3})
+    b.loesche("spiele_log", 2)
+    log = a.log()
+    assert len(log) == 2
+    assert log["Legs A"].tolist() == [0, 3]
+    assert neu[0]["id"] == 3
+
+
+def test_upsert_vergleicht_nicht_gegen_veralteten_stand(tmp_path):
+    pfad = str(tmp_path / "elo.sqlite")
+    a = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    b = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    a.upsert("spieler", [spieler("X", 1000)], 100)
+    a.spieler()
+    b.upsert("spieler", [spieler("X", 1200)], 100)
+    # A hält noch X=1000 und schreibt genau das zurück (z. B. Neuberechnung): muss in der DB landen
+    a.upsert("spieler", [spieler("X", 1000)], 100)
+    assert SqliteSpeicher(pfad).zeile("spieler", "X")["elo"] == 1000
+    assert a.spieler().loc["X", "Elo"] == 1000
+
+
+def test_log_upsert_vergleicht_nicht_gegen_veralteten_stand(tmp_path):
+    pfad = str(tmp_path / "elo.sqlite")
+    a = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    b = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    zeile = {"datum": "1", "spieler_a": "X", "spieler_b": "Y", "legs_a": 3, "legs_b": 1,
+             "avg_a": 50.0, "avg_b": 45.0, "elo_a": 14, "elo_b": -14}
+    a.insert("spiele_log", [zeile], 100)
+    a.log()
+    b.update("spiele_log", 1, {"elo_a": 99})
+    assert a.upsert("spiele_log", [{"id": 1, **zeile}], 100) == 1
+    assert SqliteSpeicher(pfad).zeile("spiele_log", 1)["elo_a"] == 14
+
+
+def test_log_zurueckschreiben_legt_geloeschte_nicht_neu_an(zwei):
+    a, b = zwei
+    zeile = {"datum": "1", "spieler_a": "X", "spieler_b": "Y", "legs_a": 3, "legs_b": 1,
+             "avg_a": 50.0, "avg_b": 45.0, "elo_a": 0, "elo_b": 0}
+    a.insert("spiele_log", [zeile, zeile], 100)
+    a.log()
+    b.loesche("spiele_log", 2)
+    # A schreibt den vorher gelesenen Stand mit neu berechneten Deltas zurück
+    a.upsert("spiele_log", [{"id": i, **zeile, "elo_a": 14, "elo_b": -14} for i in (1, 2)], 100, nur_vorhandene=True)
+    assert b.speicher.schluessel("spiele_log") == [1]
+    assert a.log()["id"].tolist() == [1]
+    assert a.log()["Elo A"].tolist() == [14]
+
+
+def turnier(version=0):
+    return {"id": 1, "name": "T", "status": "gruppen", "config": {}, "gruppen": {},
+            "gruppen_spiele": [{"nr": i, "ergebnis": None} for i in range(3)], "ko_spiele": [],
+            "qualifizierte": [], "version": version}
+
+
+def test_patche_versionskonflikt(zwei):
+    a, b = zwei
+    a.upsert("turniere", [turnier()], 100)
+    b.patche("turniere", 1, 0, {"gruppen_spiele": {1: {"nr": 1, "ergebnis": "3:1"}}}, {})
+    with pytest.raises(VeralteterStand):
+        a.patche("turniere", 1, 0, {"gruppen_spiele": {2: {"nr": 2, "ergebnis": "0:3"}}}, {})
+    a.patche("turniere", 1, 1, {"gruppen_spiele": {2: {"nr": 2, "ergebnis": "0:3"}}}, {})
+    assert [sp["ergebnis"] for sp in b.turnier()["gruppen_spiele"]] == [None, "3:1", "0:3"]
+
+
+def test_patche_backendfehler_verwirft_stand(tmp_path):
+    class Wackelig(SqliteSpeicher):
+        def patche(self, tabelle, id, version, elemente, werte):
+            raise ConnectionError("weg")
+
+    ds = DatenStand(Wackelig(str(tmp_path / "elo.sqlite")), pruef_intervall=0)
+    ds.upsert("turniere", [turnier()], 100)
+    ds.turnier()
+    with pytest.raises(ConnectionError):
+        ds.patche("turniere", 1, 0, {}, {"status": "ko"})
+    assert "turniere" not in ds._zeilen
+
+
+def plan():
+    return {"id": 1, "spieltag": "1", "ergebnisse": {}, "locked": []}
+
+
+def ergebnis_setzen(ds, idx, ergebnis, versuche=3):
+    # wie basis.speichere_ergebnis_db: Versionsprüfung, bei Konflikt mit neu geladenem Stand
+    for versuch in range(versuche):
+        zeile = ds.spielplan()
+        try:
+            ds.patche("aktiver_spielplan", 1, zeile["version"], {"ergebnisse": {str(idx): ergebnis}},
+                      {"locked": zeile["locked"] + [idx]})
+            return versuch
+        except VeralteterStand:
+            pass
+    raise VeralteterStand
+
+
+def test_ergebnis_patch_mischt_fremde_ergebnisse(tmp_path):
+    pfad = str(tmp_path / "elo.sqlite")
+    a = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    b = DatenStand(SqliteSpeicher(pfad), pruef_intervall=3600)
+    a.upsert("aktiver_spielplan", [plan()], 100)
+    a.invalidieren()
+    assert a.spielplan()["version"] == b.spielplan()["version"] == 0
+    assert ergebnis_setzen(a, 0, "3:1") == 0
+    # B hat noch Version 0 im Speicher: ein Konflikt, dann mit frischem Stand
+    assert ergebnis_setzen(b, 1, "0:3") == 1
+    neu = DatenStand(SqliteSpeicher(pfad)).spielplan()
+    assert neu["ergebnisse"] == {"0": "3:1", "1": "0:3"}
+    assert sorted(neu["locked"]) == [0, 1]
+    assert neu["version"] == 2
+
+
+def test_ergebnis_patch_ohne_pruefung_der_marke(tmp_path):
+    class Zaehlend(SqliteSpeicher):
+        marken = 0
+
+        def marke(self, tabelle):
+            self.marken += 1
+            return super().marke(tabelle)
+
+    ds = DatenStand(Zaehlend(str(tmp_path / "elo.sqlite")), pruef_intervall=3600)
+    ds.upsert("aktiver_spielplan", [plan()], 100)
+    ds.invalidieren()
+    ds.spielplan()
+    vorher = ds.speicher.marken
+    for i in range(5):
+        ergebnis_setzen(ds, i, "3:0")
+    assert ds.speicher.marken == vorher
+
+
+def test_neu_laden_ohne_aenderung_behaelt_version(tmp_path):
+    class EigeneWritesZaehlen(SqliteSpeicher):
+        # wie der Supabase-Zähler: die Marke bewegt sich bei jeder Prüfung
+        zaehler = 0
+
+        def marke(self, tabelle):
+            self.zaehler += 1
+            return self.zaehler
+
+    ds = DatenStand(EigeneWritesZaehlen(str(tmp_path / "elo.sqlite")), pruef_intervall=0)
+    ds.upsert("aktiver_spielplan", [plan()], 100)
+    ds.invalidieren()
+    ergebnis_setzen(ds, 0, "3:1")
+    v = ds.versions_schluessel("aktiver_spielplan")
+    assert ds.versions_schluessel("aktiver_spielplan") == v
+    ds.speicher.patche("aktiver_spielplan", 1, 1, {"ergebnisse": {"1": "0:3"}}, {})
+    assert ds.versions_schluessel("aktiver_spielplan") != v
+
+
+def test_ergebnis_patch_aus_mehreren_threads(tmp_path):
+    ds = DatenStand(SqliteSpeicher(str(tmp_path / "elo.sqlite")), pruef_intervall=3600)
+    ds.upsert("aktiver_spielplan", [plan()], 100)
+    ds.invalidieren()
+
+    def setzen(i):
+        with ds.lock:
+            ergebnis_setzen(ds, i, f"{i}:0")
+
+    threads = [threading.Thread(target=setzen, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert ds.spielplan()["ergebnisse"] == {str(i): f"{i}:0" for i in range(8)}
+    assert ds.spielplan()["version"] == 8
+
+
+def test_feed_liefert_nur_neue_aenderungen():
+    feed = AenderungsFeed(laenge=3)
+    feed.zuruecksetzen(stand=1)
+    v0 = feed.version
+    feed.melden("a", stand=2)
+    feed.melden("b", stand=3)
+    assert feed.seit(v0) == (v0 + 2, ["a", "b"])
+    assert feed.seit(v0 + 1) == (v0 + 2, ["b"])
+    assert feed.seit(v0 + 2) == (v0 + 2, [])
+
+
+def test_feed_verlangt_neu_lesen():
+    feed = AenderungsFeed(laenge=2)
+    v0 = feed.version
+    for x in "abc":
+        feed.melden(x, stand=1)
+    # aus dem Ringpuffer gefallen
+    assert feed.seit(v0)[1] is None
+    feed.abgleichen(stand=99)  # fremde Änderung am DatenStand
+    assert feed.seit(v0 + 3)[1] is None
+    v = feed.version
+    feed.abgleichen(stand=99)
+    assert feed.seit(v) == (v, [])
+
+
+def test_feed_nach_fremder_aenderung(zwei):
+    a, b = zwei
+    feed = AenderungsFeed()
+    a.upsert("aktiver_spielplan", [plan()], 100)
+    a.invalidieren()
+    feed.zuruecksetzen(a.versions_schluessel("aktiver_spielplan")[0])
+    v = feed.version
+    ergebnis_setzen(a, 0, "3:1")
+    feed.melden({"idx": 0}, a.versionen["aktiver_spielplan"])
+    feed.abgleichen(a.versions_schluessel("aktiver_spielplan")[0])
+    assert feed.seit(v) == (v + 1, [{"idx": 0}])
+    ergebnis_setzen(b, 1, "0:3")
+    feed.abgleichen(a.versions_schluessel("aktiver_spielplan")[0])
+    assert feed.seit(v + 1)[1] is None
@@ -0,0 +1,139 @@
+import random
+import pandas as pd
+import pytest
+
+import basis
+import elo_engine
+from datenstand import DatenStand
+from elo_engine import K_FAKTOR, START_ELO
+from speicher import SqliteSpeicher
+
+
+def alter_elo_kern(df_spieler, df_log):
+    """Die zeilenweise Schleife aus dart1.py vor der Engine, als Referenz."""
+    df = df_spieler.copy()
+    alle = pd.concat([df.index.to_series(), df_log["Spieler A"], df_log["Spieler B"]]).dropna().unique()
+    for s in alle:
+        if s not in df.index:
+            df.loc[s] = {"Elo": START_ELO, "Spiele": 0}
+    df["Elo"] = START_ELO
+    df["Spiele"] = 0
+    df_log = df_log.copy()
+    for i, row in df_log.iterrows():
+        a, b = row["Spieler A"], row["Spieler B"]
+        la, lb = int(row["Legs A"]), int(row["Legs B"])
+        avga, avgb = float(row["Avg A"]), float(row["Avg B"])
+        ea, eb = df.loc[a, "Elo"], df.loc[b, "Elo"]
+        exp_a = elo_engine.erwartung(ea, eb)
+        exp_b = elo_engine.erwartung(eb, ea)
+        sa = 1 if la > lb else 0
+        sb_val = 1 - sa
+        G = 1 + abs(la - lb) / 10
+        D = min(1.3, 1 + abs(ea - eb) / 1200)
+        M_a = 1 + 0.3*(avga-50)/50 if sa==1 else 1 - 0.3*(avga-50)/50
+        M_b = 1 + 0.3*(avgb-50)/50 if sb_val==1 else 1 - 0.3*(avgb-50)/50
+        delta_a = K_FAKTOR * G * D * (sa - exp_a) * M_a
+        delta_b = K_FAKTOR * G * D * (sb_val - exp_b) * M_b
+        df.loc[a, "Elo"] = round(ea + delta_a)
+        df.loc[b, "Elo"] = round(eb + delta_b)
+        df_log.at[i, "Elo A"] = round(delta_a)
+        df_log.at[i, "Elo B"] = round(delta_b)
+        df.loc[a, "Spiele"] += 1
+        df.loc[b, "Spiele"] += 1
+    return df, df_log
+
+
+def zufallsliga(seed, spieler=10, spiele=150, bekannt=6, ohne_spiele=3):
+    """Log mit Spielern, die nicht in der Spielertabelle stehen, und Tabelle mit Spielern ohne Spiel."""
+    rng = random.Random(seed)
+    namen = [f"S{i}" for i in range(spieler)]
+    zeilen = []
+    for i in range(spiele):
+        a, b = rng.sample(namen, 2)
+        sieger, verlierer = 3, rng.randint(0, 2)
+        la, lb = (sieger, verlierer) if rng.random() < 0.5 else (verlierer, sieger)
+        zeilen.append({"Datum": str(1 + i // 15), "Spieler A": a, "Spieler B": b, "Legs A": la, "Legs B": lb,
+                       "Avg A": round(rng.uniform(25, 80), 2), "Avg B": round(rng.uniform(25, 80), 2),
+                       "Elo A": 0, "Elo B": 0})
+    tabelle = namen[:bekannt] + [f"Pause{i}" for i in range(ohne_spiele)]
+    df_spieler = pd.DataFrame({"Elo": [rng.randint(800, 1200) for _ in tabelle], "Spiele": 7}, index=tabelle)
+    return df_spieler, pd.DataFrame(zeilen)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_wie_alte_schleife(seed):
+    df_spieler, df_log = zufallsliga(seed)
+    alt, alt_log = alter_elo_kern(df_spieler, df_log)
+    neu, neu_log = elo_engine.replay(df_spieler, df_log)
+    assert sorted(neu.index) == sorted(alt.index)
+    assert neu.loc[alt.index, "Elo"].astype(int).tolist() == alt["Elo"].astype(int).tolist()
+    assert neu.loc[alt.index, "Spiele"].astype(int).tolist() == alt["Spiele"].astype(int).tolist()
+    assert neu_log["Elo A"].astype(int).tolist() == alt_log["Elo A"].astype(int).tolist()
+    assert neu_log["Elo B"].astype(int).tolist() == alt_log["Elo B"].astype(int).tolist()
+
+
+def test_spieler_ohne_spiele_bleiben_auf_start_elo():
+    df_spieler, df_log = zufallsliga(0)
+    neu, _ = elo_engine.replay(df_spieler, df_log)
+    pause = [s for s in neu.index if s.startswith("Pause")]
+    assert len(pause) == 3
+    assert (neu.loc[pause, "Elo"] == START_ELO).all()
+    assert (neu.loc[pause, "Spiele"] == 0).all()
+
+
+def test_leeres_log():
+    df_spieler, df_log = zufallsliga(0, spiele=0)
+    df_log = pd.DataFrame(columns=["Datum", "Spieler A", "Spieler B", "Legs A", "Legs B", "Avg A", "Avg B", "Elo A", "Elo B"])
+    neu, neu_log = elo_engine.replay(df_spieler, df_log)
+    assert (neu["Elo"] == START_ELO).all() and (neu["Spiele"] == 0).all()
+    assert neu_log.empty
+
+
+def test_replay_suffix_wie_komplettes_replay():
+    df_spieler, df_log = zufallsliga(1)
+    # wie in der App: das gespeicherte Log trägt die Deltas des letzten Replays
+    _, gespeichert, checkpoints = elo_engine.replay_mit_checkpoints(df_spieler, df_log)
+    geaendert = gespeichert.copy()
+    geaendert.loc[100, ["Legs A", "Legs B"]] = geaendert.loc[100, ["Legs B", "Legs A"]].to_numpy()
+    geaendert = geaendert.drop(index=120).reset_index(drop=True)
+    df, df_log_neu, _, ab = elo_engine.replay_suffix(checkpoints, df_spieler, geaendert)
+    voll, voll_log = elo_engine.replay(df_spieler, geaendert)
+    assert 0 < ab <= 100
+    assert df.loc[voll.index, "Elo"].tolist() == voll["Elo"].tolist()
+    assert df_log_neu["Elo A"].tolist() == voll_log["Elo A"].tolist()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_spiele_einzeln_anhaengen_wie_replay(seed):
+    df_spieler, df_log = zufallsliga(seed)
+    # gespeicherter Stand nach den ersten 60 Spielen, danach kommt jedes Spiel einzeln dazu
+    stand, _ = elo_engine.replay(df_spieler, df_log.iloc[:60])
+    zustand = elo_engine.zustand_aus_spielern(stand)
+    deltas = []
+    for i in range(60, len(df_log)):
+        neu = df_log.iloc[i:i + 1]
+        da, db = elo_engine.spiele_anhaengen(zustand, neu["Spieler A"], neu["Spieler B"], *elo_engine.log_spalten(neu))
+        deltas.append((int(da[0]), int(db[0])))
+    voll, voll_log = elo_engine.replay(df_spieler, df_log)
+    df = zustand.als_dataframe()
+    assert sorted(df.index) == sorted(voll.index)
+    assert df.loc[voll.index, "Elo"].tolist() == voll["Elo"].astype(int).tolist()
+    assert df.loc[voll.index, "Spiele"].tolist() == voll["Spiele"].astype(int).tolist()
+    assert deltas == list(zip(voll_log["Elo A"].iloc[60:].astype(int), voll_log["Elo B"].iloc[60:].astype(int)))
+
+
+def test_spieltage_als_block_wie_replay(tmp_path, monkeypatch):
+    ds = DatenStand(SqliteSpeicher(str(tmp_path / "elo.sqlite")), pruef_intervall=0)
+    monkeypatch.setattr(basis, "get_datenstand", lambda: ds)
+    _, df_log = zufallsliga(2)
+    # je Spieltag ein Block, in dem dieselben Spieler mehrmals spielen
+    for tag, spiele in df_log.groupby("Datum", sort=False):
+        basis.log_spieltag(tag, spiele[["Spieler A", "Spieler B", "Legs A", "Legs B", "Avg A", "Avg B"]].values.tolist())
+    gespeichert, log = basis.lade_spieler(), basis.lade_log()
+    assert len(log) == len(df_log)
+    voll, voll_log = elo_engine.replay(gespeichert.iloc[:0], log)
+    assert sorted(gespeichert.index) == sorted(voll.index)
+    assert gespeichert.loc[voll.index, "Elo"].astype(int).tolist() == voll["Elo"].astype(int).tolist()
+    assert gespeichert.loc[voll.index, "Spiele"].astype(int).tolist() == voll["Spiele"].astype(int).tolist()
+    assert log["Elo A"].astype(int).tolist() == voll_log["Elo A"].astype(int).tolist()
+    assert log["Elo B"].astype(int).tolist() == voll_log["Elo B"].astype(int).tolist()
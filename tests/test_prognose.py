@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+import prognose
+from elo_engine import START_ELO
+
+
+def test_unbekannte_spieler_starten_mit_start_elo():
+    p = prognose.sieg_wahrscheinlichkeiten([("Neu", "Alt"), ("Alt", "Stark")], {"Alt": START_ELO, "Stark": START_ELO + 200})
+    assert p[0] == 0.5
+    assert p[1] < 0.5
+
+
+def test_spieltag_prognose_mit_neuem_spieler():
+    df_spieler = pd.DataFrame({"Elo": [START_ELO + 100, START_ELO - 100], "Spiele": [10, 10]},
+                              index=pd.Index(["A", "B"], name="Spieler"))
+    spiele = [("A", "Neu"), ("Neu", "B"), ("A", "B")]
+    p_sieg, tabelle = prognose.spieltag_prognose(spiele, df_spieler, {}, np.array([[3, 1]]), simulationen=200, seed=1)
+    assert tabelle.loc["Neu", "Elo"] == START_ELO
+    assert p_sieg[0] > 0.5 and p_sieg[1] > 0.5
+    assert sorted(tabelle.index) == ["A", "B", "Neu"]
@@ -0,0 +1,142 @@
+import pytest
+
+from speicher import SupabaseSpeicher
+
+
+class APIError(Exception):
+    """Wie postgrest.exceptions.APIError: Fehlercode als Attribut."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+class Antwort:
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+class Abfrage:
+    """Nimmt jede Builder-Methode an; `execute` fragt den Test nach der Antwort."""
+
+    def __init__(self, client, ziel):
+        self.client = client
+        self.ziel = ziel
+        self.aufrufe = []
+
+    def __getattr__(self, name):
+        def aufruf(*args, **kwargs):
+            self.aufrufe.append((name, args))
+            return self
+        return aufruf
+
+    def execute(self):
+        self.client.ausgefuehrt.append(self)
+        antwort = self.client.antworten(self)
+        if isinstance(antwort, Exception):
+            raise antwort
+        return antwort
+
+
+class Client:
+    def __init__(self, antworten):
+        self.antworten = antworten
+        self.ausgefuehrt = []
+
+    def table(self, name):
+        return Abfrage(self, name)
+
+    def rpc(self, name, params):
+        return Abfrage(self, "rpc " + name)
+
+
+def supabase(antworten):
+    return SupabaseSpeicher(client=Client(antworten))
+
+
+def test_marke_aus_aenderungszaehler():
+    sp = supabase(lambda q: Antwort([{"zaehler": 7}]))
+    assert sp.marke("spieler") == 7
+    q = sp.sb.ausgefuehrt[-1]
+    assert q.ziel == "aenderungen" and ("eq", ("tabelle", "spieler")) in q.aufrufe
+
+
+def test_marke_ohne_zaehlertabelle():
+    sp = supabase(lambda q: APIError("42P01"))
+    assert sp.marke("spieler") is None
+    assert sp.marke("turniere") is None
+    assert len(sp.sb.ausgefuehrt) == 1
+
+
+def test_marke_netzwerkfehler_wird_nicht_gemerkt():
+    fehler = [ConnectionError("weg")]
+    sp = supabase(lambda q: fehler.pop() if fehler else Antwort([{"zaehler": 3}]))
+    with pytest.raises(ConnectionError):
+        sp.marke("spieler")
+    assert sp.marke("spieler") == 3
+
+
+def test_unvollstaendiges_backend_scheitert_beim_anlegen():
+    from speicher import Speicher
+
+    class OhneLoeschen(Speicher):
+        def alle(self, tabelle, order=None): return []
+        def zeile(self, tabelle, id): return None
+        def upsert(self, tabelle, zeilen): pass
+        def insert(self, tabelle, zeilen): return zeilen
+        def update(self, tabelle, id, werte, version=None): return True
+
+    with pytest.raises(TypeError, match="loesche"):
+        OhneLoeschen()
+
+
+def test_delta_mit_geaendert():
+    sp = supabase(lambda q: Antwort([{"id": 5}]))
+    assert sp.delta("spiele_log", 4, seit="2026-01-01") == [{"id": 5}]
+    assert any(name == "or_" for name, _ in sp.sb.ausgefuehrt[-1].aufrufe)
+
+
+def test_delta_ohne_spalte_geaendert():
+    sp = supabase(lambda q: APIError("42703") if any(n == "or_" for n, _ in q.aufrufe) else Antwort([{"id": 5}]))
+    assert sp.delta("spiele_log", 4, seit="2026-01-01") == [{"id": 5}]
+    assert not sp.mit_geaendert
+    sp.delta("spiele_log", 4, seit="2026-01-01")
+    assert not any(n == "or_" for n, _ in sp.sb.ausgefuehrt[-1].aufrufe)
+
+
+def test_delta_netzwerkfehler_schaltet_nichts_ab():
+    fehler = [APIError("503")]
+    sp = supabase(lambda q: fehler.pop() if fehler else Antwort([]))
+    with pytest.raises(APIError):
+        sp.delta("spiele_log", 4, seit="2026-01-01")
+    assert sp.mit_geaendert
+
+
+def test_patche_per_rpc():
+    sp = supabase(lambda q: Antwort([{"id": 1}]))
+    assert sp.patche("turniere", 1, 3, {"ko_spiele": {2: {"a": 1}}}, {}) is True
+    assert sp.sb.ausgefuehrt[-1].ziel == "rpc patche_turnier"
+    assert sp.patche("aktiver_spielplan", 1, 0, {"ergebnisse": {"4": "3:1"}}, {"locked": [4]}) is True
+    assert sp.sb.ausgefuehrt[-1].ziel == "rpc patche_spielplan"
+    assert sp.patche("spieler", 1, 0, {}, {"elo": 1000}) is None
+    sp = supabase(lambda q: Antwort([]))
+    assert sp.patche("turniere", 1, 3, {"ko_spiele": {2: {"a": 1}}}, {}) is False
+
+
+def test_patche_ohne_funktion():
+    sp = supabase(lambda q: APIError("PGRST202"))
+    assert sp.patche("turniere", 1, 3, {}, {"status": "ko"}) is None
+    assert sp.patche("turniere", 1, 3, {}, {"status": "ko"}) is None
+    assert len(sp.sb.ausgefuehrt) == 1
+    # die Funktion fehlt je Tabelle
+    assert sp.patche("aktiver_spielplan", 1, 0, {}, {"locked": []}) is None
+    assert len(sp.sb.ausgefuehrt) == 2
+
+
+def test_patche_netzwerkfehler_schaltet_nichts_ab():
+    fehler = [APIError("503")]
+    sp = supabase(lambda q: fehler.pop() if fehler else Antwort([{"id": 1}]))
+    with pytest.raises(APIError):
+        sp.patche("turniere", 1, 3, {}, {"status": "ko"})
+    assert sp.patche("turniere", 1, 3, {}, {"status": "ko"}) is True
@@ -0,0 +1,152 @@
+import pandas as pd
+import pytest
+
+import statistik
+from benchmark.liga import liga
+from elo_engine import START_ELO
+
+
+def alter_elo_verlauf(df_log):
+    """berechne_elo_verlauf aus dart1.py vor dem kumulierten Durchlauf, als Referenz."""
+    if df_log.empty:
+        return pd.DataFrame()
+    alle_spieler = pd.concat([df_log["Spieler A"], df_log["Spieler B"]]).unique()
+    spieltage = sorted(df_log["Datum"].astype(str).unique(), key=lambda x: (len(x), x))
+    elo_aktuell = {s: START_ELO for s in alle_spieler}
+    verlauf = {"Spieltag": ["Start"] + spieltage}
+    for s in alle_spieler:
+        verlauf[s] = [START_ELO]
+    for st_nr in spieltage:
+        spiele = df_log[df_log["Datum"].astype(str) == st_nr]
+        for _, row in spiele.iterrows():
+            a, b = row["Spieler A"], row["Spieler B"]
+            elo_aktuell[a] = elo_aktuell.get(a, START_ELO) + int(row["Elo A"])
+            elo_aktuell[b] = elo_aktuell.get(b, START_ELO) + int(row["Elo B"])
+        for s in alle_spieler:
+            verlauf[s].append(elo_aktuell.get(s, START_ELO))
+    return pd.DataFrame(verlauf)
+
+
+def statistik_fuer(df_log, df_elo):
+    return statistik.Statistik(df_elo, df_log, lambda sp, log: (sp, log))
+
+
+@pytest.mark.parametrize("mischen", [False, True])
+def test_verlauf_wie_alte_funktion(mischen):
+    df_log, df_elo = liga(14, 12, 240, seed=3)
+    if mischen:
+        # nachgetragene Spiele: Log nicht in Spieltag-Reihenfolge
+        df_log = df_log.sample(frac=1, random_state=1).reset_index(drop=True)
+    neu = statistik_fuer(df_log, df_elo).verlauf
+    pd.testing.assert_frame_equal(neu, alter_elo_verlauf(df_log), check_dtype=False)
+
+
+def test_spieltag_zusammenfassung_nutzt_stand_vor_dem_spieltag():
+    df_log, df_elo = liga(10, 6, 90, seed=5)
+    df_log = df_log.sample(frac=1, random_state=2).reset_index(drop=True)
+    stat = statistik_fuer(df_log, df_elo)
+    verlauf = alter_elo_verlauf(df_log).set_index("Spieltag")
+    for i, tag in enumerate(stat.spieltage):
+        vorher = verlauf.iloc[i].to_dict()
+        erwartet = statistik.spieltag_zusammenfassung(df_log[df_log["Datum"] == tag], vorher)
+        assert stat.spieltag(tag) == erwartet
+
+
+def test_leeres_log():
+    leer = pd.DataFrame(columns=["Datum", "Spieler A", "Spieler B", "Legs A", "Legs B", "Avg A", "Avg B", "Elo A", "Elo B"])
+    stat = statistik_fuer(leer, pd.DataFrame(columns=["Elo", "Spiele"]))
+    assert stat.verlauf.empty
+    assert stat.spieltag("1") is None
+
+
+def test_form_letzte_spiele_je_spieler():
+    df_log, df_elo = liga(8, 5, 60, seed=7)
+    stat = statistik_fuer(df_log, df_elo)
+    lang = stat.spieler_spiele
+    for s in df_elo.index:
+        eigene = lang[lang["Spieler"] == s]
+        assert stat.form.letzte(s, 5) == eigene.index.tolist()[-5:]
+        assert stat.form.summe(s, 3) == eigene["Elo"].tail(3).sum()
+        assert stat.form.serie(s, 4) == eigene["Sieg"].tail(4).tolist()
+
+
+def alte_spieler_statistik(df_sp, df_log):
+    """spieler_statistik vor der Langtabelle (Filter je Spieler), als Referenz."""
+    stats = {}
+    for s in list(df_sp.index):
+        spiele = df_log[(df_log["Spieler A"] == s) | (df_log["Spieler B"] == s)]
+        if spiele.empty: continue
+        siege = sum(
+            ((spiele["Spieler A"] == s) & (spiele["Legs A"] > spiele["Legs B"])) |
+            ((spiele["Spieler B"] == s) & (spiele["Legs B"] > spiele["Legs A"]))
+        )
+        avgs = spiele.apply(lambda r: r["Avg A"] if r["Spieler A"] == s else r["Avg B"], axis=1)
+        stats[s] = {
+            "spiele": len(spiele), "siege": int(siege),
+            "niederlagen": len(spiele) - int(siege),
+            "siegquote": round(siege / len(spiele) * 100, 1),
+            "avg": round(avgs.mean(), 2), "best_avg": round(avgs.max(), 2),
+            "elo": int(df_sp.loc[s, "Elo"])
+        }
+    return stats
+
+
+def alte_profilwerte(gew, df_log):
+    """Leg-Differenz, Average und Elo-Gewinn aus dem Spielerprofil vor der Langtabelle."""
+    spiele = df_log[(df_log["Spieler A"] == gew) | (df_log["Spieler B"] == gew)]
+    leg_diff = sum(spiele.apply(lambda r: r["Legs A"] - r["Legs B"] if r["Spieler A"] == gew else r["Legs B"] - r["Legs A"], axis=1))
+    gesamt_avg = sum(spiele.apply(lambda r: r["Avg A"] if r["Spieler A"] == gew else r["Avg B"], axis=1)) / len(spiele)
+    elo = sum(spiele.apply(lambda r: int(r["Elo A"]) if r["Spieler A"] == gew else int(r["Elo B"]), axis=1))
+    return leg_diff, gesamt_avg, elo
+
+
+def test_aggregate_wie_filter_je_spieler():
+    df_log, df_elo = liga(8, 5, 60, seed=11)
+    df_elo.loc["Ohne Spiel"] = {"Elo": START_ELO, "Spiele": 0}
+    stat = statistik_fuer(df_log, df_elo)
+    assert stat.spieler_statistik == alte_spieler_statistik(df_elo, df_log)
+    agg = stat.aggregate
+    for s in agg.index:
+        leg_diff, avg, elo = alte_profilwerte(s, df_log)
+        assert agg.loc[s, "leg_diff"] == leg_diff
+        assert agg.loc[s, "avg"] == pytest.approx(avg)
+        assert agg.loc[s, "elo_gewinn"] == elo
+
+
+def altes_duell(p1, p2, df_log):
+    """Head-to-Head-Werte aus der Vierfach-Maske vor dem Index, als Referenz."""
+    h2h = df_log[
+        ((df_log["Spieler A"] == p1) & (df_log["Spieler B"] == p2)) |
+        ((df_log["Spieler A"] == p2) & (df_log["Spieler B"] == p1))
+    ]
+    if h2h.empty:
+        return None
+    siege_p1 = sum(
+        ((h2h["Spieler A"] == p1) & (h2h["Legs A"] > h2h["Legs B"])) |
+        ((h2h["Spieler B"] == p1) & (h2h["Legs B"] > h2h["Legs A"]))
+    )
+    werte = {"zeilen": h2h.index.tolist(), p1: {"siege": siege_p1}, p2: {"siege": len(h2h) - siege_p1}}
+    for p in (p1, p2):
+        werte[p]["legs"] = sum(h2h.apply(lambda r: r["Legs A"] if r["Spieler A"] == p else r["Legs B"], axis=1))
+        werte[p]["elo"] = sum(h2h.apply(lambda r: int(r["Elo A"]) if r["Spieler A"] == p else int(r["Elo B"]), axis=1))
+    return werte
+
+
+def test_h2h_index_wie_filter_je_paar():
+    df_log, df_elo = liga(8, 5, 60, seed=11)
+    stat = statistik_fuer(df_log, df_elo)
+    leer = {"siege": 0, "legs": 0, "elo": 0}
+    paare = 0
+    for p1 in df_elo.index:
+        for p2 in df_elo.index:
+            if p1 == p2:
+                continue
+            alt, duell = altes_duell(p1, p2, df_log), stat.duell(p1, p2)
+            assert (alt is None) == (duell is None)
+            if duell is None:
+                continue
+            paare += 1
+            assert sorted(duell["zeilen"].tolist()) == alt["zeilen"]
+            for p in (p1, p2):
+                assert duell["spieler"].get(p, leer) == alt[p]
+    assert paare > 0
@@ -0,0 +1,118 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+
+import turnier
+from elo_engine import START_ELO
+
+
+def gruppen(n_gruppen=4, groesse=4):
+    namen = [f"S{i}" for i in range(n_gruppen * groesse)]
+    return {chr(65 + g): namen[g * groesse:(g + 1) * groesse] for g in range(n_gruppen)}
+
+
+def ergebnis(rng):
+    la = rng.randint(0, 3)
+    lb = 3 if la < 3 else rng.randint(0, 2)
+    if rng.random() < 0.05:
+        lb = la
+    return {"legs_a": la, "legs_b": lb, "avg_a": round(rng.uniform(20, 80), 1),
+            "avg_b": round(rng.uniform(20, 80), 1), "abgeschlossen": True}
+
+
+def tabelle_gezaehlt(gk, mitglieder, spiele):
+    """Gruppentabelle direkt aus den abgeschlossenen Spielen gezählt, als Referenz."""
+    zeilen = {t: {"Sp": 0, "S": 0, "N": 0, "+L": 0, "-L": 0, "Pts": 0, "avgs": []} for t in mitglieder}
+    for sp in spiele:
+        if sp["gruppe"] != gk or not sp.get("abgeschlossen"):
+            continue
+        for t, plus, minus, avg in ((sp["spieler_a"], sp["legs_a"], sp["legs_b"], sp["avg_a"]),
+                                    (sp["spieler_b"], sp["legs_b"], sp["legs_a"], sp["avg_b"])):
+            z = zeilen[t]
+            z["Sp"] += 1; z["+L"] += plus; z["-L"] += minus
+            z["S"] += plus > minus; z["N"] += plus < minus
+            z["Pts"] += 2 if plus > minus else plus == minus
+            z["avgs"].append(avg)
+    for z in zeilen.values():
+        z["Diff"] = z["+L"] - z["-L"]
+        avgs = z.pop("avgs")
+        z["Avg"] = round(math.fsum(avgs) / z["Sp"], 1) if z["Sp"] else 0.0
+    return sorted(zeilen.items(), key=lambda x: turnier.t_tabellen_schluessel(x[1]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_gruppentabellen_buchen_wie_neuberechnung(seed):
+    rng = random.Random(seed)
+    gr = gruppen()
+    spiele = turnier.t_erstelle_gruppenspiele(gr, 4)
+    tabellen = turnier.GruppenTabellen(gr, spiele)
+    for _ in range(200):
+        sp = rng.choice(spiele)
+        if sp.get("abgeschlossen") and rng.random() < 0.4:
+            sp["abgeschlossen"] = False
+            tabellen.zuruecknehmen(sp["id"])
+        else:
+            # auch das Überschreiben eines schon gebuchten Ergebnisses
+            sp.update(ergebnis(rng))
+            tabellen.anwenden(sp)
+        assert tabellen.passt_zu(gr, spiele)
+        for gk, m in gr.items():
+            tabelle = tabellen.tabelle(gk)
+            assert tabelle == turnier.t_berechne_tabelle(gk, m, spiele)
+            assert [(t, {k: v for k, v in z.items() if k != "AvgSum"}) for t, z in tabelle] == \
+                tabelle_gezaehlt(gk, m, spiele)
+        assert tabellen.qualifizierte() == turnier.t_get_qualifizierte(gr, spiele)
+
+
+def test_gruppentabellen_erkennen_fremden_stand():
+    gr = gruppen(1)
+    spiele = turnier.t_erstelle_gruppenspiele(gr, 1)
+    spiele[0].update(ergebnis(random.Random(0)))
+    tabellen = turnier.GruppenTabellen(gr, spiele)
+    spiele[0]["legs_a"] = 99
+    assert not tabellen.passt_zu(gr, spiele)
+
+
+def turnier_stand(status, seed=0):
+    rng = random.Random(seed)
+    gr = gruppen(8)
+    spiele = turnier.t_erstelle_gruppenspiele(gr, 4)
+    for sp in spiele[:len(spiele) // 2]:
+        sp.update(ergebnis(rng))
+    stand = {"status": status, "gruppen": gr, "gruppen_spiele": spiele, "ko_spiele": [], "qualifizierte": {}}
+    if status == "ko":
+        for sp in spiele:
+            sp.update(ergebnis(rng))
+        qual = turnier.t_get_qualifizierte(gr, spiele)
+        stand["qualifizierte"] = {str(i + 1): s for i, s in enumerate(qual)}
+        ko = turnier.t_erstelle_ko_spiele(qual, 4)
+        for sp in ko[:3]:
+            sp.update(ergebnis(rng))
+            sp["sieger"] = sp["spieler_a"] if sp["legs_a"] > sp["legs_b"] else sp["spieler_b"]
+        stand["ko_spiele"] = turnier.t_propagiere_sieger(ko, 4)
+    return stand
+
+
+def elo_liga(n=32):
+    return {f"S{i}": 900 + 10 * i for i in range(n)}
+
+
+@pytest.mark.parametrize("status", ["gruppen", "ko"])
+def test_simulation_fuellt_jede_runde(status):
+    df = turnier.simuliere_turnier(turnier_stand(status), elo_liga(), {}, [(3, 0), (3, 1), (3, 2)],
+                                   anzahl=2000, seed=1)
+    # je Turnier: 16 Qualifizierte und Achtelfinalisten, 8, 4, 2 Spieler in den Runden danach, ein Sieger
+    assert df.sum().round(9).tolist() == [16, 16, 8, 4, 2, 1]
+    assert ((df >= 0) & (df <= 1)).all().all()
+
+
+@pytest.mark.parametrize("status", ["gruppen", "ko"])
+def test_simulation_unbekannte_spieler_mit_start_elo(status):
+    stand = turnier_stand(status)
+    elo = {s: START_ELO for s in elo_liga()}
+    mit = turnier.simuliere_turnier(stand, elo, {}, [(3, 1)], anzahl=500, seed=3)
+    del elo["S0"], elo["S17"]
+    ohne = turnier.simuliere_turnier(stand, elo, {}, [(3, 1)], anzahl=500, seed=3)
+    pd.testing.assert_frame_equal(mit, ohne)
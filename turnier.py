@@ -0,0 +1,315 @@
+import math
+import numpy as np
+import pandas as pd
+
+from elo_engine import START_ELO, erwartung_np
+from messung import gemessen
+
+
+# ---------------------
+# TURNIERLOGIK (32 Teilnehmer, 8 Gruppen, KO ab Achtelfinale)
+# ---------------------
+# --- Tabelle berechnen (inkl. Avg) ---
+def t_berechne_tabelle(gruppe_key, mitglieder, gruppen_spiele):
+    return GruppenTabellen({gruppe_key: mitglieder}, gruppen_spiele).tabelle(gruppe_key)
+
+
+class GruppenTabellen:
+    """Gruppentabellen als gepflegte Struktur, je Gruppe eine Zeile pro Spieler.
+
+    Beim Eintragen bzw. Entsperren wird nur das eine Spiel mit `anwenden` bzw.
+    `zuruecknehmen` gebucht; sortiert wird beim Lesen und nur die Gruppe, in der
+    sich seit dem letzten Lesen etwas geändert hat.
+    """
+
+    def __init__(self, gruppen, gruppen_spiele=()):
+        self.gruppen = {gk: list(m) for gk, m in gruppen.items()}
+        self._zeilen = {gk: {t: {"Sp": 0, "S": 0, "N": 0, "+L": 0, "-L": 0, "Diff": 0, "Pts": 0,
+                                 "AvgSum": 0.0, "Avg": 0.0} for t in m} for gk, m in self.gruppen.items()}
+        self._avgs = {gk: {t: {} for t in m} for gk, m in self.gruppen.items()}
+        self._gebucht = {}   # spiel-id -> (gruppe, a, b, legs_a, legs_b, avg_a, avg_b)
+        self._sortiert = {}  # gruppe -> Namen in Tabellenreihenfolge
+        for sp in gruppen_spiele:
+            if sp.get("abgeschlossen"):
+                self.anwenden(sp)
+
+    @staticmethod
+    def _eintrag(sp):
+        return (sp.get("gruppe"), sp["spieler_a"], sp["spieler_b"], sp.get("legs_a") or 0,
+                sp.get("legs_b") or 0, float(sp.get("avg_a") or 0.0), float(sp.get("avg_b") or 0.0))
+
+    def _buchen(self, sid, eintrag, vz):
+        gk, a, b, la, lb, avg_a, avg_b = eintrag
+        for t, plus, minus, avg in ((a, la, lb, avg_a), (b, lb, la, avg_b)):
+            z = self._zeilen[gk][t]
+            z["Sp"] += vz
+            z["+L"] += vz * plus; z["-L"] += vz * minus
+            z["Diff"] = z["+L"] - z["-L"]
+            if plus > minus:
+                z["Pts"] += 2 * vz; z["S"] += vz
+            elif plus < minus:
+                z["N"] += vz
+            else:
+                z["Pts"] += vz
+            # Averages als Summe der gebuchten Spiele statt +/-, damit Entsperren nichts verrundet
+            avgs = self._avgs[gk][t]
+            if vz > 0:
+                avgs[sid] = avg
+            else:
+                avgs.pop(sid, None)
+            z["AvgSum"] = math.fsum(avgs.values())
+            z["Avg"] = round(z["AvgSum"] / z["Sp"], 1) if z["Sp"] > 0 else 0.0
+        self._sortiert.pop(gk, None)
+
+    def anwenden(self, sp):
+        """Bucht ein abgeschlossenes Spiel (ersetzt eine ältere Buchung desselben Spiels)."""
+        self.zuruecknehmen(sp["id"])
+        eintrag = self._eintrag(sp)
+        gk, a, b = eintrag[:3]
+        if a not in self._zeilen.get(gk, {}) or b not in self._zeilen[gk]:
+            return
+        self._gebucht[sp["id"]] = eintrag
+        self._buchen(sp["id"], eintrag, 1)
+
+    def zuruecknehmen(self, spiel_id):
+        eintrag = self._gebucht.pop(spiel_id, None)
+        if eintrag is not None:
+            self._buchen(spiel_id, eintrag, -1)
+
+    def passt_zu(self, gruppen, gruppen_spiele):
+        """True, wenn genau die abgeschlossenen Spiele mit diesen Ergebnissen gebucht sind."""
+        if {gk: list(m) for gk, m in gruppen.items()} != self.gruppen:
+            return False
+        n = 0
+        for sp in gruppen_spiele:
+            if not sp.get("abgeschlossen"):
+                continue
+            eintrag = self._eintrag(sp)
+            gk, a, b = eintrag[:3]
+            if a not in self._zeilen.get(gk, {}) or b not in self._zeilen[gk]:
+                continue
+            if self._gebucht.get(sp["id"]) != eintrag:
+                return False
+            n += 1
+        return n == len(self._gebucht)
+
+    def positionen(self, gk):
+        if gk not in self._sortiert:
+            zeilen = self._zeilen.get(gk, {})
+            self._sortiert[gk] = sorted(zeilen, key=lambda t: t_tabellen_schluessel(zeilen[t]))
+        return self._sortiert[gk]
+
+    def tabelle(self, gk):
+        """[(Spieler, Zeile)] in Tabellenreihenfolge, die Zeilen sind Kopien."""
+        return [(t, dict(self._zeilen[gk][t])) for t in self.positionen(gk)]
+
+    def qualifizierte(self):
+        positionen = {gk: self.positionen(gk) for gk in self.gruppen}
+        return [positionen[gk][pos] for gk, pos in t_qualifikations_plaetze(self.gruppen)
+                if pos < len(positionen[gk])]
+
+
+def t_tabellen_schluessel(s):
+    """Sortierschlüssel der Gruppentabelle; geht auch mit Arrays (Simulation)."""
+    return (-s["S"], -s["Diff"], -s["Avg"])
+
+
+# --- Gruppenspiele erstellen ---
+def t_erstelle_gruppenspiele(gruppen, boards):
+    spiele = []
+    board_counter = 0
+    alle_paarungen = []
+    for gk in sorted(gruppen.keys()):
+        m = gruppen[gk]
+        paarungen = [(m[i], m[j], gk) for i in range(len(m)) for j in range(i+1, len(m))]
+        alle_paarungen.append(paarungen)
+    max_p = max(len(p) for p in alle_paarungen) if alle_paarungen else 0
+    for round_idx in range(max_p):
+        for gp in alle_paarungen:
+            if round_idx < len(gp):
+                a, b, gk = gp[round_idx]
+                spiele.append({
+                    "id": len(spiele),
+                    "gruppe": gk,
+                    "spieler_a": a,
+                    "spieler_b": b,
+                    "board": (board_counter % boards) + 1,
+                    "legs_a": None,
+                    "legs_b": None,
+                    "avg_a": None,
+                    "avg_b": None,
+                    "abgeschlossen": False
+                })
+                board_counter += 1
+    return spiele
+
+
+# --- Qualifizierte bestimmen ---
+def t_get_qualifizierte(gruppen, gruppen_spiele):
+    return GruppenTabellen(gruppen, gruppen_spiele).qualifizierte()
+
+
+def t_qualifikations_plaetze(gruppen):
+    """(Gruppe, Platz) in Setzreihenfolge: erst alle Gruppensieger, dann alle Zweiten."""
+    return [(gk, pos) for pos in range(2) for gk in sorted(gruppen.keys())]
+
+
+# --- KO-Bracket erstellen ---
+def t_erstelle_ko_spiele(qualifizierte, boards):
+    namen = {0: "Achtelfinale", 1: "Viertelfinale", 2: "Halbfinale", 3: "Finale"}
+    bracket_size = 16
+    ko = []
+    mid = 0
+    for r in range(4):
+        n_m = bracket_size // (2 ** (r + 1))
+        for m in range(n_m):
+            ko.append({
+                "id": mid, "runde_idx": r, "runde_name": namen[r], "match_nr": m,
+                "spieler_a": None, "spieler_b": None, "board": None,
+                "legs_a": None, "legs_b": None,
+                "avg_a": None, "avg_b": None,
+                "abgeschlossen": False, "sieger": None
+            })
+            mid += 1
+    erste = sorted([s for s in ko if s["runde_idx"] == 0], key=lambda x: x["match_nr"])
+    seeded = qualifizierte[:16]
+    bc = 0
+    for i, sp in enumerate(erste):
+        sp["spieler_a"] = seeded[i]
+        sp["spieler_b"] = seeded[15 - i]
+        sp["board"] = (bc % boards) + 1
+        bc += 1
+    return ko
+
+
+def t_propagiere_sieger(ko_spiele, boards):
+    max_r = max(s["runde_idx"] for s in ko_spiele)
+    bc = sum(1 for s in ko_spiele if s.get("board") is not None)
+    for r in range(0, max_r):
+        runde = sorted([s for s in ko_spiele if s["runde_idx"] == r], key=lambda x: x["match_nr"])
+        naechste = sorted([s for s in ko_spiele if s["runde_idx"] == r + 1], key=lambda x: x["match_nr"])
+        for sp in runde:
+            if not sp.get("abgeschlossen") or not sp.get("sieger"):
+                continue
+            nm = sp["match_nr"] // 2
+            slot = sp["match_nr"] % 2
+            for ns in naechste:
+                if ns["match_nr"] == nm:
+                    if slot == 0:
+                        ns["spieler_a"] = sp["sieger"]
+                    else:
+                        ns["spieler_b"] = sp["sieger"]
+                    if ns.get("spieler_a") and ns.get("spieler_b") and ns["board"] is None and not ns["abgeschlossen"]:
+                        ns["board"] = (bc % boards) + 1
+                        bc += 1
+    return ko_spiele
+
+
+# ---------------------
+# SIMULATION
+# ---------------------
+KO_RUNDEN = ["Achtelfinale", "Viertelfinale", "Halbfinale", "Finale"]
+
+
+def _ko_zufluesse(ko_spiele, boards):
+    """Welches Spiel liefert die Spieler jedes KO-Spiels? Ermittelt mit t_propagiere_sieger
+    selbst: jedes Spiel gewinnt ein Platzhalter mit seiner id, danach wird abgelesen."""
+    platzhalter = [{**sp, "abgeschlossen": True, "sieger": f"#{sp['id']}",
+                    "spieler_a": sp["spieler_a"] if sp["runde_idx"] == 0 else None,
+                    "spieler_b": sp["spieler_b"] if sp["runde_idx"] == 0 else None} for sp in ko_spiele]
+    platzhalter = t_propagiere_sieger(platzhalter, boards)
+    return {sp["id"]: (int(sp["spieler_a"][1:]), int(sp["spieler_b"][1:]))
+            for sp in platzhalter if sp["runde_idx"] > 0}
+
+
+@gemessen("prognose.turnier")
+def simuliere_turnier(turnier, elo, avgs, legs, anzahl=20000, seed=None, boards=4):
+    """Spielt das Turnier ab dem aktuellen Stand `anzahl` Mal zu Ende, alle Turniere auf
+    einmal als Arrays (Zeile = Turnier).
+
+    Offene Spiele: Sieger nach Elo-Erwartung, Legs aus `legs` (Sieger, Verlierer).
+    Gruppentabellen sortieren mit `t_tabellen_schluessel`, die Averages kommen aus
+    `t_berechne_tabelle` (offene Spiele mit dem Durchschnitt des Spielers aus `avgs`),
+    die Setzliste aus `t_qualifikations_plaetze`, Bracket und Weitergabe der Sieger aus
+    `t_erstelle_ko_spiele` / `t_propagiere_sieger`. Gibt je Spieler die Anteile für
+    Qualifikation, jede KO-Runde und den Sieg zurück.
+    """
+    status = turnier.get("status")
+    if status not in ("gruppen", "ko", "abgeschlossen"):
+        return pd.DataFrame()
+    rng = np.random.default_rng(seed)
+    gruppen = turnier.get("gruppen") or {}
+    ko_spiele = turnier.get("ko_spiele") or []
+    namen = sorted({s for m in gruppen.values() for s in m} |
+                   {sp[k] for sp in ko_spiele for k in ("spieler_a", "spieler_b") if sp.get(k)})
+    idx = {s: i for i, s in enumerate(namen)}
+    werte = np.array([float(elo.get(s, START_ELO)) for s in namen])
+    p_matrix = erwartung_np(werte[:, None], werte[None, :])
+    legs = np.asarray(legs, dtype=np.int64)
+
+    def spielen(a, b):
+        """a, b: Spielerindizes je Turnier -> (Legs a, Legs b)."""
+        sieg_a = rng.random(anzahl) < p_matrix[a, b]
+        gezogen = legs[rng.integers(len(legs), size=anzahl)]
+        return np.where(sieg_a, gezogen[:, 0], gezogen[:, 1]), np.where(sieg_a, gezogen[:, 1], gezogen[:, 0])
+
+    zaehler = np.zeros((len(namen), 6))
+    if status == "gruppen":
+        gs = turnier.get("gruppen_spiele") or []
+        # Averages hängen nicht vom Ausgang ab: einmal mit t_berechne_tabelle auf fertig gespielten Gruppen
+        gefuellt = [sp if sp.get("abgeschlossen") else {**sp, "abgeschlossen": True, "legs_a": 0, "legs_b": 0,
+                    "avg_a": avgs.get(sp["spieler_a"], 0.0), "avg_b": avgs.get(sp["spieler_b"], 0.0)} for sp in gs]
+        positionen = {}
+        for gk in sorted(gruppen.keys()):
+            mitglieder = gruppen[gk]
+            lokal = {s: i for i, s in enumerate(mitglieder)}
+            avg = {s: t["Avg"] for s, t in t_berechne_tabelle(gk, mitglieder, gefuellt)}
+            siege = np.zeros((anzahl, len(mitglieder)))
+            diff = np.zeros((anzahl, len(mitglieder)))
+            for sp in gs:
+                a, b = sp["spieler_a"], sp["spieler_b"]
+                if sp.get("gruppe") != gk or a not in lokal or b not in lokal:
+                    continue
+                if sp.get("abgeschlossen"):
+                    la, lb = sp.get("legs_a") or 0, sp.get("legs_b") or 0
+                else:
+                    la, lb = spielen(idx[a], idx[b])
+                siege[:, lokal[a]] += la > lb
+                siege[:, lokal[b]] += lb > la
+                diff[:, lokal[a]] += la - lb
+                diff[:, lokal[b]] += lb - la
+            tab = {"S": siege, "Diff": diff, "Avg": np.broadcast_to([avg[s] for s in mitglieder], siege.shape)}
+            # lexsort: letzter Schlüssel zuerst, die Mitgliederreihenfolge entscheidet Gleichstände wie sort()
+            reihenfolge = np.broadcast_to(np.arange(len(mitglieder)), siege.shape)
+            rang = np.lexsort((reihenfolge,) + t_tabellen_schluessel(tab)[::-1], axis=-1)
+            positionen[gk] = np.array([idx[s] for s in mitglieder])[rang]
+        qual = np.column_stack([positionen[gk][:, pos] for gk, pos in t_qualifikations_plaetze(gruppen)
+                                if pos < positionen[gk].shape[1]])
+        ko_spiele = t_erstelle_ko_spiele([f"#{i}" for i in range(qual.shape[1])], boards)
+        startplatz = lambda s: qual[:, int(s[1:])]
+    else:
+        q = turnier.get("qualifizierte") or {}
+        qual = np.tile([idx[q[k]] for k in sorted(q, key=int) if q[k] in idx], (anzahl, 1))
+        startplatz = lambda s: np.full(anzahl, idx[s])
+    np.add.at(zaehler[:, 0], qual[:, :16].ravel(), 1)
+
+    zufluesse = _ko_zufluesse(ko_spiele, boards)
+    sieger = {}
+    for sp in sorted(ko_spiele, key=lambda x: (x["runde_idx"], x["match_nr"])):
+        if sp["runde_idx"] == 0:
+            a, b = startplatz(sp["spieler_a"]), startplatz(sp["spieler_b"])
+        else:
+            a, b = sieger[zufluesse[sp["id"]][0]], sieger[zufluesse[sp["id"]][1]]
+        np.add.at(zaehler[:, sp["runde_idx"] + 1], a, 1)
+        np.add.at(zaehler[:, sp["runde_idx"] + 1], b, 1)
+        if sp.get("abgeschlossen") and sp.get("sieger") in idx and status != "gruppen":
+            sieger[sp["id"]] = np.full(anzahl, idx[sp["sieger"]])
+        else:
+            la, lb = spielen(a, b)
+            sieger[sp["id"]] = np.where(la > lb, a, b)
+        if sp["runde_idx"] == len(KO_RUNDEN) - 1:
+            np.add.at(zaehler[:, 5], sieger[sp["id"]], 1)
+    df = pd.DataFrame(zaehler / anzahl, index=pd.Index(namen, name="Spieler"),
+                      columns=["Qualifiziert"] + KO_RUNDEN + ["Sieger"])
+    df = df[df["Qualifiziert"] > 0] if status == "gruppen" else df[df["Achtelfinale"] > 0]
+    return df.sort_values(["Sieger", "Finale", "Qualifiziert"], ascending=False)